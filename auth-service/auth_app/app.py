@@ -1,20 +1,110 @@
 """App main module."""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Request, status
+from fastapi.exceptions import HTTPException
+from fastapi.responses import JSONResponse
+
+from auth_app.cache import token_cache
+from auth_app.dbase import migrations
+from auth_app.dbase.connection import CustomConnection
+from auth_app.dbase.sweeper import create_token_sweeper
+from auth_app.hashing import HashingPoolOverloadedError, hashing_pool
 from auth_app.models import Response
 from auth_app.routers import auth, salary, user
+from auth_app.settings import get_bool_env, get_float_env
+from auth_app.signed_token import RevocationListFullError, token_signer
+from auth_app.throttling import login_throttle
+from auth_app.timing import (DEFAULT_SAMPLE_RATE, ServerTimingMiddleware,
+                             instrument_engine)
+from auth_app.warmup import create_warmup
 
 __all__ = [
     'app',
 ]
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    """Create shared connection and background tasks for worker lifetime.
+
+    Args:
+        app_: FastAPI application
+
+    Returns: None
+
+    """
+    app_.state.connection = CustomConnection()
+    instrument_engine(engine=app_.state.connection.engine)
+    if get_bool_env('DBASE_AUTO_MIGRATE', True):
+        await migrations.upgrade(engine=app_.state.connection.engine)
+
+    app_.state.token_sweeper = create_token_sweeper(
+        connection=app_.state.connection
+    )
+    app_.state.token_sweeper.start()
+    app_.state.warmup = create_warmup(connection=app_.state.connection)
+    app_.state.warmup.start()
+    try:
+        yield
+    finally:
+        await app_.state.warmup.stop()
+        await app_.state.token_sweeper.stop()
+        await app_.state.connection.close()
+        hashing_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    ServerTimingMiddleware,
+    sample_rate=get_float_env(
+        'SERVER_TIMING_SAMPLE_RATE', DEFAULT_SAMPLE_RATE
+    ),
+    send_header=get_bool_env('SERVER_TIMING_HEADER', False)
+)
 app.include_router(auth.router)
 app.include_router(salary.router)
 app.include_router(user.router)
 
 
+@app.exception_handler(HashingPoolOverloadedError)
+async def hashing_pool_overloaded_handler(
+        request: Request, exc: HashingPoolOverloadedError) -> JSONResponse:
+    """Return response for request rejected by hashing pool.
+
+    Args:
+        request: current request
+        exc: HashingPoolOverloadedError
+
+    Returns: JSONResponse
+
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Service is busy, try again later'},
+        headers={'Retry-After': '1'}
+    )
+
+
+@app.exception_handler(RevocationListFullError)
+async def revocation_list_full_handler(
+        request: Request, exc: RevocationListFullError) -> JSONResponse:
+    """Return response for token which can't be revoked.
+
+    Args:
+        request: current request
+        exc: RevocationListFullError
+
+    Returns: JSONResponse
+
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Token can not be revoked, try again later'}
+    )
+
+
 @app.get('/ping', response_model=Response)
 async def check_service_alive() -> Response:
     """Return ping-pong response.
@@ -25,3 +115,48 @@ async def check_service_alive() -> Response:
     return Response(
         message='Service is alive'
     )
+
+
+@app.get('/ready', response_model=Response)
+async def check_service_ready(request: Request) -> Response:
+    """Return readiness of worker.
+
+    Worker is ready after startup warm-up is finished.
+
+    Args:
+        request: current request
+
+    Returns: dict object with status and message
+
+    """
+    if not request.app.state.warmup.is_ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Service is warming up'
+        )
+    return Response(
+        message='Service is ready'
+    )
+
+
+@app.get('/metrics', response_model=Response)
+async def get_metrics(request: Request) -> Response:
+    """Return in-process service counters.
+
+    Args:
+        request: current request
+
+    Returns: dict object with counters of current worker
+
+    """
+    return Response(
+        data=[
+            {'dbase_pool': request.app.state.connection.stats},
+            {'token_cache': token_cache.stats},
+            {'signed_token': token_signer.stats},
+            {'hashing_pool': hashing_pool.stats},
+            {'login_throttle': login_throttle.stats},
+            {'token_sweeper': request.app.state.token_sweeper.stats},
+            {'warmup': request.app.state.warmup.stats},
+        ]
+    )
@@ -0,0 +1,285 @@
+"""Module with parsers of bulk user upload.
+
+Upload is NDJSON file with records in /user/add request format or CSV file
+with header Name,Login,Password,Value,TargetDate. Lines are parsed one by
+one, line length and count of listed errors are limited, so upload of any
+size is processed with constant memory.
+
+"""
+
+import csv
+import heapq
+import json
+from typing import AsyncIterator, Dict, List, NamedTuple, Tuple, Union
+
+from pydantic import ValidationError
+
+from auth_app import models
+
+__all__ = [
+    'BulkErrorList',
+    'BulkRecord',
+    'BulkRowError',
+    'CSV_COLUMNS',
+    'DEFAULT_MAX_ERRORS',
+    'MAX_LINE_SIZE',
+    'decode_line',
+    'get_error_detail',
+    'iter_lines',
+    'parse_csv_line',
+    'parse_ndjson_line',
+]
+
+CSV_COLUMNS = ('Name', 'Login', 'Password', 'Value', 'TargetDate')
+MIN_SALARY_VALUE = -2 ** 31
+MAX_SALARY_VALUE = 2 ** 31 - 1
+MAX_LINE_SIZE = 64 * 1024
+DEFAULT_MAX_ERRORS = 100
+
+
+class BulkRecord(NamedTuple):
+    """Parsed record of bulk upload.
+
+    Args:
+        row: row number in upload
+        user: pydantic User model
+        salary: pydantic UserSalary model
+
+    """
+    row: int
+    user: models.User
+    salary: models.UserSalary
+
+
+class BulkRowError(NamedTuple):
+    """Not added record of bulk upload.
+
+    Args:
+        row: row number in upload
+        login: user login if it was read
+        status: invalid or duplicate
+        detail: error description
+
+    """
+    row: int
+    login: Union[str, None]
+    status: str
+    detail: str
+
+    def to_dict(self) -> Dict[str, Union[int, str, None]]:
+        """Return error as response item.
+
+        Returns: dict
+
+        """
+        return {
+            'Row': self.row,
+            'Login': self.login,
+            'Status': self.status,
+            'Detail': self.detail,
+        }
+
+
+class BulkErrorList:
+    """Not added records of bulk upload with bounded size.
+
+    All errors are counted, but only max_size errors with the lowest row
+    numbers are kept for response.
+
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_ERRORS):
+        """Initialize class method.
+
+        Args:
+            max_size: max count of kept errors
+        """
+        self.__max_size = max_size
+        self.__heap: List[Tuple[int, BulkRowError]] = []
+        self.__count = 0
+
+    @property
+    def count(self) -> int:
+        """Return count of all errors.
+
+        Returns: int
+
+        """
+        return self.__count
+
+    @property
+    def is_truncated(self) -> bool:
+        """Return True if some errors are not kept.
+
+        Returns: bool
+
+        """
+        return self.__count > len(self.__heap)
+
+    def append(self, error: BulkRowError):
+        """Add error, drop error with the highest row if list is full.
+
+        Args:
+            error: BulkRowError
+
+        Returns: None
+
+        """
+        self.__count += 1
+        item = (-error.row, error)
+        if len(self.__heap) < self.__max_size:
+            heapq.heappush(self.__heap, item)
+        elif self.__heap and item > self.__heap[0]:
+            heapq.heapreplace(self.__heap, item)
+
+    def to_list(self) -> List[BulkRowError]:
+        """Return kept errors sorted by row.
+
+        Returns: list
+
+        """
+        return [error for _, error in sorted(self.__heap, reverse=True)]
+
+
+async def iter_lines(stream: AsyncIterator[bytes],
+                     max_line_size: int = MAX_LINE_SIZE
+                     ) -> AsyncIterator[bytes]:
+    """Return not empty lines from byte stream.
+
+    Lines are not decoded: bad bytes are reported by decode_line for row.
+    Line longer than max_line_size is cut to max_line_size + 1 bytes and
+    its rest is skipped, so buffer never grows over the limit.
+
+    Args:
+        stream: byte chunks
+        max_line_size: max line length in bytes
+
+    Returns: async iterator of lines
+
+    """
+    buffer = b''
+    is_skipping = False
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b'\n')
+        buffer = lines.pop()
+        for line in lines:
+            if is_skipping:
+                is_skipping = False
+                continue
+            line = line.strip()
+            if line:
+                yield line
+
+        if len(buffer) > max_line_size:
+            if not is_skipping:
+                yield buffer[:max_line_size + 1]
+            is_skipping = True
+            buffer = b''
+
+    line = buffer.strip()
+    if line and not is_skipping:
+        yield line
+
+
+def decode_line(line: bytes, max_line_size: int = MAX_LINE_SIZE) -> str:
+    """Return text of upload line.
+
+    Args:
+        line: line from iter_lines
+        max_line_size: max line length in bytes
+
+    Returns: str
+
+    """
+    if len(line) > max_line_size:
+        raise ValueError(f'Line is longer than {max_line_size} bytes')
+    return line.decode('utf-8')
+
+
+def create_record(row: int, user_data: Dict,
+                  salary_data: Dict) -> BulkRecord:
+    """Return validated bulk record.
+
+    Args:
+        row: row number in upload
+        user_data: dict with User fields
+        salary_data: dict with UserSalary fields
+
+    Returns: BulkRecord
+
+    """
+    salary = models.UserSalary(**salary_data)
+    if not MIN_SALARY_VALUE <= salary.value <= MAX_SALARY_VALUE:
+        raise ValueError('Salary value is out of range')
+    return BulkRecord(
+        row=row,
+        user=models.User(**user_data),
+        salary=salary
+    )
+
+
+def parse_ndjson_line(row: int, line: str) -> BulkRecord:
+    """Return record from NDJSON line.
+
+    Args:
+        row: row number in upload
+        line: JSON object with user and salary keys
+
+    Returns: BulkRecord
+
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError('Record must be JSON object')
+    return create_record(
+        row=row,
+        user_data=data.get('user') or {},
+        salary_data=data.get('salary') or {}
+    )
+
+
+def parse_csv_line(row: int, line: str, header: List[str]) -> BulkRecord:
+    """Return record from CSV line.
+
+    Args:
+        row: row number in upload
+        line: CSV line
+        header: CSV column names
+
+    Returns: BulkRecord
+
+    """
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f'Expected {len(header)} columns')
+    data = dict(zip(header, values))
+    return create_record(
+        row=row,
+        user_data={
+            'Name': data.get('Name'),
+            'Login': data.get('Login'),
+            'Password': data.get('Password'),
+        },
+        salary_data={
+            'Value': data.get('Value'),
+            'TargetDate': data.get('TargetDate'),
+        }
+    )
+
+
+def get_error_detail(error: Exception) -> str:
+    """Return short description of parsing error.
+
+    Args:
+        error: parsing exception
+
+    Returns: str
+
+    """
+    if isinstance(error, ValidationError):
+        return '; '.join(
+            f'{".".join(str(x) for x in item["loc"])}: {item["msg"]}'
+            for item in error.errors()
+        )
+    return str(error)
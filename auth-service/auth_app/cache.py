@@ -0,0 +1,184 @@
+"""Module with in-process cache of validated tokens."""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Union
+from uuid import UUID
+
+from auth_app import models
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'TokenCache',
+    'token_cache',
+]
+
+DEFAULT_TOKEN_CACHE_SIZE = 10000
+DEFAULT_TOKEN_CACHE_TTL = 10
+
+
+def get_cache_key(token_value: str) -> Union[str, None]:
+    """Return canonical token value for cache.
+
+    Args:
+        token_value: str
+
+    Returns: str or None for value which can't be a token
+
+    """
+    try:
+        return str(UUID(str(token_value)))
+    except ValueError:
+        return
+
+
+class TokenCache:
+    """LRU cache with validated tokens and their owners.
+
+    Entry lives until token expires, is invalidated or ttl passes. Cache
+    is local for worker process and invalidation is not sent to other
+    workers, so token removed by logout is accepted by other workers not
+    longer than ttl.
+
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TOKEN_CACHE_SIZE,
+                 ttl: int = DEFAULT_TOKEN_CACHE_TTL):
+        """Initialize class method.
+
+        Args:
+            max_size: max count of cached tokens, 0 - cache is disabled
+            ttl: max seconds of entry life
+        """
+        self.__max_size = max_size
+        self.__ttl = timedelta(seconds=ttl)
+        self.__items = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def max_size(self) -> int:
+        """Return max count of cached tokens.
+
+        Returns: int
+
+        """
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """Return count of cached tokens.
+
+        Returns: int
+
+        """
+        return len(self.__items)
+
+    @property
+    def hits(self) -> int:
+        """Return count of cache hits.
+
+        Returns: int
+
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Return count of cache misses.
+
+        Returns: int
+
+        """
+        return self.__misses
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters.
+
+        Returns: dict
+
+        """
+        return {
+            'size': self.size,
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def get(self, token_value: str) -> Union[models.ActiveUser, None]:
+        """Return token owner if token is cached and not expired.
+
+        Args:
+            token_value: str
+
+        Returns: pydantic ActiveUser model or None
+
+        """
+        key = get_cache_key(token_value=token_value)
+        item = self.__items.get(key) if key else None
+        if item is None:
+            self.__misses += 1
+            return
+
+        user, expires = item
+        if datetime.now() >= expires:
+            del self.__items[key]
+            self.__misses += 1
+            return
+
+        self.__items.move_to_end(key)
+        self.__hits += 1
+        return user
+
+    def put(self, token_value: str, user: models.ActiveUser,
+            expires: datetime):
+        """Add token owner to cache.
+
+        Entry expires with token or after ttl, what comes first.
+
+        Args:
+            token_value: str
+            user: pydantic ActiveUser model
+            expires: token expiration time
+
+        Returns: None
+
+        """
+        key = get_cache_key(token_value=token_value)
+        if not key or self.__max_size <= 0:
+            return
+
+        self.__items[key] = (user, min(expires, datetime.now() + self.__ttl))
+        self.__items.move_to_end(key)
+        while len(self.__items) > self.__max_size:
+            self.__items.popitem(last=False)
+
+    def invalidate(self, token_value: str):
+        """Remove token from cache.
+
+        Args:
+            token_value: str
+
+        Returns: None
+
+        """
+        key = get_cache_key(token_value=token_value)
+        if key:
+            self.__items.pop(key, None)
+
+    def clear(self):
+        """Remove all tokens and reset counters.
+
+        Returns: None
+
+        """
+        self.__items.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+
+token_cache = TokenCache(
+    max_size=get_int_env('TOKEN_CACHE_SIZE', DEFAULT_TOKEN_CACHE_SIZE),
+    ttl=get_int_env('TOKEN_CACHE_TTL', DEFAULT_TOKEN_CACHE_TTL)
+)
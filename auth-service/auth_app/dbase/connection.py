@@ -1,10 +1,13 @@
 """Module with async session creator."""
 import os
+from typing import Dict
 
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
                                     create_async_engine)
 from sqlalchemy.orm import sessionmaker
 
+from auth_app.settings import get_bool_env, get_int_env
+
 __all__ = [
     'CustomConnection',
 ]
@@ -13,9 +16,21 @@ DBASE_URL_TEMPLATE = (
     'postgresql+asyncpg://{user}:{password}@{host}:{port}/{dbname}'
 )
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 5
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+DEFAULT_POOL_PRE_PING = True
+
 
 class CustomConnection:
-    """Class for fast way create async session."""
+    """Class for fast way create async session.
+
+    One instance owns one engine with its own connection pool, so the app
+    creates it once per worker process (see app lifespan) and shares it
+    between all requests.
+
+    """
     def __init__(self):
         """Initialize class method."""
         self.__url = DBASE_URL_TEMPLATE.format(
@@ -26,7 +41,25 @@ class CustomConnection:
             password=os.getenv('POSTGRES_PASSWORD')
         )
 
-        self.__engine = create_async_engine(self.__url, echo=False)
+        self.__engine = create_async_engine(
+            self.__url,
+            echo=False,
+            pool_size=get_int_env(
+                'POSTGRES_POOL_SIZE', DEFAULT_POOL_SIZE
+            ),
+            max_overflow=get_int_env(
+                'POSTGRES_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW
+            ),
+            pool_timeout=get_int_env(
+                'POSTGRES_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT
+            ),
+            pool_recycle=get_int_env(
+                'POSTGRES_POOL_RECYCLE', DEFAULT_POOL_RECYCLE
+            ),
+            pool_pre_ping=get_bool_env(
+                'POSTGRES_POOL_PRE_PING', DEFAULT_POOL_PRE_PING
+            )
+        )
 
         self.__async_session = sessionmaker(
             bind=self.__engine,
@@ -51,3 +84,26 @@ class CustomConnection:
 
         """
         return self.__async_session()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return connection pool counters.
+
+        Returns: dict
+
+        """
+        pool = self.__engine.pool
+        return {
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+        }
+
+    async def close(self):
+        """Close all pool connections and dispose engine.
+
+        Returns: None
+
+        """
+        await self.__engine.dispose()
@@ -1,8 +1,13 @@
 """Module with base table api class."""
 
+from typing import Union
+
+from sqlalchemy import Executable, Result, func, select
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from auth_app.dbase.identity import IdentityMap
+
 __all__ = [
     'BaseDAL',
 ]
@@ -11,13 +16,17 @@ __all__ = [
 class BaseDAL:
     """Class which save changing query."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession,
+                 identity_map: Union[IdentityMap, None] = None):
         """Initialize base table API.
 
         Args:
             session: AsyncSession
+            identity_map: entities loaded by current request, default - new
+                map for this object
         """
         self.__session = session
+        self.__identity_map = identity_map or IdentityMap()
 
     @property
     def session(self) -> AsyncSession:
@@ -28,6 +37,15 @@ class BaseDAL:
         """
         return self.__session
 
+    @property
+    def identity_map(self) -> IdentityMap:
+        """Return identity map of loaded entities.
+
+        Returns: IdentityMap
+
+        """
+        return self.__identity_map
+
     async def is_success_changing_query(self) -> bool:
         """Return changing query status.
 
@@ -40,6 +58,50 @@ class BaseDAL:
             await self.session.rollback()
             return False
 
+    async def execute_read(self, query: Executable) -> Result:
+        """Execute read-only query.
+
+        Session checks out connection on first query and keeps it for
+        following queries of the same unit of work, so every next query
+        costs one round trip. Caller ends unit of work by
+        release_connection.
+
+        Args:
+            query: select query
+
+        Returns: Result with fetched rows
+
+        """
+        return await self.session.execute(query)
+
+    async def release_connection(self):
+        """End current transaction and return connection to pool.
+
+        Called after each read-only unit of work (token check, route
+        query) and before CPU-bound work (e.g. password hashing), so
+        connection isn't held while response is built or password is
+        hashed. Next query checks out connection again. Queries must select
+        columns, not ORM entities: entities are expired by rollback.
+
+        Returns: None
+
+        """
+        if self.session.in_transaction():
+            await self.session.rollback()
+
+    async def try_advisory_lock(self, key: int) -> bool:
+        """Try to get transaction-level advisory lock.
+
+        Lock is released by commit or rollback of current transaction.
+
+        Args:
+            key: lock key
+
+        Returns: True - if lock is acquired, else - False
+        """
+        query = select(func.pg_try_advisory_xact_lock(key))
+        return bool((await self.session.execute(query)).scalar())
+
     async def get_by_id(self, id_: int):
         """Return object by id value.
 
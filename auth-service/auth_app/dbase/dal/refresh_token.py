@@ -0,0 +1,195 @@
+"""Module with RefreshToken database table operations."""
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import NamedTuple, Union
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_app.dbase import orm
+from auth_app.dbase.dal.base import BaseDAL
+from auth_app.dbase.identity import IdentityMap
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'RefreshTokenDAL',
+    'RotatedRefreshToken',
+]
+
+REFRESH_EXPIRES_SIZE = timedelta(
+    days=get_int_env('REFRESH_TOKEN_LIFETIME_DAYS', 30)
+)
+REFRESH_TOKEN_BYTES = 32
+
+
+def get_token_hash(token_value: str) -> str:
+    """Return stored digest of refresh token.
+
+    Refresh token is random value with 256 bits of entropy, so fast hash
+    is enough: it can't be brute forced like password.
+
+    Args:
+        token_value: str
+
+    Returns: SHA-256 hex digest
+
+    """
+    return hashlib.sha256(token_value.encode()).hexdigest()
+
+
+class RotatedRefreshToken(NamedTuple):
+    """Result of refresh token exchange.
+
+    Args:
+        user_id: token owner id
+        name: token owner name
+        refresh_token: new refresh token
+
+    """
+    user_id: int
+    name: str
+    refresh_token: str
+
+
+class RefreshTokenDAL(BaseDAL):
+    """Class with refresh tokens table methods."""
+
+    def __init__(self, session: AsyncSession,
+                 identity_map: Union[IdentityMap, None] = None):
+        """Initialize class method.
+
+        Args:
+            session: AsyncSession
+            identity_map: entities loaded by current request
+        """
+        super().__init__(session=session, identity_map=identity_map)
+
+    async def add(self, user_id: int) -> str:
+        """Add new refresh token of user, don't commit.
+
+        Args:
+            user_id: int
+
+        Returns: refresh token value
+
+        """
+        token_value = secrets.token_urlsafe(REFRESH_TOKEN_BYTES)
+        query = insert(orm.RefreshToken).values(
+            token_hash=get_token_hash(token_value=token_value),
+            expires=datetime.now() + REFRESH_EXPIRES_SIZE,
+            user_id=user_id
+        )
+        await self.session.execute(query)
+        return token_value
+
+    async def issue(self, user_id: int) -> Union[str, None]:
+        """Return new refresh token of user.
+
+        Args:
+            user_id: int
+
+        Returns: refresh token value or None if token is not saved
+
+        """
+        try:
+            token_value = await self.add(user_id=user_id)
+        except DBAPIError:
+            await self.session.rollback()
+            return
+        if not await self.is_success_changing_query():
+            return
+        return token_value
+
+    async def rotate(self, token_value: str
+                     ) -> Union[RotatedRefreshToken, None]:
+        """Exchange refresh token for new one.
+
+        Old token is removed by the same statement which reads its owner,
+        so token can be used only once even by concurrent requests.
+
+        Args:
+            token_value: current refresh token
+
+        Returns: RotatedRefreshToken or None for unknown or expired token
+
+        """
+        used = delete(orm.RefreshToken).where(
+            orm.RefreshToken.token_hash == get_token_hash(
+                token_value=token_value
+            )
+        ).returning(
+            orm.RefreshToken.user_id, orm.RefreshToken.expires
+        ).cte('used')
+        query = select(
+            used.c.user_id,
+            used.c.expires > datetime.now(),
+            orm.User.name
+        ).join(orm.User, orm.User.id_ == used.c.user_id)
+        try:
+            record = (await self.session.execute(query)).first()
+            if not record or not record[1]:
+                await self.session.commit()
+                return
+
+            user_id, _, name = record
+            new_token_value = await self.add(user_id=user_id)
+        except DBAPIError:
+            await self.session.rollback()
+            return
+        if not await self.is_success_changing_query():
+            return
+        return RotatedRefreshToken(
+            user_id=user_id,
+            name=name,
+            refresh_token=new_token_value
+        )
+
+    async def delete(self, token_value: str) -> bool:
+        """Remove refresh token.
+
+        Args:
+            token_value: str
+
+        Returns: True - if token is removed, False - if it is not found
+
+        """
+        query = delete(orm.RefreshToken).where(
+            orm.RefreshToken.token_hash == get_token_hash(
+                token_value=token_value
+            )
+        )
+        result = await self.session.execute(query)
+        if not await self.is_success_changing_query():
+            return False
+        return result.rowcount > 0
+
+    async def delete_expired(self, batch_size: int) -> int:
+        """Remove batch of expired refresh tokens.
+
+        Works like TokenDAL.delete_expired.
+
+        Args:
+            batch_size: max count of removed tokens
+
+        Returns: count of removed tokens
+
+        """
+        expired = select(orm.RefreshToken.id_).where(
+            orm.RefreshToken.expires <= datetime.now()
+        ).order_by(
+            orm.RefreshToken.expires
+        ).limit(
+            batch_size
+        ).with_for_update(
+            skip_locked=True
+        ).cte('expired').prefix_with('MATERIALIZED')
+        query = delete(orm.RefreshToken).where(
+            orm.RefreshToken.id_ == expired.c.id_
+        )
+        result = await self.session.execute(query)
+        if not await self.is_success_changing_query():
+            return 0
+        return result.rowcount
@@ -1,32 +1,41 @@
 """Module with Token database table operations."""
 
-from typing import Union
+from datetime import date
+from typing import AsyncIterator, Iterable, List, Tuple, Union
 
-from sqlalchemy import select, update
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
 from auth_app.dbase import orm
 from auth_app.dbase.dal.base import BaseDAL
+from auth_app.dbase.identity import SALARY_ENTITY, USER_ENTITY, IdentityMap
 
 __all__ = [
     'SalaryDAL',
 ]
 
+UPSERT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
 
 class SalaryDAL(BaseDAL):
     """Class with token table methods."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession,
+                 identity_map: Union[IdentityMap, None] = None):
         """Initialize class method.
 
         Args:
             session: AsyncSession
+            identity_map: entities loaded by current request
         """
-        super().__init__(session=session)
+        super().__init__(session=session, identity_map=identity_map)
 
     async def add(self, salary_info: models.SalaryInfo) -> bool:
-        """Add salary info to database.
+        """Add salary info to database or update existing one.
 
         Args:
             salary_info: pydantic SalaryInfo model
@@ -34,50 +43,162 @@ class SalaryDAL(BaseDAL):
         Returns: bool
 
         """
-        query = select(orm.Salary).where(
-            orm.Salary.user_id == salary_info.user_id
-        )
-        salary_orm = (await self.session.execute(query)).scalar()
-        if not salary_orm:
-            self.session.add(
-                orm.Salary(
-                    user_id=salary_info.user_id,
-                    value=salary_info.value,
-                    target_date=salary_info.target_date,
+        return await self.add_many(salary_infos=[salary_info])
+
+    async def add_many(self, salary_infos: Iterable[models.SalaryInfo],
+                       batch_size: int = UPSERT_BATCH_SIZE) -> bool:
+        """Add or update salary info of several users.
+
+        Records are written by INSERT ... ON CONFLICT (user_id) DO UPDATE
+        statements with up to batch_size rows each, all batches are
+        committed together. Last record wins for repeated user id.
+
+        Args:
+            salary_infos: pydantic SalaryInfo models
+            batch_size: max count of rows in one statement
+
+        Returns: bool
+
+        """
+        rows = {}
+        for salary_info in salary_infos:
+            rows[salary_info.user_id] = {
+                'user_id': salary_info.user_id,
+                'value': salary_info.value,
+                'target_date': salary_info.target_date,
+            }
+        if not rows:
+            return True
+
+        for user_id in rows:
+            self.identity_map.evict(SALARY_ENTITY, user_id)
+        values = list(rows.values())
+        try:
+            for start in range(0, len(values), batch_size):
+                query = insert(orm.Salary).values(
+                    values[start:start + batch_size]
                 )
-            )
-        else:
-            query = update(orm.Salary).where(
-                orm.Salary.user_id == salary_info.user_id
-            ).values(
-                {
-                    'value': salary_info.value,
-                    'target_date': salary_info.target_date
-                }
-            )
-            await self.session.execute(query)
+                query = query.on_conflict_do_update(
+                    index_elements=[orm.Salary.user_id],
+                    set_={
+                        'value': query.excluded.value,
+                        'target_date': query.excluded.target_date,
+                    }
+                )
+                await self.session.execute(query)
+        except DBAPIError:
+            await self.session.rollback()
+            return False
         return await self.is_success_changing_query()
 
     async def get_by_user_id(self, id_: int) -> Union[models.SalaryInfo, None]:
         """Return salary info by user id.
 
+        Salary and user name are read by one joined query. If user is
+        already loaded by current request, only salary is read.
+
         Args:
             id_: int
 
         Returns: pydantic SalaryInfo model
 
         """
-        query = select(orm.Salary).where(orm.Salary.user_id == id_)
-        salary_orm = (await self.session.execute(query)).scalar()
-        if not salary_orm:
-            return
-
-        query = select(orm.User).where(orm.User.id_ == id_)
-        user_orm = (await self.session.execute(query)).scalar()
-
-        return models.SalaryInfo(
-            user_id=id_,
-            name=user_orm.name,
-            value=salary_orm.value,
-            target_date=salary_orm.target_date
+        if self.identity_map.contains(SALARY_ENTITY, id_):
+            return self.identity_map.get(SALARY_ENTITY, id_)
+
+        user = None
+        if self.identity_map.contains(USER_ENTITY, id_):
+            user = self.identity_map.get(USER_ENTITY, id_)
+
+        if user is not None:
+            query = select(
+                orm.Salary.value, orm.Salary.target_date
+            ).where(orm.Salary.user_id == id_)
+        else:
+            query = select(
+                orm.Salary.value, orm.Salary.target_date, orm.User.name
+            ).join(
+                orm.User, orm.User.id_ == orm.Salary.user_id
+            ).where(orm.Salary.user_id == id_)
+        record = (await self.execute_read(query)).first()
+
+        salary_info = None
+        if record:
+            salary_info = models.SalaryInfo.construct(
+                user_id=id_,
+                name=user.name if user is not None else record.name,
+                value=record.value,
+                target_date=record.target_date
+            )
+        self.identity_map.put(SALARY_ENTITY, id_, salary_info)
+        return salary_info
+
+    async def iter_all(self, batch_size: int = EXPORT_BATCH_SIZE
+                       ) -> AsyncIterator[List[Tuple]]:
+        """Return salary info of all users batch by batch.
+
+        Rows are read by server-side cursor ordered by user id, so only one
+        batch is kept in memory.
+
+        Args:
+            batch_size: count of rows fetched from cursor at once
+
+        Returns: async iterator of row lists (user id, name, value, date)
+
+        """
+        query = select(
+            orm.Salary.user_id, orm.User.name, orm.Salary.value,
+            orm.Salary.target_date
+        ).join(
+            orm.User, orm.User.id_ == orm.Salary.user_id
+        ).order_by(
+            orm.Salary.user_id
+        ).execution_options(yield_per=batch_size)
+        result = await self.session.stream(query)
+        async for rows in result.partitions(batch_size):
+            yield [tuple(row) for row in rows]
+
+    async def get_raises(self, date_from: date, date_to: date, limit: int,
+                         after: Union[Tuple[date, int], None] = None
+                         ) -> List[models.SalaryInfo]:
+        """Return salary info with target date in range.
+
+        Rows are ordered by (target_date, user_id) and read by keyset:
+        next page starts after the last row of previous one, so every page
+        is one index range scan.
+
+        Args:
+            date_from: first target date
+            date_to: last target date
+            limit: max count of rows
+            after: target date and user id of last row of previous page
+
+        Returns: list of pydantic SalaryInfo models
+
+        """
+        query = select(
+            orm.Salary.user_id, orm.User.name, orm.Salary.value,
+            orm.Salary.target_date
+        ).join(
+            orm.User, orm.User.id_ == orm.Salary.user_id
+        ).where(
+            orm.Salary.target_date >= date_from,
+            orm.Salary.target_date <= date_to
         )
+        if after is not None:
+            sort_key = tuple_(orm.Salary.target_date, orm.Salary.user_id)
+            query = query.where(sort_key > tuple_(*after))
+        query = query.order_by(
+            orm.Salary.target_date, orm.Salary.user_id
+        ).limit(limit)
+
+        records = await self.execute_read(query)
+        return [
+            models.SalaryInfo.construct(
+                user_id=user_id,
+                name=name,
+                value=value,
+                target_date=target_date
+            )
+            for user_id, name, value, target_date in records
+        ]
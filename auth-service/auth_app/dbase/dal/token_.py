@@ -1,32 +1,98 @@
 """Module with Token database table operations."""
 
 from datetime import datetime, timedelta
-from typing import Union
+from enum import Enum
+from typing import NamedTuple, Union
+from uuid import UUID, uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
+from auth_app.cache import token_cache
 from auth_app.dbase import orm
 from auth_app.dbase.dal.base import BaseDAL
+from auth_app.dbase.identity import (TOKEN_OWNER_ENTITY, USER_ENTITY,
+                                     IdentityMap)
 
 __all__ = [
     'TokenDAL',
+    'TokenOwner',
+    'TokenStatus',
 ]
 
 EXPIRES_SIZE = timedelta(minutes=5)
 
 
+class TokenStatus(Enum):
+    """Token resolution status."""
+
+    VALID = 'valid'
+    NOT_FOUND = 'not-found'
+    EXPIRED = 'expired'
+    USER_NOT_FOUND = 'user-not-found'
+
+
+class TokenOwner(NamedTuple):
+    """Result of token resolution.
+
+    Args:
+        status: token status
+        user: pydantic ActiveUser model (only for valid token)
+        expires: token expiration time
+
+    """
+    status: TokenStatus
+    user: Union[models.ActiveUser, None] = None
+    expires: Union[datetime, None] = None
+
+
+def to_uuid(value: Union[str, UUID]) -> Union[UUID, None]:
+    """Return token value as UUID.
+
+    Args:
+        value: token value
+
+    Returns: UUID or None if value can't be a token value
+
+    """
+    if isinstance(value, UUID):
+        return value
+    try:
+        return UUID(value)
+    except (TypeError, ValueError):
+        return
+
+
+def create_token_model(token_orm: orm.Token) -> models.Token:
+    """Return pydantic Token model from token record.
+
+    Args:
+        token_orm: token record
+
+    Returns: pydantic Token model
+
+    """
+    return models.Token.construct(
+        value=str(token_orm.value),
+        expires=token_orm.expires
+    )
+
+
 class TokenDAL(BaseDAL):
     """Class with token table methods."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession,
+                 identity_map: Union[IdentityMap, None] = None):
         """Initialize class method.
 
         Args:
             session: AsyncSession
+            identity_map: entities loaded by current request
         """
-        super().__init__(session=session)
+        super().__init__(session=session, identity_map=identity_map)
 
     async def get_by_user_id(self, id_: int) -> Union[models.Token, None]:
         """Return token by user id.
@@ -37,14 +103,13 @@ class TokenDAL(BaseDAL):
         Returns: pydantic Token model
 
         """
-        query = select(orm.Token).where(orm.Token.user_id == id_)
-        token_orm = (await self.session.execute(query)).scalar()
-        if not token_orm:
-            return
-        return models.Token(
-            value=token_orm.value,
-            expires=token_orm.expires
+        query = select(orm.Token.value, orm.Token.expires).where(
+            orm.Token.user_id == id_
         )
+        record = (await self.execute_read(query)).first()
+        if not record:
+            return
+        return create_token_model(token_orm=record)
 
     async def get_user_id(self, token_value: str) -> int:
         """Return user id by token value.
@@ -55,11 +120,118 @@ class TokenDAL(BaseDAL):
         Returns: int
 
         """
-        query = select(orm.Token).where(orm.Token.value == token_value)
-        token_orm = (await self.session.execute(query)).scalar()
-        if not token_orm:
+        uuid_value = to_uuid(value=token_value)
+        if not uuid_value:
+            return -1
+
+        query = select(orm.Token.user_id).where(
+            orm.Token.value == uuid_value
+        )
+        user_id = (await self.execute_read(query)).scalar()
+        if user_id is None:
             return -1
-        return token_orm.user_id
+        return user_id
+
+    async def get_owner(self, token_value: str) -> TokenOwner:
+        """Return token owner by token value with one query.
+
+        Token is joined with its user and expiration is checked by
+        database, so one round trip is enough for authentication. Valid
+        owner is saved to identity map as loaded user.
+
+        Args:
+            token_value: str
+
+        Returns: TokenOwner
+
+        """
+        uuid_value = to_uuid(value=token_value)
+        if not uuid_value:
+            return TokenOwner(status=TokenStatus.NOT_FOUND)
+        if self.identity_map.contains(TOKEN_OWNER_ENTITY, uuid_value):
+            return self.identity_map.get(TOKEN_OWNER_ENTITY, uuid_value)
+
+        owner = await self.load_owner(uuid_value=uuid_value)
+        self.identity_map.put(TOKEN_OWNER_ENTITY, uuid_value, owner)
+        if owner.user is not None:
+            self.identity_map.put(USER_ENTITY, owner.user.id_, owner.user)
+        return owner
+
+    async def load_owner(self, uuid_value: UUID) -> TokenOwner:
+        """Return token owner from database.
+
+        Args:
+            uuid_value: token value
+
+        Returns: TokenOwner
+
+        """
+        query = select(
+            orm.Token.user_id,
+            orm.Token.expires,
+            orm.Token.expires > datetime.now(),
+            orm.User.name
+        ).outerjoin(
+            orm.User, orm.User.id_ == orm.Token.user_id
+        ).where(orm.Token.value == uuid_value)
+        record = (await self.execute_read(query)).first()
+        if not record:
+            return TokenOwner(status=TokenStatus.NOT_FOUND)
+
+        user_id, expires, is_valid, name = record
+        if not is_valid:
+            return TokenOwner(status=TokenStatus.EXPIRED, expires=expires)
+        if name is None:
+            return TokenOwner(
+                status=TokenStatus.USER_NOT_FOUND,
+                expires=expires
+            )
+        return TokenOwner(
+            status=TokenStatus.VALID,
+            user=models.ActiveUser.construct(id_=user_id, name=name),
+            expires=expires
+        )
+
+    async def issue(self, user_id: int) -> Union[models.Token, None]:
+        """Return current token of user, create new token if required.
+
+        Valid token of user is reused, expired one is replaced. Both cases
+        are done by one INSERT ... ON CONFLICT statement, new token value is
+        generated by application and saved row is returned by query.
+
+        Args:
+            user_id: int
+
+        Returns: pydantic Token model or None if query is failed
+
+        """
+        now = datetime.now()
+        query = insert(orm.Token).values(
+            value=uuid4(),
+            user_id=user_id,
+            expires=now + EXPIRES_SIZE
+        )
+        is_valid = orm.Token.expires > now
+        query = query.on_conflict_do_update(
+            index_elements=[orm.Token.user_id],
+            set_={
+                'value': case(
+                    (is_valid, orm.Token.value), else_=query.excluded.value
+                ),
+                'expires': case(
+                    (is_valid, orm.Token.expires),
+                    else_=query.excluded.expires
+                ),
+            }
+        ).returning(*orm.Token.__table__.columns)
+
+        try:
+            token_orm = (await self.session.execute(query)).one()
+            await self.session.commit()
+        except DBAPIError:
+            await self.session.rollback()
+            return
+        return create_token_model(token_orm=token_orm)
 
     async def add(self, user_id: int) -> bool:
         """Generate token to database for current user.
@@ -70,24 +242,36 @@ class TokenDAL(BaseDAL):
         Returns: bool
 
         """
-        current_token = await self.get_by_user_id(id_=user_id)
-        is_create = False
-        if not current_token:
-            is_create = True
-        else:
-            if not current_token.is_valid:
-                await self.delete(token_value=current_token.value)
-                is_create = True
-
-        if is_create:
-            token = orm.Token(
-                expires=datetime.now() + EXPIRES_SIZE,
-                user_id=user_id
-            )
-            self.session.add(token)
-            return await self.is_success_changing_query()
-        else:
-            return True
+        return await self.issue(user_id=user_id) is not None
+
+    async def delete_expired(self, batch_size: int) -> int:
+        """Remove batch of expired tokens.
+
+        Rows locked by other transactions are skipped, so several
+        sweepers don't wait for each other. Batch is selected in
+        materialized CTE: subquery in IN clause can be rescanned by
+        nested loop join and remove more rows than batch size.
+
+        Args:
+            batch_size: max count of removed tokens
+
+        Returns: count of removed tokens
+
+        """
+        expired = select(orm.Token.id_).where(
+            orm.Token.expires <= datetime.now()
+        ).order_by(
+            orm.Token.expires
+        ).limit(
+            batch_size
+        ).with_for_update(
+            skip_locked=True
+        ).cte('expired').prefix_with('MATERIALIZED')
+        query = delete(orm.Token).where(orm.Token.id_ == expired.c.id_)
+        result = await self.session.execute(query)
+        if not await self.is_success_changing_query():
+            return 0
+        return result.rowcount
 
     async def delete(self, token_value: str) -> bool:
         """Remove token from database by token value.
@@ -95,9 +279,17 @@ class TokenDAL(BaseDAL):
         Args:
             token_value: str
 
-        Returns: bool
+        Returns: True - if token is removed, False - if it is not found
 
         """
-        query = delete(orm.Token).where(orm.Token.value == token_value)
-        await self.session.execute(query)
-        return await self.is_success_changing_query()
+        uuid_value = to_uuid(value=token_value)
+        if not uuid_value:
+            return False
+
+        token_cache.invalidate(token_value=token_value)
+        self.identity_map.evict(TOKEN_OWNER_ENTITY, uuid_value)
+        query = delete(orm.Token).where(orm.Token.value == uuid_value)
+        result = await self.session.execute(query)
+        if not await self.is_success_changing_query():
+            return False
+        return result.rowcount > 0
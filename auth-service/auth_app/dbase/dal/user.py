@@ -3,21 +3,92 @@
 import hashlib
 import random
 import string
-from typing import Union
+from datetime import date
+from enum import Enum
+from typing import List, NamedTuple, Set, Tuple, Union
 
-from sqlalchemy import func, select
+from sqlalchemy import Date, Integer, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
 from auth_app.dbase import orm
 from auth_app.dbase.dal.base import BaseDAL
+from auth_app.dbase.identity import USER_ENTITY, IdentityMap
+from auth_app.hashing import hashing_pool
+from auth_app.passwords import PasswordCheck, hash_password, verify_password
 
 __all__ = [
+    'SignUpResult',
+    'SignUpStatus',
+    'UserCredentials',
     'UserDAL',
 ]
 
 HASH_SALT_DELIMITER = '^'
 
+BULK_COLUMNS = ('name', 'login', 'hashed_password', 'value', 'target_date')
+
+CREATE_BULK_TABLE = """
+CREATE TEMP TABLE IF NOT EXISTS bulk_users(
+    name VARCHAR(50),
+    login VARCHAR(20),
+    hashed_password VARCHAR(255),
+    value INTEGER,
+    target_date DATE
+) ON COMMIT DELETE ROWS
+"""
+
+INSERT_BULK_USERS = """
+WITH inserted AS (
+    INSERT INTO users (name, login, hashed_password)
+    SELECT name, login, hashed_password FROM bulk_users
+    ON CONFLICT DO NOTHING
+    RETURNING id, login
+), inserted_salary AS (
+    INSERT INTO salary (user_id, value, target_date)
+    SELECT inserted.id, bulk_users.value, bulk_users.target_date
+    FROM inserted
+    JOIN bulk_users ON lower(bulk_users.login) = lower(inserted.login)
+)
+SELECT login FROM inserted
+"""
+
+
+class UserCredentials(NamedTuple):
+    """User record fields needed for authentication.
+
+    Args:
+        id_: user id
+        name: name of user
+        hashed_password: hashed password with salt
+
+    """
+    id_: int
+    name: str
+    hashed_password: str
+
+
+class SignUpStatus(Enum):
+    """User creation status."""
+
+    CREATED = 'created'
+    LOGIN_EXISTS = 'login-exists'
+    FAILED = 'failed'
+
+
+class SignUpResult(NamedTuple):
+    """Result of user creation.
+
+    Args:
+        status: user creation status
+        user_id: id of created user, -1 - if user is not created
+
+    """
+    status: SignUpStatus
+    user_id: int = -1
+
 
 def generate_random_string(length: int = 10) -> str:
     """Return random string.
@@ -34,7 +105,7 @@ def generate_random_string(length: int = 10) -> str:
 
 
 def get_hashed_password(password: str, salt: str) -> str:
-    """Return hashed password.
+    """Return hashed password in legacy format without salt.
 
     Args:
         password: str
@@ -56,25 +127,68 @@ def is_valid_password(password: str, hashed_password: str) -> bool:
 
     Args:
         password: input password
-        hashed_password: hashed password
+        hashed_password: hashed password in current or legacy format
 
     Returns: bool
 
     """
-    hashed_password, salt = hashed_password.split(HASH_SALT_DELIMITER)
-    return get_hashed_password(password, salt) == hashed_password
+    return verify_password(
+        password=password, hashed_password=hashed_password
+    ).is_valid
+
+
+async def verify_password_async(password: str,
+                                hashed_password: str) -> PasswordCheck:
+    """Check password validation, hashing is run in hashing pool.
+
+    Args:
+        password: input password
+        hashed_password: hashed password
+
+    Returns: PasswordCheck with new hash for outdated hashed password
+
+    """
+    return await hashing_pool.run(verify_password, password, hashed_password)
+
+
+async def create_hashed_password(password: str) -> str:
+    """Return hashed password with new random salt for saving to database.
+
+    Args:
+        password: str
+
+    Returns: str
+
+    """
+    return await hashing_pool.run(hash_password, password)
+
+
+async def create_hashed_passwords(passwords: List[str]) -> List[str]:
+    """Return hashed passwords with new random salts, hashing in parallel.
+
+    Args:
+        passwords: list of passwords
+
+    Returns: list of hashed passwords in passwords order
+
+    """
+    return await hashing_pool.run_many(
+        hash_password, ((password,) for password in passwords)
+    )
 
 
 class UserDAL(BaseDAL):
     """Class with user table methods."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession,
+                 identity_map: Union[IdentityMap, None] = None):
         """Initialize class method.
 
         Args:
             session: AsyncSession
+            identity_map: entities loaded by current request
         """
-        super().__init__(session=session)
+        super().__init__(session=session, identity_map=identity_map)
 
     async def get_by_id(self, id_: int) -> Union[models.ActiveUser, None]:
         """Return User info by id.
@@ -85,14 +199,20 @@ class UserDAL(BaseDAL):
         Returns: pydantic ActiveUser model
 
         """
-        query = select(orm.User).where(orm.User.id_ == id_)
-        user_orm = (await self.session.execute(query)).scalar()
-        if not user_orm:
-            return
-        return models.ActiveUser(
-            id_=user_orm.id_,
-            name=user_orm.name
+        if self.identity_map.contains(USER_ENTITY, id_):
+            return self.identity_map.get(USER_ENTITY, id_)
+
+        query = select(orm.User.id_, orm.User.name).where(
+            orm.User.id_ == id_
         )
+        record = (await self.execute_read(query)).first()
+        user = None
+        if record:
+            user = models.ActiveUser.construct(
+                id_=record.id_, name=record.name
+            )
+        self.identity_map.put(USER_ENTITY, id_, user)
+        return user
 
     async def get_id_by_login(self, login: str) -> int:
         """Return record id by login.
@@ -103,13 +223,13 @@ class UserDAL(BaseDAL):
         Returns: bool
 
         """
-        query = select(orm.User).where(
+        query = select(orm.User.id_).where(
             func.lower(orm.User.login) == login.lower()
         )
-        user_orm = (await self.session.execute(query)).scalar()
-        if not user_orm:
+        id_value = (await self.execute_read(query)).scalar()
+        if id_value is None:
             return -1
-        return user_orm.id_
+        return id_value
 
     async def is_exist(self, login: str) -> bool:
         """Return user existing by login.
@@ -123,6 +243,26 @@ class UserDAL(BaseDAL):
         id_value = await self.get_id_by_login(login=login)
         return id_value != -1
 
+    async def get_credentials(
+            self, login: str) -> Union[UserCredentials, None]:
+        """Return user credentials by login.
+
+        Args:
+            login: str
+
+        Returns: UserCredentials or None if login not found
+
+        """
+        query = select(
+            orm.User.id_, orm.User.name, orm.User.hashed_password
+        ).where(
+            func.lower(orm.User.login) == login.lower()
+        )
+        record = (await self.execute_read(query)).first()
+        if not record:
+            return
+        return UserCredentials(*record)
+
     async def is_valid_login_password_pair(self,
                                            user: models.UserAuth) -> bool:
         """Return validation by login and password.
@@ -133,16 +273,46 @@ class UserDAL(BaseDAL):
         Returns: bool
 
         """
-        query = select(orm.User).where(
-            func.lower(orm.User.login) == user.login.lower()
-        )
-        user_orm = (await self.session.execute(query)).scalar()
-        if not user_orm:
+        credentials = await self.get_credentials(login=user.login)
+        if not credentials:
             return False
-        return is_valid_password(
+        await self.release_connection()
+        check = await verify_password_async(
             password=user.password,
-            hashed_password=user_orm.hashed_password
+            hashed_password=credentials.hashed_password
         )
+        if check.new_hash:
+            await self.update_hashed_password(
+                id_=credentials.id_,
+                hashed_password=credentials.hashed_password,
+                new_hashed_password=check.new_hash
+            )
+        return check.is_valid
+
+    async def update_hashed_password(self, id_: int, hashed_password: str,
+                                     new_hashed_password: str) -> bool:
+        """Replace outdated hashed password after successful login.
+
+        Hash is replaced only if it is not changed after verification.
+
+        Args:
+            id_: user id
+            hashed_password: verified hashed password
+            new_hashed_password: hashed password with current parameters
+
+        Returns: bool
+
+        """
+        query = update(orm.User).where(
+            orm.User.id_ == id_,
+            orm.User.hashed_password == hashed_password
+        ).values(hashed_password=new_hashed_password)
+        try:
+            await self.session.execute(query)
+        except DBAPIError:
+            await self.session.rollback()
+            return False
+        return await self.is_success_changing_query()
 
     async def add(self, user: models.User) -> bool:
         """Add user to database.
@@ -153,19 +323,94 @@ class UserDAL(BaseDAL):
         Returns: bool
 
         """
-        is_exist = await self.is_exist(login=user.login)
-        if is_exist:
+        hashed_password = await create_hashed_password(
+            password=user.password
+        )
+        query = insert(orm.User).values(
+            name=user.name,
+            login=user.login,
+            hashed_password=hashed_password
+        ).on_conflict_do_nothing().returning(orm.User.id_)
+        try:
+            user_id = (await self.session.execute(query)).scalar()
+        except DBAPIError:
+            await self.session.rollback()
+            return False
+        if user_id is None:
+            await self.session.rollback()
             return False
+        return await self.is_success_changing_query()
 
-        salt = generate_random_string()
-        hashed_password = get_hashed_password(
-            password=user.password,
-            salt=salt
+    async def add_with_salary(self, user: models.User,
+                              salary: models.UserSalary) -> SignUpResult:
+        """Add user with salary info to database by one statement.
+
+        User and salary rows are inserted by one INSERT ... RETURNING
+        statement with CTE, so user is never saved without salary. Existing
+        login is detected by unique index of users table.
+
+        Args:
+            user: pydantic User model
+            salary: pydantic UserSalary model
+
+        Returns: SignUpResult
+
+        """
+        hashed_password = await create_hashed_password(
+            password=user.password
         )
-        user_orm = orm.User(
+        new_user = insert(orm.User).values(
             name=user.name,
             login=user.login,
-            hashed_password=f'{hashed_password}{HASH_SALT_DELIMITER}{salt}'
+            hashed_password=hashed_password
+        ).on_conflict_do_nothing().returning(orm.User.id_).cte('new_user')
+        query = insert(orm.Salary).from_select(
+            ['user_id', 'value', 'target_date'],
+            select(
+                new_user.c.id_,
+                literal(salary.value, type_=Integer),
+                literal(salary.target_date, type_=Date)
+            )
+        ).returning(orm.Salary.user_id)
+
+        try:
+            user_id = (await self.session.execute(query)).scalar()
+        except DBAPIError:
+            await self.session.rollback()
+            return SignUpResult(status=SignUpStatus.FAILED)
+        if user_id is None:
+            await self.session.rollback()
+            return SignUpResult(status=SignUpStatus.LOGIN_EXISTS)
+
+        if not await self.is_success_changing_query():
+            return SignUpResult(status=SignUpStatus.FAILED)
+        return SignUpResult(status=SignUpStatus.CREATED, user_id=user_id)
+
+    async def add_many_with_salary(
+            self, records: List[Tuple[str, str, str, int, date]]
+    ) -> Set[str]:
+        """Add users with salary info by COPY to staging table.
+
+        Records are copied to temporary table and moved to users and salary
+        tables by one statement. Logins in records must be unique, existing
+        logins are skipped.
+
+        Args:
+            records: tuples (name, login, hashed password, salary value,
+                salary target date)
+
+        Returns: set of added logins
+
+        """
+        await self.session.execute(text(CREATE_BULK_TABLE))
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            'bulk_users',
+            records=records,
+            columns=BULK_COLUMNS
         )
-        self.session.add(user_orm)
-        return await self.is_success_changing_query()
+        result = await self.session.execute(text(INSERT_BULK_USERS))
+        logins = set(result.scalars().all())
+        await self.session.commit()
+        return logins
@@ -0,0 +1,106 @@
+"""Module with request-scoped identity map of loaded entities."""
+
+from typing import Dict, Hashable, Tuple, Union
+
+__all__ = [
+    'IdentityMap',
+    'SALARY_ENTITY',
+    'TOKEN_OWNER_ENTITY',
+    'USER_ENTITY',
+]
+
+USER_ENTITY = 'user'
+SALARY_ENTITY = 'salary'
+TOKEN_OWNER_ENTITY = 'token_owner'
+
+
+class IdentityMap:
+    """Memo of entities loaded by DAL during one request.
+
+    DAL read methods look up entity here before querying database and save
+    query result after it, including not found entities. Map lives for one
+    request only (see dependencies.get_identity_map), so it never returns
+    data changed by other requests.
+
+    """
+
+    def __init__(self):
+        """Initialize class method."""
+        self.__items: Dict[Tuple[str, Hashable], object] = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def size(self) -> int:
+        """Return count of saved entities.
+
+        Returns: int
+
+        """
+        return len(self.__items)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return lookup counters.
+
+        Returns: dict
+
+        """
+        return {
+            'size': self.size,
+            'hits': self.__hits,
+            'misses': self.__misses,
+        }
+
+    def contains(self, kind: str, key: Hashable) -> bool:
+        """Return True if entity is saved, counts lookup.
+
+        Args:
+            kind: entity kind
+            key: entity key
+
+        Returns: bool
+
+        """
+        if (kind, key) in self.__items:
+            self.__hits += 1
+            return True
+        self.__misses += 1
+        return False
+
+    def get(self, kind: str, key: Hashable) -> Union[object, None]:
+        """Return saved entity.
+
+        Args:
+            kind: entity kind
+            key: entity key
+
+        Returns: entity or None
+
+        """
+        return self.__items.get((kind, key))
+
+    def put(self, kind: str, key: Hashable, entity: Union[object, None]):
+        """Save entity, None - entity is not found.
+
+        Args:
+            kind: entity kind
+            key: entity key
+            entity: loaded entity
+
+        Returns: None
+
+        """
+        self.__items[(kind, key)] = entity
+
+    def evict(self, kind: str, key: Hashable):
+        """Remove saved entity after it is changed.
+
+        Args:
+            kind: entity kind
+            key: entity key
+
+        Returns: None
+
+        """
+        self.__items.pop((kind, key), None)
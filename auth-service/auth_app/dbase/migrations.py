@@ -0,0 +1,192 @@
+"""Module with versioned database schema migrations.
+
+Base tables are created by dbase-service/postgres.sql, all later schema
+changes are listed here. Applied versions are saved to schema_version
+table, so existing database is upgraded without rebuild.
+
+Usage:
+    python -m auth_app.dbase.migrations
+
+"""
+
+import asyncio
+import logging
+from typing import List, NamedTuple, Tuple
+
+import dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from auth_app.dbase.connection import CustomConnection
+
+__all__ = [
+    'MIGRATIONS',
+    'Migration',
+    'get_current_version',
+    'upgrade',
+]
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_LOCK_KEY = 0x736368656d61
+
+CREATE_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version(
+    version INTEGER PRIMARY KEY,
+    description VARCHAR(200) NOT NULL,
+    applied TIMESTAMP NOT NULL DEFAULT now()
+)
+"""
+
+
+class Migration(NamedTuple):
+    """Schema migration.
+
+    Args:
+        version: schema version after migration
+        description: short description of changes
+        statements: SQL statements
+
+    """
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS = (
+    Migration(
+        version=1,
+        description='Indexes for token, salary and login lookups',
+        statements=(
+            'DELETE FROM tokens t USING tokens d '
+            'WHERE t.user_id = d.user_id AND t.id < d.id',
+            'CREATE UNIQUE INDEX IF NOT EXISTS tokens_user_id_key '
+            'ON tokens (user_id)',
+            'CREATE INDEX IF NOT EXISTS ix_tokens_expires '
+            'ON tokens (expires)',
+            'CREATE INDEX IF NOT EXISTS ix_tokens_value_covering '
+            'ON tokens (value) INCLUDE (user_id, expires)',
+            'DELETE FROM salary s USING salary d '
+            'WHERE s.user_id = d.user_id AND s.id < d.id',
+            'CREATE UNIQUE INDEX IF NOT EXISTS salary_user_id_key '
+            'ON salary (user_id)',
+            'CREATE UNIQUE INDEX IF NOT EXISTS ix_users_login_lower '
+            'ON users (lower(login))',
+        )
+    ),
+    Migration(
+        version=2,
+        description='Index for salary raises listing',
+        statements=(
+            'CREATE INDEX IF NOT EXISTS ix_salary_target_date_user_id '
+            'ON salary (target_date, user_id) INCLUDE (value)',
+        )
+    ),
+    Migration(
+        version=3,
+        description='Refresh tokens table',
+        statements=(
+            'CREATE TABLE IF NOT EXISTS refresh_tokens('
+            'id SERIAL PRIMARY KEY, '
+            'token_hash VARCHAR(64) NOT NULL, '
+            'expires TIMESTAMP NOT NULL, '
+            'user_id INTEGER NOT NULL '
+            'REFERENCES users(id) ON DELETE CASCADE)',
+            'CREATE UNIQUE INDEX IF NOT EXISTS refresh_tokens_token_hash_key '
+            'ON refresh_tokens (token_hash)',
+            'CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires '
+            'ON refresh_tokens (expires)',
+            'CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id '
+            'ON refresh_tokens (user_id)',
+        )
+    ),
+    Migration(
+        version=4,
+        description='Longer hashed password for versioned hash format',
+        statements=(
+            'ALTER TABLE users ALTER COLUMN hashed_password '
+            'TYPE VARCHAR(255)',
+        )
+    ),
+)
+
+
+async def get_current_version(engine: AsyncEngine) -> int:
+    """Return current schema version.
+
+    Args:
+        engine: AsyncEngine
+
+    Returns: int, 0 - for database without applied migrations
+
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(CREATE_VERSION_TABLE))
+        query = text('SELECT coalesce(max(version), 0) FROM schema_version')
+        return (await conn.execute(query)).scalar()
+
+
+async def upgrade(engine: AsyncEngine) -> List[int]:
+    """Apply all pending migrations.
+
+    Migrations are applied in one transaction under advisory lock, so
+    workers started at the same time don't apply them twice.
+
+    Args:
+        engine: AsyncEngine
+
+    Returns: list of applied versions
+
+    """
+    applied = []
+    async with engine.begin() as conn:
+        await conn.execute(
+            text('SELECT pg_advisory_xact_lock(:key)'),
+            {'key': MIGRATIONS_LOCK_KEY}
+        )
+        await conn.execute(text(CREATE_VERSION_TABLE))
+        query = text('SELECT coalesce(max(version), 0) FROM schema_version')
+        current_version = (await conn.execute(query)).scalar()
+
+        for migration in MIGRATIONS:
+            if migration.version <= current_version:
+                continue
+            for statement in migration.statements:
+                await conn.exec_driver_sql(statement)
+            await conn.execute(
+                text(
+                    'INSERT INTO schema_version (version, description) '
+                    'VALUES (:version, :description)'
+                ),
+                {
+                    'version': migration.version,
+                    'description': migration.description
+                }
+            )
+            applied.append(migration.version)
+            logger.info(
+                'Schema migration is applied: version=%d (%s)',
+                migration.version, migration.description
+            )
+    return applied
+
+
+async def main():
+    """Apply pending migrations to database from environment settings.
+
+    Returns: None
+
+    """
+    connection = CustomConnection()
+    try:
+        applied = await upgrade(engine=connection.engine)
+        version = await get_current_version(engine=connection.engine)
+    finally:
+        await connection.close()
+    print(f'Applied migrations: {applied or "none"}')
+    print(f'Schema version: {version}')
+
+
+if __name__ == '__main__':
+    dotenv.load_dotenv()
+    asyncio.run(main())
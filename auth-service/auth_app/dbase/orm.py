@@ -1,7 +1,9 @@
 """Module with SQLAlchemy models."""
 
-import sqlalchemy
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String
+from uuid import uuid4
+
+from sqlalchemy import (Column, Date, DateTime, ForeignKey, Index, Integer,
+                        String, func)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -9,6 +11,7 @@ __all__ = [
     'User',
     'Token',
     'Salary',
+    'RefreshToken',
 ]
 
 base = declarative_base()
@@ -37,12 +40,15 @@ class User(base):
     )
     hashed_password = Column(
         name='hashed_password',
-        type_=String(length=100),
+        type_=String(length=255),
         nullable=False,
         unique=True
     )
 
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_login_lower', func.lower(login), unique=True),
+    )
 
 
 class Token(base):
@@ -57,25 +63,34 @@ class Token(base):
     )
     value = Column(
         name='value',
-        type_=UUID(as_uuid=False),
+        type_=UUID(as_uuid=True),
         nullable=False,
         unique=True,
-        server_default=sqlalchemy.text('uuid_generate_v4()')
+        default=uuid4
     )
     expires = Column(
         name='expires',
         type_=DateTime,
-        nullable=False
+        nullable=False,
+        index=True
     )
     user_id = Column(
         ForeignKey('users.id'),
         name='user_id',
         type_=Integer,
-        nullable=False
+        nullable=False,
+        unique=True
     )
     user = relationship(argument='User')
 
     __tablename__ = 'tokens'
+    __table_args__ = (
+        Index(
+            'ix_tokens_value_covering',
+            value,
+            postgresql_include=['user_id', 'expires']
+        ),
+    )
 
 
 class Salary(base):
@@ -103,8 +118,54 @@ class Salary(base):
         ForeignKey('users.id'),
         name='user_id',
         type_=Integer,
-        nullable=False
+        nullable=False,
+        unique=True
     )
     user = relationship(argument='User')
 
     __tablename__ = 'salary'
+    __table_args__ = (
+        Index(
+            'ix_salary_target_date_user_id',
+            target_date,
+            user_id,
+            postgresql_include=['value']
+        ),
+    )
+
+
+class RefreshToken(base):
+    """Refresh tokens table.
+
+    Token value is not stored, only its SHA-256 hex digest.
+
+    """
+
+    id_ = Column(
+        name='id',
+        type_=Integer,
+        primary_key=True,
+        autoincrement=True
+    )
+    token_hash = Column(
+        name='token_hash',
+        type_=String(64),
+        nullable=False,
+        unique=True
+    )
+    expires = Column(
+        name='expires',
+        type_=DateTime,
+        nullable=False,
+        index=True
+    )
+    user_id = Column(
+        ForeignKey('users.id', ondelete='CASCADE'),
+        name='user_id',
+        type_=Integer,
+        nullable=False,
+        index=True
+    )
+    user = relationship(argument='User')
+
+    __tablename__ = 'refresh_tokens'
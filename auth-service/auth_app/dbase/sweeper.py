@@ -0,0 +1,212 @@
+"""Module with background cleaner of expired access and refresh tokens."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Type, Union
+
+from auth_app.dbase.connection import CustomConnection
+from auth_app.dbase.dal.refresh_token import RefreshTokenDAL
+from auth_app.dbase.dal.token_ import TokenDAL
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'TokenSweeper',
+    'create_token_sweeper',
+]
+
+logger = logging.getLogger(__name__)
+
+SWEEPER_LOCK_KEY = 0x746f6b656e73
+DEFAULT_SWEEP_INTERVAL = 60
+DEFAULT_SWEEP_BATCH_SIZE = 1000
+DEFAULT_SWEEP_MAX_BATCHES = 100
+SWEPT_DAL_CLASSES = (TokenDAL, RefreshTokenDAL)
+
+
+class TokenSweeper:
+    """Periodic task which removes expired tokens in batches.
+
+    Every batch is removed in own transaction under advisory lock, so only
+    one worker of all app instances sweeps table at the same time.
+
+    """
+
+    def __init__(self, connection: CustomConnection,
+                 interval: int = DEFAULT_SWEEP_INTERVAL,
+                 batch_size: int = DEFAULT_SWEEP_BATCH_SIZE,
+                 max_batches: int = DEFAULT_SWEEP_MAX_BATCHES):
+        """Initialize class method.
+
+        Args:
+            connection: database connection
+            interval: seconds between sweeps, 0 - sweeper is disabled
+            batch_size: max count of tokens removed by one query, at least 1
+            max_batches: max count of batches per one sweep, at least 1
+        """
+        if batch_size < 1:
+            raise ValueError(f'Invalid sweep batch size: {batch_size}')
+        if max_batches < 1:
+            raise ValueError(f'Invalid sweep max batches: {max_batches}')
+        self.__connection = connection
+        self.__interval = interval
+        self.__batch_size = batch_size
+        self.__max_batches = max_batches
+        self.__task: Union[asyncio.Task, None] = None
+        self.__sweeps = 0
+        self.__batches = 0
+        self.__swept = 0
+        self.__last_swept = 0
+        self.__skipped = 0
+        self.__errors = 0
+        self.__last_batch_latency = 0.0
+        self.__max_batch_latency = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if background task is running.
+
+        Returns: bool
+
+        """
+        return self.__task is not None and not self.__task.done()
+
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return sweeper counters.
+
+        Returns: dict
+
+        """
+        return {
+            'interval': self.__interval,
+            'batch_size': self.__batch_size,
+            'sweeps': self.__sweeps,
+            'batches': self.__batches,
+            'swept': self.__swept,
+            'last_swept': self.__last_swept,
+            'skipped': self.__skipped,
+            'errors': self.__errors,
+            'last_batch_latency_ms': round(
+                self.__last_batch_latency * 1000, 3
+            ),
+            'max_batch_latency_ms': round(
+                self.__max_batch_latency * 1000, 3
+            ),
+        }
+
+    async def sweep_batch(
+            self,
+            dal_class: Type[Union[TokenDAL, RefreshTokenDAL]] = TokenDAL
+    ) -> Union[int, None]:
+        """Remove one batch of expired tokens.
+
+        Args:
+            dal_class: DAL of swept table - TokenDAL or RefreshTokenDAL
+
+        Returns: count of removed tokens or None if lock is not acquired
+
+        """
+        start = time.perf_counter()
+        async with self.__connection.async_session as session:
+            token_dal = dal_class(session=session)
+            if not await token_dal.try_advisory_lock(key=SWEEPER_LOCK_KEY):
+                await session.rollback()
+                return
+            count = await token_dal.delete_expired(
+                batch_size=self.__batch_size
+            )
+
+        latency = time.perf_counter() - start
+        self.__batches += 1
+        self.__swept += count
+        self.__last_batch_latency = latency
+        self.__max_batch_latency = max(self.__max_batch_latency, latency)
+        return count
+
+    async def sweep(self) -> int:
+        """Remove expired tokens batch by batch.
+
+        Returns: count of removed tokens
+
+        """
+        self.__sweeps += 1
+        swept = 0
+        for dal_class in SWEPT_DAL_CLASSES:
+            for _ in range(self.__max_batches):
+                count = await self.sweep_batch(dal_class=dal_class)
+                if count is None:
+                    self.__skipped += 1
+                    break
+                swept += count
+                if count < self.__batch_size:
+                    break
+            if count is None:
+                break
+
+        self.__last_swept = swept
+        if swept:
+            logger.info(
+                'Expired tokens are swept: count=%d latency_ms=%.3f',
+                swept, self.__last_batch_latency * 1000
+            )
+        return swept
+
+    async def run(self):
+        """Sweep tokens periodically until task is cancelled.
+
+        Returns: None
+
+        """
+        while True:
+            await asyncio.sleep(self.__interval)
+            try:
+                await self.sweep()
+            except Exception:
+                self.__errors += 1
+                logger.exception('Expired tokens sweep is failed')
+
+    def start(self):
+        """Start background task.
+
+        Returns: None
+
+        """
+        if self.__interval > 0 and not self.is_running:
+            self.__task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Stop background task.
+
+        Returns: None
+
+        """
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+
+def create_token_sweeper(connection: CustomConnection) -> TokenSweeper:
+    """Return sweeper configured by environment variables.
+
+    Args:
+        connection: database connection
+
+    Returns: TokenSweeper
+
+    """
+    return TokenSweeper(
+        connection=connection,
+        interval=get_int_env('TOKEN_SWEEP_INTERVAL', DEFAULT_SWEEP_INTERVAL),
+        batch_size=get_int_env(
+            'TOKEN_SWEEP_BATCH_SIZE', DEFAULT_SWEEP_BATCH_SIZE
+        ),
+        max_batches=get_int_env(
+            'TOKEN_SWEEP_MAX_BATCHES', DEFAULT_SWEEP_MAX_BATCHES
+        )
+    )
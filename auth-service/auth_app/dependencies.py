@@ -1,71 +1,189 @@
 """Module with FastAPI dependencies."""
 
-from fastapi import Depends, status
+import hmac
+import os
+from typing import Union
+
+from fastapi import Depends, Request, status
 from fastapi.exceptions import HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import (APIKeyHeader, OAuth2PasswordBearer,
+                              OAuth2PasswordRequestForm)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
-from auth_app.dbase.connection import CustomConnection
-from auth_app.dbase.dal.token_ import TokenDAL
-from auth_app.dbase.dal.user import UserDAL
+from auth_app.cache import token_cache
+from auth_app.dbase.dal.token_ import TokenDAL, TokenStatus
+from auth_app.dbase.identity import USER_ENTITY, IdentityMap
+from auth_app.signed_token import is_signed_token, token_signer
+from auth_app.throttling import login_throttle
 
 __all__ = [
     'get_session',
-    'get_active_user'
+    'get_identity_map',
+    'get_active_user',
+    'verify_admin_key',
+    'get_client_address',
+    'throttle_login',
 ]
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth')
+admin_key_scheme = APIKeyHeader(name='X-Admin-Key', auto_error=False)
 
 
-async def get_session() -> AsyncSession:
+async def get_session(request: Request) -> AsyncSession:
     """Return async session context.
 
+    Session is created from connection pool of application (see app
+    lifespan), so requests don't open new database engines. Connection is
+    checked out on first query only, dependencies and routes return it to
+    pool after each unit of work (see BaseDAL.release_connection).
+
+    Args:
+        request: current request
+
     Returns: AsyncSession
 
     """
-    conn = CustomConnection()
-    async with conn.async_session as session:
+    async with request.app.state.connection.async_session as session:
         yield session
 
 
+async def get_identity_map() -> IdentityMap:
+    """Return identity map of current request.
+
+    FastAPI caches dependency value for request, so all dependencies and
+    route of one request share the same map.
+
+    Returns: IdentityMap
+
+    """
+    return IdentityMap()
+
+
 async def get_active_user(
         token_value: str = Depends(oauth2_scheme),
-        session: AsyncSession = Depends(get_session)
+        session: AsyncSession = Depends(get_session),
+        identity_map: IdentityMap = Depends(get_identity_map)
 ) -> models.ActiveUser:
     """Return active user information after authorization.
 
+    Signed token is verified without database, database token is read
+    from token cache or tokens table.
+
     Args:
         token_value: pydantic model Token
         session: AsyncSession
+        identity_map: entities loaded by current request
 
     Returns: pydantic ActiveUser model
 
     """
-    token_dal = TokenDAL(session=session)
-    user_id = await token_dal.get_user_id(token_value=token_value)
-    if user_id < 0:
+    is_signed = (
+        token_signer.is_enabled and is_signed_token(token_value=token_value)
+    )
+    if is_signed:
+        owner = token_signer.verify(token_value=token_value)
+    else:
+        user = token_cache.get(token_value=token_value)
+        if user:
+            identity_map.put(USER_ENTITY, user.id_, user)
+            return user
+
+        token_dal = TokenDAL(session=session, identity_map=identity_map)
+        owner = await token_dal.get_owner(token_value=token_value)
+        await token_dal.release_connection()
+    if owner.status == TokenStatus.NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Invalid authentication credentials'
         )
 
-    token = await token_dal.get_by_user_id(id_=user_id)
-    if not token.is_valid:
+    if owner.status == TokenStatus.EXPIRED:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Token is expired'
         )
 
-    user_dal = UserDAL(session=session)
-    user = await user_dal.get_by_id(id_=user_id)
-    if not user:
+    if owner.status == TokenStatus.USER_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='User info not found'
         )
 
-    return models.ActiveUser(
-        id_=user_id,
-        name=user.name
+    if is_signed:
+        identity_map.put(USER_ENTITY, owner.user.id_, owner.user)
+    else:
+        token_cache.put(
+            token_value=token_value,
+            user=owner.user,
+            expires=owner.expires
+        )
+    return owner.user
+
+
+async def verify_admin_key(admin_key: str = Depends(admin_key_scheme)):
+    """Check admin API key of request.
+
+    Admin routes are disabled if ADMIN_API_KEY variable is not set.
+
+    Args:
+        admin_key: value of X-Admin-Key header
+
+    Returns: None
+
+    """
+    expected_key = os.getenv('ADMIN_API_KEY')
+    if not expected_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Admin API is disabled'
+        )
+    if not admin_key or not hmac.compare_digest(
+            admin_key.encode(), expected_key.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Invalid admin key'
+        )
+
+
+async def get_client_address(request: Request) -> Union[str, None]:
+    """Return address of client.
+
+    Behind proxy uvicorn takes address from X-Forwarded-For header if
+    proxy address is in APP_FORWARDED_ALLOW_IPS, else it is proxy address.
+
+    Args:
+        request: current request
+
+    Returns: str or None if address is unknown
+
+    """
+    return request.client.host if request.client else None
+
+
+async def throttle_login(
+        auth_form: OAuth2PasswordRequestForm = Depends(),
+        client: Union[str, None] = Depends(get_client_address)
+):
+    """Reject login attempt over limit of login or client address.
+
+    Dependency is checked before route reads credentials, so rejected
+    attempt doesn't use database and hashing pool.
+
+    Args:
+        auth_form: OAuth2PasswordRequestForm
+        client: client address
+
+    Returns: None
+
+    """
+    retry_after = login_throttle.check(
+        login=auth_form.username, client=client
     )
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Too many login attempts',
+            headers={'Retry-After': str(retry_after)}
+        )
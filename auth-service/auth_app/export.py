@@ -0,0 +1,76 @@
+"""Module with formatters of salary export.
+
+Export rows are written batch by batch, so response size doesn't affect
+memory of worker.
+
+"""
+
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterable, Tuple
+
+from auth_app.models import format_date
+
+__all__ = [
+    'EXPORT_COLUMNS',
+    'ExportRow',
+    'format_csv_header',
+    'format_csv_rows',
+    'format_ndjson_rows',
+]
+
+EXPORT_COLUMNS = ('UserID', 'Name', 'Salary', 'TargetDate')
+
+ExportRow = Tuple[int, str, int, date]
+
+
+def format_ndjson_rows(rows: Iterable[ExportRow]) -> str:
+    """Return rows as NDJSON lines in SalaryInfo response format.
+
+    Args:
+        rows: user id, name, salary value and target date
+
+    Returns: str
+
+    """
+    return ''.join(
+        json.dumps(
+            {
+                'UserID': user_id,
+                'Name': name,
+                'Salary': value,
+                'TargetDate': format_date(target_date),
+            },
+            ensure_ascii=False
+        ) + '\n'
+        for user_id, name, value, target_date in rows
+    )
+
+
+def format_csv_header() -> str:
+    """Return CSV header line.
+
+    Returns: str
+
+    """
+    return ','.join(EXPORT_COLUMNS) + '\r\n'
+
+
+def format_csv_rows(rows: Iterable[ExportRow]) -> str:
+    """Return rows as CSV lines.
+
+    Args:
+        rows: user id, name, salary value and target date
+
+    Returns: str
+
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        (user_id, name, value, format_date(target_date))
+        for user_id, name, value, target_date in rows
+    )
+    return buffer.getvalue()
@@ -0,0 +1,213 @@
+"""Module with executor pool for CPU-heavy password hashing."""
+
+import asyncio
+import os
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar, Union
+
+from auth_app.settings import get_int_env
+from auth_app.timing import HASH_PHASE, measure
+
+__all__ = [
+    'HashingPool',
+    'HashingPoolOverloadedError',
+    'hashing_pool',
+]
+
+THREAD_POOL_KIND = 'thread'
+PROCESS_POOL_KIND = 'process'
+DEFAULT_QUEUE_SIZE = 64
+OVERLOAD_RETRY_DELAY = 0.01
+
+ResultType = TypeVar('ResultType')
+
+
+class HashingPoolOverloadedError(Exception):
+    """Hashing pool queue is full."""
+
+
+class HashingPool:
+    """Bounded executor pool for password hashing.
+
+    Hashing functions are run out of event loop, so slow PBKDF2 calls
+    don't block other requests. Count of waiting tasks is limited by queue
+    size: new task over limit is rejected with HashingPoolOverloadedError.
+
+    """
+
+    def __init__(self, kind: str = THREAD_POOL_KIND,
+                 workers: Union[int, None] = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        """Initialize class method.
+
+        Args:
+            kind: pool kind - thread or process
+            workers: count of workers, default - count of CPU cores
+            queue_size: max count of tasks waiting for free worker
+        """
+        if kind not in (THREAD_POOL_KIND, PROCESS_POOL_KIND):
+            raise ValueError(f'Invalid hashing pool kind: {kind}')
+        self.__kind = kind
+        self.__workers = workers or os.cpu_count() or 1
+        self.__queue_size = queue_size
+        self.__executor: Union[Executor, None] = None
+        self.__in_flight = 0
+        self.__peak_in_flight = 0
+        self.__completed = 0
+        self.__failed = 0
+        self.__rejected = 0
+
+    @property
+    def kind(self) -> str:
+        """Return pool kind.
+
+        Returns: str
+
+        """
+        return self.__kind
+
+    @property
+    def workers(self) -> int:
+        """Return count of workers.
+
+        Returns: int
+
+        """
+        return self.__workers
+
+    @property
+    def in_flight(self) -> int:
+        """Return count of running and waiting tasks.
+
+        Returns: int
+
+        """
+        return self.__in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Return count of tasks waiting for free worker.
+
+        Returns: int
+
+        """
+        return max(0, self.__in_flight - self.__workers)
+
+    @property
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """Return pool counters.
+
+        Returns: dict
+
+        """
+        return {
+            'kind': self.kind,
+            'workers': self.workers,
+            'queue_size': self.__queue_size,
+            'queue_depth': self.queue_depth,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.__peak_in_flight,
+            'completed': self.__completed,
+            'failed': self.__failed,
+            'rejected': self.__rejected,
+        }
+
+    def get_executor(self) -> Executor:
+        """Return executor, create it on first call.
+
+        Returns: Executor
+
+        """
+        if self.__executor is None:
+            if self.__kind == PROCESS_POOL_KIND:
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.__workers
+                )
+            else:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.__workers,
+                    thread_name_prefix='hashing'
+                )
+        return self.__executor
+
+    async def run(self, func: Callable[..., ResultType],
+                  *args) -> ResultType:
+        """Run function in pool and return its result.
+
+        Args:
+            func: module-level function (must be picklable for process pool)
+            *args: function arguments
+
+        Returns: function result
+
+        """
+        if self.__in_flight >= self.__workers + self.__queue_size:
+            self.__rejected += 1
+            raise HashingPoolOverloadedError(
+                'Too many password hashing tasks'
+            )
+
+        self.__in_flight += 1
+        self.__peak_in_flight = max(self.__peak_in_flight, self.__in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            with measure(phase=HASH_PHASE):
+                result = await loop.run_in_executor(
+                    self.get_executor(), func, *args
+                )
+        except BaseException:
+            self.__failed += 1
+            raise
+        finally:
+            self.__in_flight -= 1
+        self.__completed += 1
+        return result
+
+    async def run_many(self, func: Callable[..., ResultType],
+                       args_list: Iterable[Tuple]) -> List[ResultType]:
+        """Run function for every arguments tuple and return results.
+
+        Batch tasks use at most workers count of pool places and wait for
+        free place instead of rejection, so interactive requests keep
+        their queue.
+
+        Args:
+            func: module-level function (must be picklable for process pool)
+            args_list: function arguments
+
+        Returns: list of function results in arguments order
+
+        """
+        semaphore = asyncio.Semaphore(self.__workers)
+
+        async def run_one(args: Tuple) -> ResultType:
+            async with semaphore:
+                while True:
+                    try:
+                        return await self.run(func, *args)
+                    except HashingPoolOverloadedError:
+                        await asyncio.sleep(OVERLOAD_RETRY_DELAY)
+
+        return list(
+            await asyncio.gather(*(run_one(args) for args in args_list))
+        )
+
+    def shutdown(self):
+        """Stop pool workers.
+
+        Pool can be used again after shutdown: new workers will be created.
+
+        Returns: None
+
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+
+
+hashing_pool = HashingPool(
+    kind=os.getenv('HASH_POOL_KIND', THREAD_POOL_KIND),
+    workers=get_int_env('HASH_POOL_WORKERS', 0),
+    queue_size=get_int_env('HASH_POOL_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)
+)
@@ -5,7 +5,7 @@ This module contains models with database fields.
 """
 
 from datetime import date, datetime
-from typing import List
+from typing import List, Union
 
 from pydantic import BaseModel, Field
 
@@ -27,7 +27,12 @@ def format_date(value: date) -> str:
 
 
 class CustomBaseModel(BaseModel):
-    """Base model."""
+    """Base model.
+
+    Models with trusted database rows are created by construct() in DAL,
+    so values already typed by database are not validated again.
+
+    """
 
     class Config:
         """Model configuration."""
@@ -102,6 +107,16 @@ class Token(CustomBaseModel):
         return datetime.now() < self.expires
 
 
+class TokenWithRefresh(Token):
+    """Model with token and refresh token information.
+
+    Args:
+        refresh_token: one-time token for new token without password
+
+    """
+    refresh_token: str = Field(alias='refresh_token')
+
+
 class ActiveUser(CustomBaseModel):
     """Model with active user information.
 
@@ -140,3 +155,15 @@ class UserSalary(CustomBaseModel):
     """
     value: int = Field(alias='Value')
     target_date: date = Field(alias='TargetDate')
+
+
+class SalaryRaisePage(CustomBaseModel):
+    """Model with page of upcoming salary raises.
+
+    Args:
+        items: salary info ordered by target date and user id
+        next_cursor: cursor of next page, None - for last page
+
+    """
+    items: List[SalaryInfo] = Field(alias='Items', default=[])
+    next_cursor: Union[str, None] = Field(alias='NextCursor', default=None)
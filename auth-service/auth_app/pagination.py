@@ -0,0 +1,49 @@
+"""Module with keyset pagination cursors.
+
+Cursor keeps sort key of the last returned row, so next page is read by
+index seek instead of OFFSET scan. Clients must treat it as opaque string.
+
+"""
+
+import base64
+from datetime import date
+from typing import Tuple
+
+__all__ = [
+    'decode_cursor',
+    'encode_cursor',
+]
+
+CURSOR_DELIMITER = '|'
+
+
+def encode_cursor(target_date: date, user_id: int) -> str:
+    """Return cursor for raises page which starts after given row.
+
+    Args:
+        target_date: salary increase date of last row
+        user_id: user id of last row
+
+    Returns: str
+
+    """
+    value = f'{target_date.isoformat()}{CURSOR_DELIMITER}{user_id}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Return sort key from cursor.
+
+    Args:
+        cursor: value from encode_cursor
+
+    Returns: salary increase date and user id
+
+    """
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        value = base64.urlsafe_b64decode(cursor + padding).decode()
+        target_date, user_id = value.split(CURSOR_DELIMITER)
+        return date.fromisoformat(target_date), int(user_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
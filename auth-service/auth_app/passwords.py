@@ -0,0 +1,451 @@
+"""Module with versioned password hash format.
+
+Hash is saved as self-describing string:
+
+    $<algorithm>$<param>=<value>,...$<salt>$<digest>
+
+salt and digest are base64 without padding. Supported algorithms are
+pbkdf2-sha256 and scrypt. Legacy hashes in hash^salt format (PBKDF2-SHA256
+with 20000 iterations and hex digest) are still verified, they are replaced
+by current format after successful login.
+
+Current algorithm and its cost are read from environment variables, cost
+for target verification time is printed by calibration utility.
+
+Usage:
+    python -m auth_app.passwords [--algorithm ALGORITHM] [--target-ms MS]
+
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import time
+from typing import Dict, NamedTuple, Union
+
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'PBKDF2_SHA256',
+    'PasswordCheck',
+    'PasswordHash',
+    'PasswordHasher',
+    'SCRYPT',
+    'calibrate',
+    'create_password_hasher',
+    'hash_password',
+    'password_hasher',
+    'verify_password',
+]
+
+PBKDF2_SHA256 = 'pbkdf2-sha256'
+SCRYPT = 'scrypt'
+ALGORITHM_PARAMS = {
+    PBKDF2_SHA256: ('i',),
+    SCRYPT: ('n', 'r', 'p'),
+}
+DEFAULT_PARAMS = {
+    PBKDF2_SHA256: {'i': 20000},
+    SCRYPT: {'n': 2 ** 14, 'r': 8, 'p': 1},
+}
+HASH_DELIMITER = '$'
+LEGACY_DELIMITER = '^'
+LEGACY_ITERATIONS = 20000
+SALT_SIZE = 16
+DIGEST_SIZE = 32
+DEFAULT_TARGET_MS = 100
+MAX_SCRYPT_N = 2 ** 20
+CALIBRATION_PASSWORD = 'calibration'
+
+
+class PasswordHash(NamedTuple):
+    """Parsed password hash.
+
+    Args:
+        algorithm: pbkdf2-sha256 or scrypt
+        params: algorithm cost parameters
+        salt: salt bytes
+        digest: digest bytes
+        is_legacy: True for hash in hash^salt format
+
+    """
+    algorithm: str
+    params: Dict[str, int]
+    salt: bytes
+    digest: bytes
+    is_legacy: bool = False
+
+    def to_string(self) -> str:
+        """Return hash in saved format.
+
+        Returns: str
+
+        """
+        params = ','.join(
+            f'{name}={self.params[name]}'
+            for name in ALGORITHM_PARAMS[self.algorithm]
+        )
+        return HASH_DELIMITER + HASH_DELIMITER.join((
+            self.algorithm,
+            params,
+            encode_base64(value=self.salt),
+            encode_base64(value=self.digest)
+        ))
+
+
+class PasswordCheck(NamedTuple):
+    """Result of password verification.
+
+    Args:
+        is_valid: True for correct password
+        new_hash: hash with current parameters if saved hash is outdated
+
+    """
+    is_valid: bool
+    new_hash: Union[str, None] = None
+
+
+def encode_base64(value: bytes) -> str:
+    """Return base64 string without padding.
+
+    Args:
+        value: bytes
+
+    Returns: str
+
+    """
+    return base64.b64encode(value).decode().rstrip('=')
+
+
+def decode_base64(value: str) -> bytes:
+    """Return bytes from base64 string without padding.
+
+    Args:
+        value: str
+
+    Returns: bytes
+
+    """
+    return base64.b64decode(value + '=' * (-len(value) % 4), validate=True)
+
+
+def compute_digest(algorithm: str, params: Dict[str, int], password: bytes,
+                   salt: bytes) -> bytes:
+    """Return password digest.
+
+    Args:
+        algorithm: pbkdf2-sha256 or scrypt
+        params: algorithm cost parameters
+        password: password bytes
+        salt: salt bytes
+
+    Returns: bytes
+
+    """
+    if algorithm == PBKDF2_SHA256:
+        return hashlib.pbkdf2_hmac(
+            hash_name='sha256',
+            password=password,
+            salt=salt,
+            iterations=params['i']
+        )
+    if algorithm == SCRYPT:
+        return hashlib.scrypt(
+            password,
+            salt=salt,
+            n=params['n'],
+            r=params['r'],
+            p=params['p'],
+            maxmem=256 * params['n'] * params['r'] * params['p'],
+            dklen=DIGEST_SIZE
+        )
+    raise ValueError(f'Unknown password hash algorithm: {algorithm}')
+
+
+def parse_hash(value: str) -> PasswordHash:
+    """Return parsed password hash.
+
+    Args:
+        value: hash in current or legacy format
+
+    Returns: PasswordHash
+
+    """
+    if not value.startswith(HASH_DELIMITER):
+        digest, salt = value.split(LEGACY_DELIMITER)
+        return PasswordHash(
+            algorithm=PBKDF2_SHA256,
+            params={'i': LEGACY_ITERATIONS},
+            salt=salt.encode(),
+            digest=bytes.fromhex(digest),
+            is_legacy=True
+        )
+
+    algorithm, params, salt, digest = value[1:].split(HASH_DELIMITER)
+    if algorithm not in ALGORITHM_PARAMS:
+        raise ValueError(f'Unknown password hash algorithm: {algorithm}')
+    params = dict(
+        (name, int(number))
+        for name, number in (item.split('=') for item in params.split(','))
+    )
+    if set(params) != set(ALGORITHM_PARAMS[algorithm]):
+        raise ValueError(f'Invalid {algorithm} parameters')
+    return PasswordHash(
+        algorithm=algorithm,
+        params=params,
+        salt=decode_base64(value=salt),
+        digest=decode_base64(value=digest)
+    )
+
+
+class PasswordHasher:
+    """Password hashing with current algorithm and cost."""
+
+    def __init__(self, algorithm: str = PBKDF2_SHA256,
+                 params: Union[Dict[str, int], None] = None):
+        """Initialize class method.
+
+        Args:
+            algorithm: pbkdf2-sha256 or scrypt
+            params: algorithm cost parameters, default - DEFAULT_PARAMS
+        """
+        if algorithm not in ALGORITHM_PARAMS:
+            raise ValueError(f'Unknown password hash algorithm: {algorithm}')
+        self.__algorithm = algorithm
+        self.__params = dict(DEFAULT_PARAMS[algorithm], **(params or {}))
+
+    @property
+    def algorithm(self) -> str:
+        """Return current algorithm.
+
+        Returns: str
+
+        """
+        return self.__algorithm
+
+    @property
+    def params(self) -> Dict[str, int]:
+        """Return current cost parameters.
+
+        Returns: dict
+
+        """
+        return dict(self.__params)
+
+    def hash(self, password: str) -> str:
+        """Return hash of password with new random salt.
+
+        Args:
+            password: str
+
+        Returns: str
+
+        """
+        salt = os.urandom(SALT_SIZE)
+        return PasswordHash(
+            algorithm=self.__algorithm,
+            params=self.__params,
+            salt=salt,
+            digest=compute_digest(
+                algorithm=self.__algorithm,
+                params=self.__params,
+                password=password.encode(),
+                salt=salt
+            )
+        ).to_string()
+
+    def needs_rehash(self, password_hash: PasswordHash) -> bool:
+        """Return True if hash is not made by current parameters.
+
+        Args:
+            password_hash: PasswordHash
+
+        Returns: bool
+
+        """
+        if password_hash.is_legacy:
+            return True
+        if password_hash.algorithm != self.__algorithm:
+            return True
+        return password_hash.params != self.__params
+
+    def verify(self, password: str, hashed_password: str) -> PasswordCheck:
+        """Check password, return new hash for outdated saved hash.
+
+        Args:
+            password: input password
+            hashed_password: saved hash in current or legacy format
+
+        Returns: PasswordCheck
+
+        """
+        try:
+            password_hash = parse_hash(value=hashed_password)
+        except ValueError:
+            return PasswordCheck(is_valid=False)
+
+        digest = compute_digest(
+            algorithm=password_hash.algorithm,
+            params=password_hash.params,
+            password=password.encode(),
+            salt=password_hash.salt
+        )
+        if not hmac.compare_digest(digest, password_hash.digest):
+            return PasswordCheck(is_valid=False)
+        if not self.needs_rehash(password_hash=password_hash):
+            return PasswordCheck(is_valid=True)
+        return PasswordCheck(is_valid=True, new_hash=self.hash(password))
+
+
+def create_password_hasher() -> PasswordHasher:
+    """Return hasher configured by environment variables.
+
+    PASSWORD_HASH_ALGORITHM - pbkdf2-sha256 (default) or scrypt,
+    PASSWORD_HASH_ITERATIONS - PBKDF2 iterations,
+    PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P - scrypt cost.
+
+    Returns: PasswordHasher
+
+    """
+    algorithm = os.getenv('PASSWORD_HASH_ALGORITHM', PBKDF2_SHA256)
+    if algorithm == SCRYPT:
+        params = {
+            name: get_int_env(
+                f'PASSWORD_SCRYPT_{name.upper()}', DEFAULT_PARAMS[SCRYPT][name]
+            )
+            for name in ALGORITHM_PARAMS[SCRYPT]
+        }
+    else:
+        params = {
+            'i': get_int_env(
+                'PASSWORD_HASH_ITERATIONS', DEFAULT_PARAMS[PBKDF2_SHA256]['i']
+            )
+        }
+    return PasswordHasher(algorithm=algorithm, params=params)
+
+
+password_hasher = create_password_hasher()
+
+
+def hash_password(password: str) -> str:
+    """Return hash of password with current parameters.
+
+    Module-level function is used by hashing pool: it is picklable.
+
+    Args:
+        password: str
+
+    Returns: str
+
+    """
+    return password_hasher.hash(password=password)
+
+
+def verify_password(password: str, hashed_password: str) -> PasswordCheck:
+    """Check password with current hasher.
+
+    Args:
+        password: input password
+        hashed_password: saved hash
+
+    Returns: PasswordCheck
+
+    """
+    return password_hasher.verify(
+        password=password, hashed_password=hashed_password
+    )
+
+
+def measure(algorithm: str, params: Dict[str, int]) -> float:
+    """Return seconds of one password hashing.
+
+    Best of three runs is returned, so single slow run doesn't distort
+    calibration.
+
+    Args:
+        algorithm: pbkdf2-sha256 or scrypt
+        params: algorithm cost parameters
+
+    Returns: float
+
+    """
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        compute_digest(
+            algorithm=algorithm,
+            params=params,
+            password=CALIBRATION_PASSWORD.encode(),
+            salt=os.urandom(SALT_SIZE)
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def calibrate(algorithm: str, target_time: float) -> Dict[str, int]:
+    """Return cost parameters with verification time close to target.
+
+    PBKDF2 time is linear in iterations, so iterations are scaled from one
+    measurement. scrypt n must be power of two: the largest n with time
+    not longer than target is chosen.
+
+    Args:
+        algorithm: pbkdf2-sha256 or scrypt
+        target_time: target verification time in seconds
+
+    Returns: dict with cost parameters
+
+    """
+    if algorithm == PBKDF2_SHA256:
+        iterations = 10000
+        elapsed = measure(algorithm=algorithm, params={'i': iterations})
+        iterations = int(iterations * target_time / elapsed)
+        return {'i': max(1000, iterations // 1000 * 1000)}
+
+    if algorithm == SCRYPT:
+        params = dict(DEFAULT_PARAMS[SCRYPT], n=2 ** 10)
+        while params['n'] < MAX_SCRYPT_N:
+            next_params = dict(params, n=params['n'] * 2)
+            if measure(algorithm=algorithm, params=next_params) > target_time:
+                return params
+            params = next_params
+        return params
+
+    raise ValueError(f'Unknown password hash algorithm: {algorithm}')
+
+
+def main():
+    """Print environment settings for target verification time.
+
+    Returns: None
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Calibrate password hashing cost.'
+    )
+    parser.add_argument(
+        '--algorithm',
+        choices=tuple(ALGORITHM_PARAMS),
+        default=PBKDF2_SHA256
+    )
+    parser.add_argument('--target-ms', type=int, default=DEFAULT_TARGET_MS)
+    arguments = parser.parse_args()
+
+    params = calibrate(
+        algorithm=arguments.algorithm,
+        target_time=arguments.target_ms / 1000
+    )
+    elapsed = measure(algorithm=arguments.algorithm, params=params)
+    print(f'PASSWORD_HASH_ALGORITHM={arguments.algorithm}')
+    if arguments.algorithm == SCRYPT:
+        for name, value in params.items():
+            print(f'PASSWORD_SCRYPT_{name.upper()}={value}')
+    else:
+        print(f'PASSWORD_HASH_ITERATIONS={params["i"]}')
+    print(f'# verification time: {elapsed * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
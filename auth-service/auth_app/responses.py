@@ -0,0 +1,206 @@
+"""Module with fast JSON rendering of response models.
+
+Routes return pydantic models through render_response, which writes
+aliased JSON directly by per-model serializers instead of FastAPI
+response_model validation and jsonable_encoder. Output is the same bytes
+as default FastAPI response. orjson is used if it is installed and
+FAST_JSON_RESPONSE is not disabled.
+
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from auth_app import models
+from auth_app.models import format_date, format_datetime
+from auth_app.settings import get_bool_env
+from auth_app.timing import SERIALIZE_PHASE, measure
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = [
+    'FastJSONResponse',
+    'dump_json',
+    'render_response',
+]
+
+
+def serialize_token(token: models.Token) -> Dict:
+    """Return Token model as response dict.
+
+    Args:
+        token: pydantic Token model
+
+    Returns: dict
+
+    """
+    return {
+        'access_token': token.value,
+        'expires': format_datetime(token.expires),
+        'token_type': token.token_type,
+    }
+
+
+def serialize_token_with_refresh(token: models.TokenWithRefresh) -> Dict:
+    """Return TokenWithRefresh model as response dict.
+
+    Args:
+        token: pydantic TokenWithRefresh model
+
+    Returns: dict
+
+    """
+    content = serialize_token(token=token)
+    content['refresh_token'] = token.refresh_token
+    return content
+
+
+def serialize_salary_info(salary_info: models.SalaryInfo) -> Dict:
+    """Return SalaryInfo model as response dict.
+
+    Args:
+        salary_info: pydantic SalaryInfo model
+
+    Returns: dict
+
+    """
+    return {
+        'UserID': salary_info.user_id,
+        'Name': salary_info.name,
+        'Salary': salary_info.value,
+        'TargetDate': format_date(salary_info.target_date),
+    }
+
+
+def serialize_salary_raise_page(page: models.SalaryRaisePage) -> Dict:
+    """Return SalaryRaisePage model as response dict.
+
+    Args:
+        page: pydantic SalaryRaisePage model
+
+    Returns: dict
+
+    """
+    return {
+        'Items': [serialize_salary_info(item) for item in page.items],
+        'NextCursor': page.next_cursor,
+    }
+
+
+def serialize_response(response: models.Response) -> Dict:
+    """Return Response model as response dict.
+
+    Args:
+        response: pydantic Response model
+
+    Returns: dict
+
+    """
+    return {
+        'Status': response.status,
+        'Message': response.message,
+        'Data': response.data,
+    }
+
+
+SERIALIZERS: Dict[type, Callable[[Any], Dict]] = {
+    models.Token: serialize_token,
+    models.TokenWithRefresh: serialize_token_with_refresh,
+    models.SalaryInfo: serialize_salary_info,
+    models.SalaryRaisePage: serialize_salary_raise_page,
+    models.Response: serialize_response,
+}
+
+
+def encode_value(value: object) -> object:
+    """Return JSON-compatible value for type unknown to JSON encoder.
+
+    Args:
+        value: model, date or datetime
+
+    Returns: serializable value
+
+    """
+    serializer = SERIALIZERS.get(type(value))
+    if serializer is not None:
+        return serializer(value)
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, date):
+        return format_date(value)
+    if isinstance(value, BaseModel):
+        return jsonable_encoder(value, by_alias=True)
+    raise TypeError(f'Type is not JSON serializable: {type(value)}')
+
+
+def dump_json(content: object, use_orjson: bool = True) -> bytes:
+    """Return content as compact UTF-8 JSON.
+
+    Args:
+        content: response model or JSON-compatible value
+        use_orjson: use orjson if it is installed
+
+    Returns: bytes
+
+    """
+    if use_orjson and orjson is not None:
+        return orjson.dumps(
+            content,
+            default=encode_value,
+            option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(
+        content,
+        default=encode_value,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(',', ':')
+    ).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response which renders models by own serializers."""
+
+    def render(self, content: object) -> bytes:
+        """Return response body.
+
+        Args:
+            content: response model or JSON-compatible value
+
+        Returns: bytes
+
+        """
+        return dump_json(content=content)
+
+
+FAST_JSON_RESPONSE = get_bool_env('FAST_JSON_RESPONSE', True)
+
+
+def render_response(content: BaseModel, status_code: int = 200) -> Response:
+    """Return response with model content.
+
+    Args:
+        content: pydantic model
+        status_code: HTTP status code
+
+    Returns: FastJSONResponse or default JSONResponse if fast rendering is
+        disabled
+
+    """
+    with measure(phase=SERIALIZE_PHASE):
+        if FAST_JSON_RESPONSE:
+            return FastJSONResponse(content=content, status_code=status_code)
+        return JSONResponse(
+            content=jsonable_encoder(content, by_alias=True),
+            status_code=status_code
+        )
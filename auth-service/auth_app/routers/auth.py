@@ -1,57 +1,215 @@
 """Module with auth routes."""
 
-from fastapi import APIRouter, Depends
+from typing import Union
+
+from fastapi import APIRouter, Depends, Form, Response
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
+from auth_app.dbase.dal.refresh_token import RefreshTokenDAL
 from auth_app.dbase.dal.token_ import TokenDAL
-from auth_app.dbase.dal.user import UserDAL
-from auth_app.dependencies import get_session
+from auth_app.dbase.dal.user import UserDAL, verify_password_async
+from auth_app.dependencies import (get_client_address, get_session,
+                                   oauth2_scheme, throttle_login)
+from auth_app.responses import render_response
+from auth_app.signed_token import is_signed_token, token_signer
+from auth_app.throttling import login_throttle
 
 __all__ = [
     'router',
 ]
 
 
+OFFLINE_ACCESS_SCOPE = 'offline_access'
+
 router = APIRouter(
     prefix='/auth',
     tags=['auth']
 )
 
 
-@router.post('/', response_model=models.Token, include_in_schema=False)
+async def issue_token(session: AsyncSession,
+                      user: models.ActiveUser) -> Union[models.Token, None]:
+    """Return new access token of user.
+
+    Args:
+        session: AsyncSession
+        user: pydantic ActiveUser model
+
+    Returns: signed or database token, None if token is not created
+
+    """
+    if token_signer.is_enabled:
+        return token_signer.issue(user=user)
+    token_dal = TokenDAL(session=session)
+    return await token_dal.issue(user_id=user.id_)
+
+
+def add_refresh_token(token: models.Token,
+                      refresh_token: str) -> models.TokenWithRefresh:
+    """Return access token with refresh token.
+
+    Args:
+        token: pydantic Token model
+        refresh_token: refresh token value
+
+    Returns: pydantic TokenWithRefresh model
+
+    """
+    return models.TokenWithRefresh.construct(
+        value=token.value,
+        expires=token.expires,
+        token_type=token.token_type,
+        refresh_token=refresh_token
+    )
+
+
+@router.post('/',
+             response_model=Union[models.TokenWithRefresh, models.Token],
+             include_in_schema=False,
+             dependencies=[Depends(throttle_login)])
 async def auth(auth_form: OAuth2PasswordRequestForm = Depends(),
-               session: AsyncSession = Depends(get_session)) -> models.Token:
+               client: Union[str, None] = Depends(get_client_address),
+               session: AsyncSession = Depends(get_session)) -> Response:
     """Return token after auth.
 
+    Refresh token is returned too if offline_access scope is requested.
+    Successful login doesn't use login attempt.
+
     Args:
         auth_form: OAuth2PasswordRequestForm
+        client: client address
         session: AsyncSession
 
-    Returns: pydantic Token model
+    Returns: response with pydantic Token model
 
     """
     user_dal = UserDAL(session=session)
-    if not await user_dal.is_exist(login=auth_form.username):
+    credentials = await user_dal.get_credentials(login=auth_form.username)
+    if not credentials:
         raise HTTPException(
             status_code=400,
             detail='Login not found'
         )
-    if not await user_dal.is_valid_login_password_pair(
-        user=models.UserAuth(
-            login=auth_form.username,
-            password=auth_form.password
-        )
-    ):
+    await user_dal.release_connection()
+    check = await verify_password_async(
+        password=auth_form.password,
+        hashed_password=credentials.hashed_password
+    )
+    if not check.is_valid:
         raise HTTPException(
             status_code=400,
             detail='Incorrect login or password'
         )
-    token_dal = TokenDAL(session=session)
+    login_throttle.refund(login=auth_form.username, client=client)
+    if check.new_hash:
+        await user_dal.update_hashed_password(
+            id_=credentials.id_,
+            hashed_password=credentials.hashed_password,
+            new_hashed_password=check.new_hash
+        )
+
+    token = await issue_token(
+        session=session,
+        user=models.ActiveUser.construct(
+            id_=credentials.id_, name=credentials.name
+        )
+    )
+    if not token:
+        raise HTTPException(
+            status_code=500,
+            detail='Token is not created'
+        )
+    if OFFLINE_ACCESS_SCOPE not in auth_form.scopes:
+        return render_response(content=token)
+
+    refresh_token_dal = RefreshTokenDAL(session=session)
+    refresh_token = await refresh_token_dal.issue(user_id=credentials.id_)
+    if not refresh_token:
+        raise HTTPException(
+            status_code=500,
+            detail='Token is not created'
+        )
+    return render_response(
+        content=add_refresh_token(token=token, refresh_token=refresh_token)
+    )
+
+
+@router.post('/refresh', response_model=models.TokenWithRefresh)
+async def refresh(refresh_token: str = Form(),
+                  session: AsyncSession = Depends(get_session)) -> Response:
+    """Return new token and refresh token for valid refresh token.
+
+    Password is not checked, so expensive password hashing is done only
+    once per session. Refresh token can be used only once: it is replaced
+    by new one.
+
+    Args:
+        refresh_token: current refresh token
+        session: AsyncSession
 
-    user_id = await user_dal.get_id_by_login(login=auth_form.username)
-    await token_dal.add(user_id=user_id)
+    Returns: response with pydantic TokenWithRefresh model
 
-    return await token_dal.get_by_user_id(id_=user_id)
+    """
+    refresh_token_dal = RefreshTokenDAL(session=session)
+    rotated = await refresh_token_dal.rotate(token_value=refresh_token)
+    if not rotated:
+        raise HTTPException(
+            status_code=401,
+            detail='Invalid refresh token'
+        )
+
+    token = await issue_token(
+        session=session,
+        user=models.ActiveUser.construct(
+            id_=rotated.user_id, name=rotated.name
+        )
+    )
+    if not token:
+        raise HTTPException(
+            status_code=500,
+            detail='Token is not created'
+        )
+    return render_response(
+        content=add_refresh_token(
+            token=token, refresh_token=rotated.refresh_token
+        )
+    )
+
+
+@router.post('/logout', response_model=models.Response)
+async def logout(token_value: str = Depends(oauth2_scheme),
+                 refresh_token: Union[str, None] = Form(None),
+                 session: AsyncSession = Depends(get_session)) -> Response:
+    """Revoke current token and refresh token of the same session.
+
+    Signed token is added to revocation list, database token is removed.
+    Refresh token is removed after access token is revoked, unknown or
+    already used refresh token is ignored.
+
+    Args:
+        token_value: current token
+        refresh_token: refresh token issued with current token
+        session: AsyncSession
+
+    Returns: response with Response pydantic model
+
+    """
+    if token_signer.is_enabled and is_signed_token(token_value=token_value):
+        is_revoked = token_signer.revoke(token_value=token_value)
+    else:
+        token_dal = TokenDAL(session=session)
+        is_revoked = await token_dal.delete(token_value=token_value)
+    if not is_revoked:
+        raise HTTPException(
+            status_code=401,
+            detail='Invalid authentication credentials'
+        )
+    if refresh_token:
+        refresh_token_dal = RefreshTokenDAL(session=session)
+        await refresh_token_dal.delete(token_value=refresh_token)
+    return render_response(
+        content=models.Response(message='Token is revoked.')
+    )
@@ -1,13 +1,24 @@
 """Module with salary routes."""
 
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import AsyncIterator, Union
+
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
-from auth_app.dbase.dal.salary import SalaryDAL
-from auth_app.dbase.dal.user import UserDAL
-from auth_app.dependencies import get_active_user, get_session
+from auth_app.dbase.connection import CustomConnection
+from auth_app.dbase.dal.salary import EXPORT_BATCH_SIZE, SalaryDAL
+from auth_app.dbase.identity import IdentityMap
+from auth_app.dependencies import (get_active_user, get_identity_map,
+                                   get_session, verify_admin_key)
+from auth_app.export import (format_csv_header, format_csv_rows,
+                             format_ndjson_rows)
+from auth_app.pagination import decode_cursor, encode_cursor
+from auth_app.responses import render_response
+from auth_app.settings import get_int_env
 
 __all__ = [
     'router',
@@ -18,33 +29,138 @@ router = APIRouter(
     tags=['salary']
 )
 
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+MAX_RAISES_PAGE_SIZE = 1000
+
 
 @router.get('/', response_model=models.SalaryInfo)
 async def get_salary(
         user: models.ActiveUser = Depends(get_active_user),
-        session: AsyncSession = Depends(get_session)) -> models.SalaryInfo:
+        session: AsyncSession = Depends(get_session),
+        identity_map: IdentityMap = Depends(get_identity_map)) -> Response:
     """Return salary info for current user.
 
     Args:
         user: pydantic ActiveUser model
         session: AsyncSession
+        identity_map: entities loaded by current request
 
-    Returns: pydantic Salary model
+    Returns: response with pydantic SalaryInfo model
 
     """
-    user_dal = UserDAL(session=session)
-    user_name = await user_dal.get_by_id(id_=user.id_)
-    if not user_name:
-        raise HTTPException(
-            status_code=400,
-            detail='User not found'
-        )
-
-    salary_dal = SalaryDAL(session=session)
+    salary_dal = SalaryDAL(session=session, identity_map=identity_map)
     salary_info = await salary_dal.get_by_user_id(id_=user.id_)
+    await salary_dal.release_connection()
     if not salary_info:
         raise HTTPException(
             status_code=400,
             detail='Salary info not found'
         )
-    return salary_info
+    return render_response(content=salary_info)
+
+
+async def generate_export(connection: CustomConnection, format_: str,
+                          batch_size: int) -> AsyncIterator[str]:
+    """Return salary export chunks.
+
+    Session is opened by generator itself, because it lives until the
+    last chunk is sent.
+
+    Args:
+        connection: database connection
+        format_: ndjson or csv
+        batch_size: count of rows in one chunk
+
+    Returns: async iterator of response chunks
+
+    """
+    if format_ == 'csv':
+        yield format_csv_header()
+    format_rows = format_csv_rows if format_ == 'csv' else format_ndjson_rows
+    async with connection.async_session as session:
+        salary_dal = SalaryDAL(session=session)
+        async for rows in salary_dal.iter_all(batch_size=batch_size):
+            yield format_rows(rows)
+
+
+@router.get('/export', dependencies=[Depends(verify_admin_key)])
+async def export_salary(
+        request: Request,
+        format_: str = Query(
+            alias='format', default='ndjson', regex='^(ndjson|csv)$'
+        )) -> StreamingResponse:
+    """Return salary info of all users as stream.
+
+    Args:
+        request: current request
+        format_: ndjson or csv
+
+    Returns: StreamingResponse
+
+    """
+    return StreamingResponse(
+        content=generate_export(
+            connection=request.app.state.connection,
+            format_=format_,
+            batch_size=get_int_env('EXPORT_BATCH_SIZE', EXPORT_BATCH_SIZE)
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format_],
+        headers={
+            'Content-Disposition':
+                f'attachment; filename="salary.{format_}"'
+        }
+    )
+
+
+@router.get(
+    '/raises',
+    response_model=models.SalaryRaisePage,
+    dependencies=[Depends(verify_admin_key)]
+)
+async def get_raises(
+        date_from: date = Query(alias='from'),
+        date_to: date = Query(alias='to'),
+        limit: int = Query(default=100, ge=1, le=MAX_RAISES_PAGE_SIZE),
+        cursor: Union[str, None] = None,
+        session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Return page of salary raises between two dates.
+
+    Args:
+        date_from: first target date
+        date_to: last target date
+        limit: page size
+        cursor: NextCursor value of previous page
+        session: AsyncSession
+
+    Returns: response with pydantic SalaryRaisePage model
+
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor=cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Invalid cursor')
+
+    salary_dal = SalaryDAL(session=session)
+    items = await salary_dal.get_raises(
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit + 1,
+        after=after
+    )
+    await salary_dal.release_connection()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(
+            target_date=items[-1].target_date,
+            user_id=items[-1].user_id
+        )
+    return render_response(
+        content=models.SalaryRaisePage(items=items, next_cursor=next_cursor)
+    )
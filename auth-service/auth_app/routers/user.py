@@ -1,13 +1,22 @@
 """Module with user routes."""
 
-from fastapi import APIRouter, Depends
+import csv
+from typing import List
+
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
-from auth_app.dbase.dal.salary import SalaryDAL
-from auth_app.dbase.dal.user import UserDAL
-from auth_app.dependencies import get_session
+from auth_app.bulk import (CSV_COLUMNS, DEFAULT_MAX_ERRORS, BulkErrorList,
+                           BulkRecord, BulkRowError, decode_line,
+                           get_error_detail, iter_lines, parse_csv_line,
+                           parse_ndjson_line)
+from auth_app.dbase.dal.user import (SignUpStatus, UserDAL,
+                                     create_hashed_passwords)
+from auth_app.dependencies import get_session, verify_admin_key
+from auth_app.responses import render_response
+from auth_app.settings import get_int_env
 
 __all__ = [
     'router',
@@ -18,12 +27,15 @@ router = APIRouter(
     tags=['user']
 )
 
+BULK_CHUNK_SIZE = get_int_env('BULK_CHUNK_SIZE', 500)
+BULK_MAX_ERRORS = get_int_env('BULK_MAX_ERRORS', DEFAULT_MAX_ERRORS)
+
 
 @router.post('/add', response_model=models.Response)
 async def sign_up(
         user: models.User, salary: models.UserSalary,
         session: AsyncSession = Depends(get_session)
-) -> models.Response:
+) -> Response:
     """Create new user.
 
     Args:
@@ -31,25 +43,168 @@ async def sign_up(
         salary: pydantic UserSalary model
         session: AsyncSession
 
-    Returns: Response pydantic model
+    Returns: response with Response pydantic model
 
     """
     user_dal = UserDAL(session=session)
-    if await user_dal.is_exist(login=user.login):
+    result = await user_dal.add_with_salary(user=user, salary=salary)
+    if result.status == SignUpStatus.LOGIN_EXISTS:
         raise HTTPException(
             status_code=401,
             detail=f'User with login {user.login} is exist'
         )
-    await user_dal.add(user=user)
-    user_id = await user_dal.get_id_by_login(login=user.login)
-
-    salary_dal = SalaryDAL(session=session)
-    await salary_dal.add(
-        salary_info=models.SalaryInfo(
-            user_id=user_id,
-            name=user.name,
-            value=salary.value,
-            target_date=salary.target_date
+    if result.status == SignUpStatus.FAILED:
+        raise HTTPException(
+            status_code=400,
+            detail='User and salary info is not added'
+        )
+    return render_response(
+        content=models.Response(message='User and salary info is was added.')
+    )
+
+
+async def add_bulk_chunk(user_dal: UserDAL, chunk: List[BulkRecord],
+                         errors: BulkErrorList) -> int:
+    """Add chunk of bulk records to database.
+
+    Args:
+        user_dal: UserDAL
+        chunk: parsed records
+        errors: not added records
+
+    Returns: count of added users
+
+    """
+    records = {}
+    for record in chunk:
+        key = record.user.login.lower()
+        if key in records:
+            errors.append(
+                BulkRowError(
+                    row=record.row,
+                    login=record.user.login,
+                    status='duplicate',
+                    detail='Login is repeated in upload'
+                )
+            )
+            continue
+        records[key] = record
+
+    hashed_passwords = await create_hashed_passwords(
+        passwords=[record.user.password for record in records.values()]
+    )
+    added_logins = await user_dal.add_many_with_salary(
+        records=[
+            (
+                record.user.name,
+                record.user.login,
+                hashed_password,
+                record.salary.value,
+                record.salary.target_date
+            )
+            for record, hashed_password in zip(
+                records.values(), hashed_passwords
+            )
+        ]
+    )
+
+    for record in records.values():
+        if record.user.login not in added_logins:
+            errors.append(
+                BulkRowError(
+                    row=record.row,
+                    login=record.user.login,
+                    status='duplicate',
+                    detail=f'User with login {record.user.login} is exist'
+                )
+            )
+    return len(added_logins)
+
+
+@router.post(
+    '/bulk',
+    response_model=models.Response,
+    dependencies=[Depends(verify_admin_key)]
+)
+async def bulk_sign_up(
+        request: Request,
+        session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Create users from NDJSON or CSV upload.
+
+    Request body is read as stream and processed by chunks: passwords of
+    chunk are hashed in parallel, users and salary info are added by COPY.
+    Response lists first BULK_MAX_ERRORS not added rows, the rest are only
+    counted.
+
+    Args:
+        request: request with NDJSON or CSV (text/csv) body
+        session: AsyncSession
+
+    Returns: response with Response pydantic model with list of not added
+        rows
+
+    """
+    is_csv = request.headers.get('content-type', '').startswith('text/csv')
+    header = None
+    row = 0
+    added_count = 0
+    chunk = []
+    errors = BulkErrorList(max_size=BULK_MAX_ERRORS)
+    user_dal = UserDAL(session=session)
+
+    async for line in iter_lines(request.stream()):
+        if is_csv and header is None:
+            try:
+                header = next(csv.reader([decode_line(line=line)]))
+            except ValueError:
+                header = []
+            if set(header) != set(CSV_COLUMNS):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f'CSV header must be {",".join(CSV_COLUMNS)}'
+                )
+            continue
+
+        row += 1
+        try:
+            text = decode_line(line=line)
+            if is_csv:
+                record = parse_csv_line(row=row, line=text, header=header)
+            else:
+                record = parse_ndjson_line(row=row, line=text)
+        except ValueError as error:
+            errors.append(
+                BulkRowError(
+                    row=row,
+                    login=None,
+                    status='invalid',
+                    detail=get_error_detail(error=error)
+                )
+            )
+            continue
+
+        chunk.append(record)
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            added_count += await add_bulk_chunk(
+                user_dal=user_dal, chunk=chunk, errors=errors
+            )
+            chunk = []
+
+    if chunk:
+        added_count += await add_bulk_chunk(
+            user_dal=user_dal, chunk=chunk, errors=errors
+        )
+
+    message = f'{added_count} of {row} users are added.'
+    if errors.is_truncated:
+        message += (
+            f' {errors.count} rows are not added, first {BULK_MAX_ERRORS}'
+            ' of them are listed.'
+        )
+    return render_response(
+        content=models.Response(
+            message=message,
+            data=[error.to_dict() for error in errors.to_list()]
         )
     )
-    return models.Response(message='User and salary info is was added.')
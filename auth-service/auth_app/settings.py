@@ -0,0 +1,57 @@
+"""Module with environment settings helpers."""
+
+import os
+
+__all__ = [
+    'get_bool_env',
+    'get_float_env',
+    'get_int_env',
+]
+
+
+def get_int_env(name: str, default: int) -> int:
+    """Return integer value of environment variable.
+
+    Args:
+        name: variable name
+        default: value for not defined variable
+
+    Returns: int
+
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return int(value)
+
+
+def get_float_env(name: str, default: float) -> float:
+    """Return float value of environment variable.
+
+    Args:
+        name: variable name
+        default: value for not defined variable
+
+    Returns: float
+
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return float(value)
+
+
+def get_bool_env(name: str, default: bool) -> bool:
+    """Return boolean value of environment variable.
+
+    Args:
+        name: variable name
+        default: value for not defined variable
+
+    Returns: bool
+
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
@@ -0,0 +1,339 @@
+"""Module with stateless HMAC-signed access tokens.
+
+Signed token carries user id, name and expiration time, so it is verified
+by CPU only, without database query. Token is
+base64url(JSON payload) + '.' + base64url(HMAC-SHA256 of payload).
+
+Mode is chosen by TOKEN_MODE variable: database (default) - tokens are
+rows of tokens table, signed - tokens are signed by TOKEN_SECRET. Database
+tokens are still accepted in signed mode.
+
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Union
+
+from auth_app import models
+from auth_app.dbase.dal.token_ import EXPIRES_SIZE, TokenOwner, TokenStatus
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'RevocationList',
+    'RevocationListFullError',
+    'TokenSigner',
+    'is_signed_token',
+    'token_signer',
+]
+
+DATABASE_TOKEN_MODE = 'database'
+SIGNED_TOKEN_MODE = 'signed'
+TOKEN_PARTS_DELIMITER = '.'
+DEFAULT_REVOCATION_LIST_SIZE = 100000
+
+logger = logging.getLogger(__name__)
+
+
+def encode_base64(value: bytes) -> str:
+    """Return base64url string without padding.
+
+    Args:
+        value: bytes
+
+    Returns: str
+
+    """
+    return base64.urlsafe_b64encode(value).decode('ascii').rstrip('=')
+
+
+def decode_base64(value: str) -> bytes:
+    """Return bytes from base64url string without padding.
+
+    Args:
+        value: str
+
+    Returns: bytes
+
+    """
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+def is_signed_token(token_value: str) -> bool:
+    """Return True if value has signed token format.
+
+    Args:
+        token_value: str
+
+    Returns: bool
+
+    """
+    return TOKEN_PARTS_DELIMITER in token_value
+
+
+class RevocationListFullError(Exception):
+    """Revocation list has no room for new token."""
+
+
+class RevocationList:
+    """In-memory list of revoked signed tokens.
+
+    Token is kept until its expiration, after that signature check rejects
+    it anyway. List is local for worker process. Revoked token is never
+    evicted before expiration: if list is full of live tokens, new token
+    is rejected with RevocationListFullError.
+
+    """
+
+    def __init__(self, max_size: int = DEFAULT_REVOCATION_LIST_SIZE):
+        """Initialize class method.
+
+        Args:
+            max_size: max count of revoked tokens
+        """
+        self.__max_size = max_size
+        self.__items: Dict[str, float] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        """Return count of revoked tokens.
+
+        Returns: int
+
+        """
+        return len(self.__items)
+
+    def purge(self):
+        """Remove expired tokens.
+
+        Returns: None
+
+        """
+        now = datetime.now().timestamp()
+        expired = [key for key, exp in self.__items.items() if exp <= now]
+        for key in expired:
+            del self.__items[key]
+
+    def add(self, token_id: str, exp: float):
+        """Add token to list.
+
+        Args:
+            token_id: token jti
+            exp: token expiration timestamp
+
+        Returns: None
+
+        """
+        if len(self.__items) >= self.__max_size:
+            self.purge()
+        if len(self.__items) >= self.__max_size:
+            logger.warning(
+                'Revocation list is full: %d live tokens', len(self.__items)
+            )
+            raise RevocationListFullError
+        self.__items[token_id] = exp
+
+    def contains(self, token_id: str) -> bool:
+        """Return True if token is revoked.
+
+        Args:
+            token_id: token jti
+
+        Returns: bool
+
+        """
+        return token_id in self.__items
+
+
+class TokenSigner:
+    """Issuer and verifier of signed tokens."""
+
+    def __init__(self, secret: Union[str, None],
+                 revocation_list: Union[RevocationList, None] = None):
+        """Initialize class method.
+
+        Args:
+            secret: signing key, None - signed tokens are disabled
+            revocation_list: list of revoked tokens
+        """
+        self.__secret = secret.encode() if secret else None
+        self.__revocation_list = revocation_list or RevocationList()
+        self.__issued = 0
+        self.__verified = 0
+        self.__rejected = 0
+        self.__revoked = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        """Return True if signed tokens are issued.
+
+        Returns: bool
+
+        """
+        return self.__secret is not None
+
+    @property
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """Return token counters.
+
+        Returns: dict
+
+        """
+        return {
+            'mode': (
+                SIGNED_TOKEN_MODE if self.is_enabled else DATABASE_TOKEN_MODE
+            ),
+            'issued': self.__issued,
+            'verified': self.__verified,
+            'rejected': self.__rejected,
+            'revoked': self.__revoked,
+            'revocation_list_size': self.__revocation_list.size,
+        }
+
+    def sign(self, payload: bytes) -> bytes:
+        """Return HMAC-SHA256 of encoded payload.
+
+        Args:
+            payload: base64url payload
+
+        Returns: bytes
+
+        """
+        return hmac.new(self.__secret, payload, hashlib.sha256).digest()
+
+    def issue(self, user: models.ActiveUser) -> models.Token:
+        """Return new signed token for user.
+
+        Args:
+            user: pydantic ActiveUser model
+
+        Returns: pydantic Token model
+
+        """
+        expires = (datetime.now() + EXPIRES_SIZE).replace(microsecond=0)
+        payload = encode_base64(json.dumps(
+            {
+                'sub': user.id_,
+                'name': user.name,
+                'exp': int(expires.timestamp()),
+                'jti': secrets.token_hex(8),
+            },
+            ensure_ascii=False,
+            separators=(',', ':')
+        ).encode())
+        signature = encode_base64(self.sign(payload=payload.encode()))
+        self.__issued += 1
+        return models.Token.construct(
+            value=f'{payload}{TOKEN_PARTS_DELIMITER}{signature}',
+            expires=expires
+        )
+
+    def decode(self, token_value: str) -> Union[Dict, None]:
+        """Return payload of token with valid signature.
+
+        Args:
+            token_value: str
+
+        Returns: dict or None for invalid token
+
+        """
+        if not self.is_enabled:
+            return
+        payload, _, signature = token_value.partition(TOKEN_PARTS_DELIMITER)
+        try:
+            is_valid = hmac.compare_digest(
+                self.sign(payload=payload.encode('ascii')),
+                decode_base64(signature)
+            )
+            if not is_valid:
+                return
+            data = json.loads(decode_base64(payload))
+            return {
+                'sub': int(data['sub']),
+                'name': str(data['name']),
+                'exp': int(data['exp']),
+                'jti': str(data['jti']),
+            }
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            return
+
+    def verify(self, token_value: str) -> TokenOwner:
+        """Return token owner from signed token.
+
+        Args:
+            token_value: str
+
+        Returns: TokenOwner
+
+        """
+        data = self.decode(token_value=token_value)
+        if data is None or self.__revocation_list.contains(data['jti']):
+            self.__rejected += 1
+            return TokenOwner(status=TokenStatus.NOT_FOUND)
+
+        expires = datetime.fromtimestamp(data['exp'])
+        if datetime.now() >= expires:
+            self.__rejected += 1
+            return TokenOwner(status=TokenStatus.EXPIRED, expires=expires)
+
+        self.__verified += 1
+        return TokenOwner(
+            status=TokenStatus.VALID,
+            user=models.ActiveUser.construct(
+                id_=data['sub'], name=data['name']
+            ),
+            expires=expires
+        )
+
+    def revoke(self, token_value: str) -> bool:
+        """Add valid token to revocation list.
+
+        RevocationListFullError is raised if list is full of live tokens.
+
+        Args:
+            token_value: str
+
+        Returns: True - if token is revoked, False - for invalid token
+
+        """
+        data = self.decode(token_value=token_value)
+        if data is None:
+            return False
+        self.__revocation_list.add(token_id=data['jti'], exp=data['exp'])
+        self.__revoked += 1
+        return True
+
+
+def create_token_signer() -> TokenSigner:
+    """Return signer configured by environment variables.
+
+    Returns: TokenSigner
+
+    """
+    mode = os.getenv('TOKEN_MODE', DATABASE_TOKEN_MODE)
+    if mode not in (DATABASE_TOKEN_MODE, SIGNED_TOKEN_MODE):
+        raise ValueError(f'Invalid token mode: {mode}')
+
+    secret = None
+    if mode == SIGNED_TOKEN_MODE:
+        secret = os.getenv('TOKEN_SECRET')
+        if not secret:
+            raise ValueError('TOKEN_SECRET is required for signed tokens')
+    return TokenSigner(
+        secret=secret,
+        revocation_list=RevocationList(
+            max_size=get_int_env(
+                'REVOCATION_LIST_SIZE', DEFAULT_REVOCATION_LIST_SIZE
+            )
+        )
+    )
+
+
+token_signer = create_token_signer()
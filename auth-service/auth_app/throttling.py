@@ -0,0 +1,231 @@
+"""Module with in-process throttling of login attempts."""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Union
+
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'LoginThrottle',
+    'RateLimiter',
+    'create_login_throttle',
+    'login_throttle',
+]
+
+DEFAULT_LOGIN_RATE = 10
+DEFAULT_LOGIN_BURST = 5
+DEFAULT_CLIENT_RATE = 60
+DEFAULT_CLIENT_BURST = 30
+DEFAULT_THROTTLE_MAX_KEYS = 100000
+
+
+class RateLimiter:
+    """Token bucket limiter with bucket per key.
+
+    Bucket has burst tokens, every attempt takes one token and tokens are
+    refilled with rate per minute. Buckets are kept in LRU order, so count
+    of keys is bounded. Limiter is local for worker process.
+
+    """
+
+    def __init__(self, rate: int, burst: int,
+                 max_keys: int = DEFAULT_THROTTLE_MAX_KEYS,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize class method.
+
+        Args:
+            rate: attempts per minute, 0 - limiter is disabled
+            burst: max count of attempts in a row
+            max_keys: max count of tracked keys
+            clock: monotonic time source in seconds
+        """
+        self.__rate = rate / 60
+        self.__burst = max(1, burst)
+        self.__max_keys = max_keys
+        self.__clock = clock
+        self.__buckets = OrderedDict()
+
+    @property
+    def is_enabled(self) -> bool:
+        """Return True if limiter checks attempts.
+
+        Returns: bool
+
+        """
+        return self.__rate > 0
+
+    @property
+    def size(self) -> int:
+        """Return count of tracked keys.
+
+        Returns: int
+
+        """
+        return len(self.__buckets)
+
+    def acquire(self, key: str) -> float:
+        """Take one attempt of key.
+
+        Args:
+            key: login or client address
+
+        Returns: 0 if attempt is allowed, else - seconds until next attempt
+
+        """
+        if not self.is_enabled:
+            return 0
+
+        now = self.__clock()
+        tokens, updated = self.__buckets.pop(key, (self.__burst, now))
+        tokens = min(self.__burst, tokens + (now - updated) * self.__rate)
+        retry_after = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.__rate
+
+        self.__buckets[key] = (tokens, now)
+        if len(self.__buckets) > self.__max_keys:
+            self.__buckets.popitem(last=False)
+        return retry_after
+
+    def refund(self, key: str):
+        """Return one attempt of key.
+
+        Args:
+            key: login or client address
+
+        Returns: None
+
+        """
+        if key in self.__buckets:
+            tokens, updated = self.__buckets[key]
+            self.__buckets[key] = (min(self.__burst, tokens + 1), updated)
+
+    def clear(self):
+        """Remove all buckets.
+
+        Returns: None
+
+        """
+        self.__buckets.clear()
+
+
+class LoginThrottle:
+    """Limits of login attempts by login and by client address.
+
+    Attempt is checked before credentials are read and password is hashed,
+    so rejected attempt costs only dictionary lookups. Attempt of
+    successful login is refunded, so only failed attempts are limited.
+
+    """
+
+    def __init__(self, login_limiter: RateLimiter,
+                 client_limiter: RateLimiter):
+        """Initialize class method.
+
+        Args:
+            login_limiter: limiter of attempts per login
+            client_limiter: limiter of attempts per client address
+        """
+        self.__login_limiter = login_limiter
+        self.__client_limiter = client_limiter
+        self.__allowed = 0
+        self.__rejected_by_login = 0
+        self.__rejected_by_client = 0
+        self.__refunded = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return throttle counters.
+
+        Returns: dict
+
+        """
+        return {
+            'allowed': self.__allowed,
+            'rejected_by_login': self.__rejected_by_login,
+            'rejected_by_client': self.__rejected_by_client,
+            'refunded': self.__refunded,
+            'logins': self.__login_limiter.size,
+            'clients': self.__client_limiter.size,
+        }
+
+    def check(self, login: str, client: Union[str, None]) -> int:
+        """Take one login attempt.
+
+        Client limit is checked first: attempt rejected by client doesn't
+        take attempt of login, so one client can't lock out other users.
+
+        Args:
+            login: user login
+            client: client address
+
+        Returns: 0 if attempt is allowed, else - Retry-After seconds
+
+        """
+        retry_after = self.__client_limiter.acquire(key=client or '')
+        if retry_after:
+            self.__rejected_by_client += 1
+            return math.ceil(retry_after)
+
+        retry_after = self.__login_limiter.acquire(key=login.lower())
+        if retry_after:
+            self.__rejected_by_login += 1
+            return math.ceil(retry_after)
+
+        self.__allowed += 1
+        return 0
+
+    def refund(self, login: str, client: Union[str, None]):
+        """Return attempt of successful login.
+
+        Args:
+            login: user login
+            client: client address
+
+        Returns: None
+
+        """
+        self.__login_limiter.refund(key=login.lower())
+        self.__client_limiter.refund(key=client or '')
+        self.__refunded += 1
+
+    def reset(self):
+        """Remove all buckets.
+
+        Returns: None
+
+        """
+        self.__login_limiter.clear()
+        self.__client_limiter.clear()
+
+
+def create_login_throttle() -> LoginThrottle:
+    """Return throttle configured by environment variables.
+
+    LOGIN_RATE_PER_MINUTE and LOGIN_BURST limit attempts per login,
+    CLIENT_RATE_PER_MINUTE and CLIENT_BURST - per client address,
+    THROTTLE_MAX_KEYS - count of tracked keys of each limiter.
+
+    Returns: LoginThrottle
+
+    """
+    max_keys = get_int_env('THROTTLE_MAX_KEYS', DEFAULT_THROTTLE_MAX_KEYS)
+    return LoginThrottle(
+        login_limiter=RateLimiter(
+            rate=get_int_env('LOGIN_RATE_PER_MINUTE', DEFAULT_LOGIN_RATE),
+            burst=get_int_env('LOGIN_BURST', DEFAULT_LOGIN_BURST),
+            max_keys=max_keys
+        ),
+        client_limiter=RateLimiter(
+            rate=get_int_env('CLIENT_RATE_PER_MINUTE', DEFAULT_CLIENT_RATE),
+            burst=get_int_env('CLIENT_BURST', DEFAULT_CLIENT_BURST),
+            max_keys=max_keys
+        )
+    )
+
+
+login_throttle = create_login_throttle()
@@ -0,0 +1,282 @@
+"""Module with request timing breakdown.
+
+Sampled request gets RequestTiming object in context variable. Database
+cursor events, hashing pool and response rendering add their time to it,
+and middleware writes collected phases to log and, if it is enabled, to
+Server-Timing header.
+
+"""
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import DBAPICursor
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+__all__ = [
+    'DB_PHASE',
+    'DEFAULT_SAMPLE_RATE',
+    'HASH_PHASE',
+    'RequestTiming',
+    'SERIALIZE_PHASE',
+    'ServerTimingMiddleware',
+    'add_time',
+    'instrument_engine',
+    'measure',
+]
+
+logger = logging.getLogger(__name__)
+
+DB_PHASE = 'db'
+HASH_PHASE = 'hash'
+SERIALIZE_PHASE = 'serialize'
+TOTAL_PHASE = 'total'
+PHASES = (DB_PHASE, HASH_PHASE, SERIALIZE_PHASE)
+QUERY_START_KEY = 'timing_query_start'
+DEFAULT_SAMPLE_RATE = 0.1
+
+current_timing: ContextVar[Union['RequestTiming', None]] = ContextVar(
+    'current_timing', default=None
+)
+
+
+class RequestTiming:
+    """Time spent by one request in each phase."""
+
+    def __init__(self):
+        """Initialize class method."""
+        self.__start = time.perf_counter()
+        self.__total = 0.0
+        self.__durations = dict.fromkeys(PHASES, 0.0)
+        self.__counts = dict.fromkeys(PHASES, 0)
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """Return seconds of each phase, total - until response start.
+
+        Returns: dict
+
+        """
+        return dict(self.__durations, **{TOTAL_PHASE: self.__total})
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Return count of calls of each phase.
+
+        Returns: dict
+
+        """
+        return dict(self.__counts)
+
+    def add(self, phase: str, seconds: float):
+        """Add time of phase call.
+
+        Args:
+            phase: db, hash or serialize
+            seconds: call duration
+
+        Returns: None
+
+        """
+        self.__durations[phase] += seconds
+        self.__counts[phase] += 1
+
+    def stop(self):
+        """Fix total request time.
+
+        Returns: None
+
+        """
+        self.__total = time.perf_counter() - self.__start
+
+    def to_header(self) -> str:
+        """Return Server-Timing header value.
+
+        Returns: str
+
+        """
+        return ', '.join(
+            f'{phase};dur={seconds * 1000:.3f}'
+            for phase, seconds in self.durations.items()
+        )
+
+
+def add_time(phase: str, seconds: float):
+    """Add phase time to timing of current request if it is sampled.
+
+    Args:
+        phase: db, hash or serialize
+        seconds: call duration
+
+    Returns: None
+
+    """
+    timing = current_timing.get()
+    if timing is not None:
+        timing.add(phase=phase, seconds=seconds)
+
+
+@contextmanager
+def measure(phase: str) -> Iterator[None]:
+    """Measure code block as phase of current request.
+
+    Args:
+        phase: db, hash or serialize
+
+    Returns: context manager
+
+    """
+    if current_timing.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase=phase, seconds=time.perf_counter() - start)
+
+
+def before_cursor_execute(conn: Connection, cursor: DBAPICursor,
+                          statement: str, parameters: object,
+                          context: ExecutionContext, executemany: bool):
+    """Save query start time to connection info.
+
+    Args:
+        conn: SQLAlchemy Connection
+        cursor: DBAPI cursor
+        statement: SQL statement
+        parameters: statement parameters
+        context: execution context
+        executemany: True for executemany call
+
+    Returns: None
+
+    """
+    if current_timing.get() is not None:
+        conn.info[QUERY_START_KEY] = time.perf_counter()
+
+
+def after_cursor_execute(conn: Connection, cursor: DBAPICursor,
+                         statement: str, parameters: object,
+                         context: ExecutionContext, executemany: bool):
+    """Add query time to timing of current request.
+
+    Args:
+        conn: SQLAlchemy Connection
+        cursor: DBAPI cursor
+        statement: SQL statement
+        parameters: statement parameters
+        context: execution context
+        executemany: True for executemany call
+
+    Returns: None
+
+    """
+    start = conn.info.pop(QUERY_START_KEY, None)
+    if start is not None:
+        add_time(phase=DB_PHASE, seconds=time.perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Add query timing listeners to engine.
+
+    Async engine runs cursor events in greenlet with context of calling
+    task, so listeners see timing of current request.
+
+    Args:
+        engine: AsyncEngine
+
+    Returns: None
+
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, 'before_cursor_execute',
+                          before_cursor_execute):
+        event.listen(
+            sync_engine, 'before_cursor_execute', before_cursor_execute
+        )
+        event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware which reports time breakdown of sampled requests.
+
+    Not sampled request costs one random() call. Sampled request gets
+    log line with phase durations. Server-Timing header shows internal
+    timings to any client, so it is added only if send_header is set.
+
+    """
+
+    def __init__(self, app: ASGIApp,
+                 sample_rate: float = DEFAULT_SAMPLE_RATE,
+                 send_header: bool = False):
+        """Initialize class method.
+
+        Args:
+            app: ASGI application
+            sample_rate: share of measured requests from 0 to 1
+            send_header: True - add Server-Timing header to sampled
+                response
+        """
+        self.__app = app
+        self.__sample_rate = sample_rate
+        self.__send_header = send_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Run request with timing if it is sampled.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+
+        Returns: None
+
+        """
+        if scope['type'] != 'http' or random.random() >= self.__sample_rate:
+            await self.__app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        status_codes: List[int] = []
+
+        async def send_with_timing(message: Message):
+            if message['type'] == 'http.response.start':
+                timing.stop()
+                status_codes.append(message['status'])
+                if self.__send_header:
+                    message = dict(message, headers=[
+                        *message.get('headers', []),
+                        (
+                            b'server-timing',
+                            timing.to_header().encode('latin-1')
+                        )
+                    ])
+            await send(message)
+
+        token = current_timing.set(timing)
+        try:
+            await self.__app(scope, receive, send_with_timing)
+        finally:
+            current_timing.reset(token)
+            if logger.isEnabledFor(logging.INFO):
+                durations = timing.durations
+                logger.info(
+                    'Request timing: method=%s path=%s status=%s '
+                    'total_ms=%.3f db_ms=%.3f db_queries=%d hash_ms=%.3f '
+                    'serialize_ms=%.3f',
+                    scope.get('method'), scope.get('path'),
+                    status_codes[0] if status_codes else '-',
+                    durations[TOTAL_PHASE] * 1000,
+                    durations[DB_PHASE] * 1000,
+                    timing.counts[DB_PHASE],
+                    durations[HASH_PHASE] * 1000,
+                    durations[SERIALIZE_PHASE] * 1000
+                )
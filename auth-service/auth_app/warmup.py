@@ -0,0 +1,224 @@
+"""Module with startup warm-up of worker.
+
+First requests after start pay for connection handshakes, query
+compilation and prepared statements of every pool connection. Warm-up
+does this work before worker reports readiness.
+
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Dict, Union
+from uuid import uuid4
+
+from auth_app import models
+from auth_app.dbase.connection import CustomConnection
+from auth_app.dbase.dal.salary import SalaryDAL
+from auth_app.dbase.dal.token_ import TokenDAL
+from auth_app.dbase.dal.user import UserDAL
+from auth_app.dbase.identity import USER_ENTITY, IdentityMap
+from auth_app.hashing import hashing_pool
+from auth_app.passwords import hash_password
+from auth_app.responses import dump_json
+from auth_app.settings import get_int_env
+
+__all__ = [
+    'WarmUp',
+    'create_warmup',
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARMUP_CONNECTIONS = 10
+
+
+class WarmUp:
+    """Background task which warms up connection pool and hot code paths.
+
+    Every warmed connection runs hot DAL queries once, so SQLAlchemy
+    compiled cache and asyncpg prepared statements are filled.
+
+    """
+
+    def __init__(self, connection: CustomConnection,
+                 connections: int = DEFAULT_WARMUP_CONNECTIONS):
+        """Initialize class method.
+
+        Args:
+            connection: database connection
+            connections: count of pool connections to open, 0 - no warm-up
+                of database
+        """
+        self.__connection = connection
+        self.__connections = connections
+        self.__task: Union[asyncio.Task, None] = None
+        self.__is_ready = False
+        self.__warmed_connections = 0
+        self.__errors = 0
+        self.__duration = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True if warm-up is finished.
+
+        Returns: bool
+
+        """
+        return self.__is_ready
+
+    @property
+    def stats(self) -> Dict[str, Union[bool, int, float]]:
+        """Return warm-up counters.
+
+        Returns: dict
+
+        """
+        return {
+            'is_ready': self.__is_ready,
+            'connections': self.__warmed_connections,
+            'errors': self.__errors,
+            'duration_ms': round(self.__duration * 1000, 3),
+        }
+
+    async def warm_connection(self, release: asyncio.Event):
+        """Run hot queries in own session and keep its connection.
+
+        Queries run in one transaction, so session keeps its connection
+        until all sessions have run their queries, and pool opens required
+        count of connections instead of reusing one.
+
+        Args:
+            release: event which is set when connections can be returned
+
+        Returns: None
+
+        """
+        try:
+            async with self.__connection.async_session as session:
+                async with session.begin():
+                    await TokenDAL(session=session).get_owner(
+                        token_value=str(uuid4())
+                    )
+                    user_dal = UserDAL(session=session)
+                    await user_dal.get_credentials(login='')
+                    await user_dal.get_by_id(id_=-1)
+                    await SalaryDAL(session=session).get_by_user_id(id_=-1)
+                    identity_map = IdentityMap()
+                    identity_map.put(
+                        USER_ENTITY, -1,
+                        models.ActiveUser.construct(id_=-1, name='')
+                    )
+                    await SalaryDAL(
+                        session=session, identity_map=identity_map
+                    ).get_by_user_id(id_=-1)
+
+                    self.__warmed_connections += 1
+                    if self.__warmed_connections >= self.__connections:
+                        release.set()
+                    await release.wait()
+        finally:
+            release.set()
+
+    async def warm_database(self):
+        """Open pool connections and run hot queries in each of them.
+
+        Returns: None
+
+        """
+        self.__warmed_connections = 0
+        release = asyncio.Event()
+        results = await asyncio.gather(
+            *(
+                self.warm_connection(release=release)
+                for _ in range(self.__connections)
+            ),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    @staticmethod
+    async def warm_code():
+        """Run serializers and password hashing once.
+
+        Returns: None
+
+        """
+        dump_json(content=models.Token.construct(
+            value=str(uuid4()), expires=datetime.now()
+        ))
+        dump_json(content=models.SalaryInfo.construct(
+            user_id=0, name='', value=0, target_date=date.today()
+        ))
+        dump_json(content=models.Response())
+        await hashing_pool.run(hash_password, 'warm-up')
+
+    async def run(self):
+        """Warm up worker and mark it ready.
+
+        Worker is marked ready even if warm-up is failed: warm-up only
+        speeds up first requests.
+
+        Returns: None
+
+        """
+        start = time.perf_counter()
+        try:
+            await self.warm_code()
+            await self.warm_database()
+        except Exception:
+            self.__errors += 1
+            logger.exception('Worker warm-up is failed')
+        self.__duration = time.perf_counter() - start
+        self.__is_ready = True
+        logger.info(
+            'Worker is warmed up: connections=%d duration_ms=%.3f',
+            self.__warmed_connections, self.__duration * 1000
+        )
+
+    def start(self):
+        """Start background warm-up.
+
+        Returns: None
+
+        """
+        if self.__task is None:
+            self.__task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Cancel warm-up if it is not finished.
+
+        Returns: None
+
+        """
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+
+def create_warmup(connection: CustomConnection) -> WarmUp:
+    """Return warm-up configured by environment variables.
+
+    WARMUP_CONNECTIONS defaults to connection pool size.
+
+    Args:
+        connection: database connection
+
+    Returns: WarmUp
+
+    """
+    return WarmUp(
+        connection=connection,
+        connections=get_int_env(
+            'WARMUP_CONNECTIONS',
+            get_int_env('POSTGRES_POOL_SIZE', DEFAULT_WARMUP_CONNECTIONS)
+        )
+    )
@@ -0,0 +1,111 @@
+"""Benchmark of response serialization.
+
+Compares default FastAPI path for route with response_model (validation
+of returned model, jsonable_encoder and JSONResponse) with render_response.
+
+Usage:
+    python -m benchmarks.serialization [--number N]
+
+"""
+
+import argparse
+import timeit
+from datetime import date, datetime
+from typing import Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_cloned_field, create_response_field
+from pydantic import BaseModel
+
+from auth_app import models
+from auth_app.responses import dump_json
+
+__all__ = []
+
+MODELS = {
+    'Token': models.Token(
+        value='0b5bb1a5-3f4d-4bd5-a1ec-2f8e2fd2a7c1',
+        expires=datetime(2023, 1, 2, 3, 4, 5)
+    ),
+    'SalaryInfo': models.SalaryInfo(
+        user_id=1,
+        name='Michael Chernov',
+        value=180000,
+        target_date=date(2023, 9, 1)
+    ),
+    'Response': models.Response(message='User and salary info is was added.'),
+}
+
+
+def create_default_renderer(model: BaseModel) -> Callable[[], bytes]:
+    """Return function which renders model like FastAPI route.
+
+    Args:
+        model: pydantic model returned by route
+
+    Returns: function without arguments
+
+    """
+    field = create_cloned_field(
+        create_response_field(name='response', type_=type(model))
+    )
+
+    def render() -> bytes:
+        coroutine = serialize_response(field=field, response_content=model)
+        try:
+            coroutine.send(None)
+        except StopIteration as result:
+            return JSONResponse(content=result.value).body
+
+    return render
+
+
+def measure(func: Callable[[], bytes], number: int) -> float:
+    """Return mean call time in microseconds.
+
+    Args:
+        func: function without arguments
+        number: count of calls
+
+    Returns: float
+
+    """
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    """Print serialization time of response models.
+
+    Returns: None
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, model in MODELS.items():
+        default_render = create_default_renderer(model=model)
+        assert default_render() == dump_json(content=model)
+        results[name] = {
+            'default': measure(default_render, args.number),
+            'orjson': measure(lambda: dump_json(content=model), args.number),
+            'json': measure(
+                lambda: dump_json(content=model, use_orjson=False),
+                args.number
+            ),
+        }
+
+    print(f'{"model":<12}{"default, us":>14}{"json, us":>12}'
+          f'{"orjson, us":>12}{"saved, us":>12}')
+    for name, result in results.items():
+        print(
+            f'{name:<12}{result["default"]:>14.2f}{result["json"]:>12.2f}'
+            f'{result["orjson"]:>12.2f}'
+            f'{result["default"] - result["orjson"]:>12.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
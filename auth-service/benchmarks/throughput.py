@@ -0,0 +1,116 @@
+"""Benchmark of HTTP throughput of running service.
+
+Opens keep-alive connections and sends GET requests for given time, then
+prints count of requests per second and latency percentiles.
+
+Usage:
+    python -m benchmarks.throughput http://127.0.0.1:8133/ping \
+        [--concurrency N] [--duration SECONDS] [--header "Name: value"]
+
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+from urllib.parse import urlsplit
+
+__all__ = []
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Read one HTTP response and return its status code.
+
+    Args:
+        reader: connection reader
+
+    Returns: int
+
+    """
+    status_line = await reader.readline()
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            content_length = int(value)
+    await reader.readexactly(content_length)
+    return int(status_line.split()[1])
+
+
+async def run_client(host: str, port: int, request: bytes, deadline: float,
+                     latencies: List[float], errors: List[int]):
+    """Send requests by one connection until deadline.
+
+    Args:
+        host: server host
+        port: server port
+        request: raw HTTP request
+        deadline: perf_counter value to stop at
+        latencies: list for request latencies
+        errors: list for not 200 status codes
+
+    Returns: None
+
+    """
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader=reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def main():
+    """Print throughput of service route.
+
+    Returns: None
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('url')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--header', action='append', default=[])
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    headers = ''.join(f'{header}\r\n' for header in args.header)
+    request = (
+        f'GET {url.path or "/"} HTTP/1.1\r\n'
+        f'Host: {url.netloc}\r\n{headers}\r\n'
+    ).encode()
+
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*(
+        run_client(
+            host=url.hostname,
+            port=url.port or 80,
+            request=request,
+            deadline=deadline,
+            latencies=latencies,
+            errors=errors
+        )
+        for _ in range(args.concurrency)
+    ))
+
+    latencies.sort()
+    count = len(latencies)
+    print(f'requests: {count}, errors: {len(errors)}')
+    print(f'requests/s: {count / args.duration:.0f}')
+    for percentile in (50, 99):
+        value = latencies[min(count - 1, count * percentile // 100)]
+        print(f'p{percentile}, ms: {value * 1000:.2f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
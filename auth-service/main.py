@@ -1,21 +1,151 @@
-"""App main module."""
+"""App main module.
 
+Run modes:
+    dev - one process with code reload (default)
+    prod - worker per CPU core, uvloop and httptools, no reload
+
+Usage:
+    python main.py [--mode dev|prod] [--host HOST] [-p PORT] [--workers N]
+
+"""
+
+import argparse
+import copy
+import importlib.util
 import os
+from typing import Dict, List, Union
 
 import dotenv
 import uvicorn
+from uvicorn.config import LOGGING_CONFIG
 
 from auth_app.app import app
+from auth_app.settings import get_bool_env, get_int_env
 
 __all__ = []
 
 dotenv.load_dotenv()
 
+DEV_MODE = 'dev'
+PROD_MODE = 'prod'
+DEFAULT_BACKLOG = 2048
+DEFAULT_KEEP_ALIVE = 5
+DEFAULT_LIMIT_CONCURRENCY = 1000
+DEFAULT_LOG_LEVEL = 'INFO'
+DEFAULT_FORWARDED_ALLOW_IPS = '127.0.0.1'
+APP_LOGGER = 'auth_app'
+
+
+def get_implementation(name: str) -> str:
+    """Return uvicorn implementation name if its package is installed.
+
+    Args:
+        name: uvloop or httptools
+
+    Returns: name or auto - uvicorn chooses available implementation
+
+    """
+    return name if importlib.util.find_spec(name) else 'auto'
+
+
+def get_log_config() -> Dict:
+    """Return uvicorn logging config with application logger.
+
+    uvicorn default config sets up only uvicorn loggers, so application
+    logs (warm-up, sweeper, request timing) are written by the same
+    handler with level from APP_LOG_LEVEL variable.
+
+    Returns: dict for logging.config.dictConfig
+
+    """
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config['loggers'][APP_LOGGER] = {
+        'handlers': ['default'],
+        'level': os.getenv('APP_LOG_LEVEL', DEFAULT_LOG_LEVEL).upper(),
+        'propagate': False,
+    }
+    return log_config
+
+
+def get_uvicorn_options(mode: str, host: str, port: int, workers: int = 0
+                        ) -> Dict[str, Union[str, int, bool, Dict]]:
+    """Return uvicorn settings for run mode.
+
+    Production settings are read from APP_WORKERS, APP_BACKLOG,
+    APP_KEEP_ALIVE, APP_LIMIT_CONCURRENCY and APP_ACCESS_LOG variables.
+    Client address is taken from X-Forwarded-For header of proxies listed
+    in APP_FORWARDED_ALLOW_IPS in both modes.
+
+    Args:
+        mode: dev or prod
+        host: bind host
+        port: bind port
+        workers: count of worker processes, 0 - count of CPU cores
+
+    Returns: dict with uvicorn.run arguments
+
+    """
+    options = {
+        'host': host,
+        'port': port,
+        'log_config': get_log_config(),
+        'proxy_headers': True,
+        'forwarded_allow_ips': os.getenv(
+            'APP_FORWARDED_ALLOW_IPS', DEFAULT_FORWARDED_ALLOW_IPS
+        ),
+    }
+    if mode == DEV_MODE:
+        options['reload'] = True
+        return options
+
+    options.update(
+        reload=False,
+        workers=(
+            workers or get_int_env('APP_WORKERS', 0) or os.cpu_count() or 1
+        ),
+        loop=get_implementation(name='uvloop'),
+        http=get_implementation(name='httptools'),
+        backlog=get_int_env('APP_BACKLOG', DEFAULT_BACKLOG),
+        timeout_keep_alive=get_int_env('APP_KEEP_ALIVE', DEFAULT_KEEP_ALIVE),
+        limit_concurrency=get_int_env(
+            'APP_LIMIT_CONCURRENCY', DEFAULT_LIMIT_CONCURRENCY
+        ) or None,
+        access_log=get_bool_env('APP_ACCESS_LOG', False)
+    )
+    return options
+
+
+def parse_args(args: Union[List[str], None] = None) -> argparse.Namespace:
+    """Return command line arguments.
+
+    Args:
+        args: arguments list, default - sys.argv
+
+    Returns: argparse.Namespace
+
+    """
+    parser = argparse.ArgumentParser(description='Run auth service.')
+    parser.add_argument(
+        '--mode',
+        choices=(DEV_MODE, PROD_MODE),
+        default=os.getenv('APP_RUN_MODE', DEV_MODE)
+    )
+    parser.add_argument('--host', default=os.getenv('APP_HOST'))
+    parser.add_argument(
+        '-p', '--port', type=int, default=get_int_env('APP_PORT', 8000)
+    )
+    parser.add_argument('--workers', type=int, default=0)
+    return parser.parse_args(args)
+
 
 if __name__ == '__main__':
+    arguments = parse_args()
     uvicorn.run(
         'main:app',
-        reload=True,
-        host=os.getenv('APP_HOST'),
-        port=int(os.getenv('APP_PORT'))
+        **get_uvicorn_options(
+            mode=arguments.mode,
+            host=arguments.host,
+            port=arguments.port,
+            workers=arguments.workers
+        )
     )
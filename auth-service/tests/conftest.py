@@ -6,25 +6,17 @@ import dotenv
 import pytest
 import pytest_asyncio
 from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth_app.dbase import orm
+from auth_app.dbase import migrations, orm
 from auth_app.dbase.connection import CustomConnection
 from auth_app.dbase.dal.user import (HASH_SALT_DELIMITER,
                                      generate_random_string,
                                      get_hashed_password)
+from auth_app.throttling import login_throttle
 
 dotenv.load_dotenv()
 
 
-@pytest.fixture
-def get_dbase_session():
-    return AsyncSession(
-        CustomConnection().engine,
-        expire_on_commit=False
-    )
-
-
 @pytest.fixture(scope='session')
 def event_loop():
     """Overrides pytest default function scoped event loop"""
@@ -34,12 +26,28 @@ def event_loop():
     loop.close()
 
 
+@pytest_asyncio.fixture(scope='session')
+async def dbase_connection():
+    connection = CustomConnection()
+    yield connection
+    await connection.close()
+
+
 @pytest_asyncio.fixture(scope='session', autouse=True)
-async def fill_user_table():
-    session = AsyncSession(
-        CustomConnection().engine,
-        expire_on_commit=False
-    )
+async def upgrade_schema(dbase_connection):
+    await migrations.upgrade(engine=dbase_connection.engine)
+    yield
+
+
+@pytest_asyncio.fixture
+async def get_dbase_session(dbase_connection):
+    async with dbase_connection.async_session as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope='session', autouse=True)
+async def fill_user_table(dbase_connection, upgrade_schema):
+    session = dbase_connection.async_session
 
     for i in range(10):
         salt = generate_random_string(length=5)
@@ -61,12 +69,9 @@ async def fill_user_table():
 
 
 @pytest_asyncio.fixture(scope='session', autouse=True)
-async def clear_user_table():
+async def clear_user_table(dbase_connection):
     yield
-    session = AsyncSession(
-        CustomConnection().engine,
-        expire_on_commit=False
-    )
+    session = dbase_connection.async_session
 
     query = delete(orm.User).where(orm.User.login.contains('test'))
     await session.execute(query)
@@ -74,11 +79,8 @@ async def clear_user_table():
 
 
 @pytest_asyncio.fixture(scope='session', autouse=True)
-async def fill_salary_table(fill_user_table):
-    session = AsyncSession(
-        CustomConnection().engine,
-        expire_on_commit=False
-    )
+async def fill_salary_table(dbase_connection, fill_user_table):
+    session = dbase_connection.async_session
 
     query = select(orm.User.id_).where(
         orm.User.login.contains('test')
@@ -98,3 +100,9 @@ async def fill_salary_table(fill_user_table):
     await session.commit()
 
     yield
+
+
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    login_throttle.reset()
+    yield
@@ -1,9 +1,13 @@
 from typing import List
 
+from hamcrest import assert_that, equal_to
+from pydantic import BaseModel
+
 from auth_app import models
 from auth_app.dbase.dal.user import (HASH_SALT_DELIMITER,
                                      generate_random_string,
                                      get_hashed_password)
+from auth_app.responses import dump_json
 
 
 def generate_valid_passwords(count: int = 10) -> List[List[str]]:
@@ -39,3 +43,16 @@ def create_test_user() -> models.User:
         login='test-' + generate_random_string(length=5),
         password=generate_random_string(length=7)
     )
+
+
+def assert_same_as_validated(model: BaseModel):
+    validated = type(model)(**model.dict())
+    assert_that(actual_or_assertion=model, matcher=equal_to(validated))
+    assert_that(
+        actual_or_assertion=model.json(by_alias=True),
+        matcher=equal_to(validated.json(by_alias=True))
+    )
+    assert_that(
+        actual_or_assertion=dump_json(content=model),
+        matcher=equal_to(dump_json(content=validated))
+    )
@@ -5,6 +5,7 @@ from hamcrest import assert_that, equal_to
 from sqlalchemy.exc import DBAPIError
 
 from auth_app.dbase.dal.base import BaseDAL
+from auth_app.dbase.dal.user import UserDAL
 
 
 class TestBaseDAL:
@@ -40,3 +41,48 @@ class TestBaseDAL:
             session_instance.rollback.assert_not_called()
         else:
             session_instance.rollback.assert_called_once()
+
+
+class TestExecuteRead:
+    @pytest.mark.asyncio
+    async def test_connection_is_kept(self, dbase_connection):
+        pool = dbase_connection.engine.pool
+        async with dbase_connection.async_session as session:
+            checked_out = pool.checkedout()
+            user_dal = UserDAL(session=session)
+            credentials = await user_dal.get_credentials(
+                login='test-login=1'
+            )
+            connection = await session.connection()
+            await user_dal.get_by_id(id_=credentials.id_)
+
+            assert_that(
+                actual_or_assertion=credentials.name,
+                matcher=equal_to('test-user-1')
+            )
+            assert_that(
+                actual_or_assertion=await session.connection() is connection,
+                matcher=equal_to(True)
+            )
+            assert_that(
+                actual_or_assertion=pool.checkedout(),
+                matcher=equal_to(checked_out + 1)
+            )
+
+    @pytest.mark.asyncio
+    async def test_release_connection(self, dbase_connection):
+        pool = dbase_connection.engine.pool
+        async with dbase_connection.async_session as session:
+            checked_out = pool.checkedout()
+            user_dal = UserDAL(session=session)
+            await user_dal.get_credentials(login='test-login=1')
+            await user_dal.release_connection()
+
+            assert_that(
+                actual_or_assertion=session.in_transaction(),
+                matcher=equal_to(False)
+            )
+            assert_that(
+                actual_or_assertion=pool.checkedout(),
+                matcher=equal_to(checked_out)
+            )
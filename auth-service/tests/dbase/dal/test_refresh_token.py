@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import pytest
+from hamcrest import assert_that, equal_to, is_, is_not
+from sqlalchemy import func, select
+
+from auth_app.dbase import orm
+from auth_app.dbase.dal.refresh_token import (REFRESH_EXPIRES_SIZE,
+                                              RefreshTokenDAL,
+                                              RotatedRefreshToken,
+                                              get_token_hash)
+from auth_app.dbase.dal.user import UserDAL
+from tests.dbase.dal.helpers import create_test_user
+
+
+async def add_test_user(session) -> int:
+    user = create_test_user()
+    user_dal = UserDAL(session=session)
+    await user_dal.add(user=user)
+    return await user_dal.get_id_by_login(login=user.login)
+
+
+class TestRefreshTokenDAL:
+    @pytest.mark.asyncio
+    async def test_issue_saves_hash(self, get_dbase_session):
+        user_id = await add_test_user(session=get_dbase_session)
+
+        refresh_token_dal = RefreshTokenDAL(session=get_dbase_session)
+        token_value = await refresh_token_dal.issue(user_id=user_id)
+
+        query = select(orm.RefreshToken.token_hash).where(
+            orm.RefreshToken.user_id == user_id
+        )
+        token_hashes = (await get_dbase_session.execute(query)).scalars().all()
+        assert_that(
+            actual_or_assertion=token_hashes,
+            matcher=equal_to([get_token_hash(token_value=token_value)])
+        )
+
+    @pytest.mark.asyncio
+    async def test_rotate(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        user_id = await user_dal.get_id_by_login(login=user.login)
+
+        refresh_token_dal = RefreshTokenDAL(session=get_dbase_session)
+        token_value = await refresh_token_dal.issue(user_id=user_id)
+        rotated = await refresh_token_dal.rotate(token_value=token_value)
+
+        assert_that(
+            actual_or_assertion=rotated,
+            matcher=equal_to(
+                RotatedRefreshToken(
+                    user_id=user_id,
+                    name=user.name,
+                    refresh_token=rotated.refresh_token
+                )
+            )
+        )
+        assert_that(
+            actual_or_assertion=rotated.refresh_token,
+            matcher=is_not(equal_to(token_value))
+        )
+        assert_that(
+            actual_or_assertion=await refresh_token_dal.rotate(
+                token_value=token_value
+            ),
+            matcher=is_(None)
+        )
+
+    @pytest.mark.asyncio
+    async def test_rotate_unknown_token(self, get_dbase_session):
+        refresh_token_dal = RefreshTokenDAL(session=get_dbase_session)
+        assert_that(
+            actual_or_assertion=await refresh_token_dal.rotate(
+                token_value='unknown'
+            ),
+            matcher=is_(None)
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete(self, get_dbase_session):
+        user_id = await add_test_user(session=get_dbase_session)
+        refresh_token_dal = RefreshTokenDAL(session=get_dbase_session)
+        token_value = await refresh_token_dal.issue(user_id=user_id)
+
+        assert_that(
+            actual_or_assertion=await refresh_token_dal.delete(
+                token_value=token_value
+            ),
+            matcher=is_(True)
+        )
+        assert_that(
+            actual_or_assertion=await refresh_token_dal.delete(
+                token_value=token_value
+            ),
+            matcher=is_(False)
+        )
+        assert_that(
+            actual_or_assertion=await refresh_token_dal.rotate(
+                token_value=token_value
+            ),
+            matcher=is_(None)
+        )
+
+    @pytest.mark.freeze_time('2023-01-01')
+    @pytest.mark.asyncio
+    async def test_rotate_expired_token(self, get_dbase_session, freezer):
+        user_id = await add_test_user(session=get_dbase_session)
+        refresh_token_dal = RefreshTokenDAL(session=get_dbase_session)
+        token_value = await refresh_token_dal.issue(user_id=user_id)
+
+        freezer.move_to(datetime(2023, 1, 1) + REFRESH_EXPIRES_SIZE * 2)
+
+        assert_that(
+            actual_or_assertion=await refresh_token_dal.rotate(
+                token_value=token_value
+            ),
+            matcher=is_(None)
+        )
+        query = select(func.count(orm.RefreshToken.id_)).where(
+            orm.RefreshToken.user_id == user_id
+        )
+        assert_that(
+            actual_or_assertion=(await get_dbase_session.execute(
+                query
+            )).scalar(),
+            matcher=equal_to(0)
+        )
@@ -1,15 +1,20 @@
+import asyncio
 import random
-from datetime import datetime
+from datetime import date, datetime
 from typing import Union
+from unittest.mock import patch
 
 import pytest
 from hamcrest import assert_that, equal_to, is_
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
 from auth_app.dbase import orm
 from auth_app.dbase.dal.salary import SalaryDAL
+from auth_app.dbase.dal.user import UserDAL
+from auth_app.dbase.identity import IdentityMap
+from tests.dbase.dal.helpers import assert_same_as_validated
 
 
 class TestSalaryDAL:
@@ -85,3 +90,184 @@ class TestSalaryDAL:
             actual_or_assertion=salary_info,
             matcher=equal_to(expected_salary)
         )
+        if is_exist:
+            assert_same_as_validated(model=salary_info)
+
+    @pytest.mark.asyncio
+    async def test_get_by_user_id_single_query(self, get_dbase_session):
+        query = select(orm.Salary.user_id)
+        user_id = (await get_dbase_session.execute(query)).scalar()
+
+        table_dal = SalaryDAL(get_dbase_session)
+        with patch.object(
+                get_dbase_session, 'execute',
+                wraps=get_dbase_session.execute
+        ) as execute_mock:
+            salary_info = await table_dal.get_by_user_id(id_=user_id)
+
+        assert_that(
+            actual_or_assertion=execute_mock.call_count,
+            matcher=equal_to(1)
+        )
+        assert_that(
+            actual_or_assertion=salary_info.user_id,
+            matcher=equal_to(user_id)
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_many(self, get_dbase_session):
+        query = select(orm.User.id_, orm.User.name).limit(3)
+        users = (await get_dbase_session.execute(query)).all()
+        salary_infos = [
+            models.SalaryInfo(
+                user_id=user_id,
+                name=name,
+                value=random.randint(1, 1000),
+                target_date=date(2024, 1, 1)
+            )
+            for user_id, name in users
+        ]
+        salary_infos.append(
+            models.SalaryInfo(
+                user_id=users[0][0],
+                name=users[0][1],
+                value=777,
+                target_date=date(2024, 2, 2)
+            )
+        )
+
+        salary_dal = SalaryDAL(get_dbase_session)
+        is_success = await salary_dal.add_many(
+            salary_infos=salary_infos, batch_size=2
+        )
+        assert_that(actual_or_assertion=is_success, matcher=is_(True))
+
+        for salary_info in salary_infos[1:]:
+            actual_info = await salary_dal.get_by_user_id(
+                id_=salary_info.user_id
+            )
+            assert_that(
+                actual_or_assertion=actual_info,
+                matcher=equal_to(salary_info)
+            )
+
+    @pytest.mark.asyncio
+    async def test_add_concurrent(self, dbase_connection, get_dbase_session):
+        user = await self.get_random_existing_user(session=get_dbase_session)
+
+        async def add_salary(value: int) -> bool:
+            async with dbase_connection.async_session as session:
+                return await SalaryDAL(session).add(
+                    salary_info=models.SalaryInfo(
+                        user_id=user.id_,
+                        name=user.name,
+                        value=value,
+                        target_date=date(2024, 1, 1)
+                    )
+                )
+
+        results = await asyncio.gather(*(add_salary(i) for i in range(5)))
+        assert_that(actual_or_assertion=all(results), matcher=is_(True))
+
+        query = select(func.count(orm.Salary.id_)).where(
+            orm.Salary.user_id == user.id_
+        )
+        count = (await get_dbase_session.execute(query)).scalar()
+        assert_that(actual_or_assertion=count, matcher=equal_to(1))
+
+    @pytest.mark.asyncio
+    async def test_add_many_empty(self, get_dbase_session):
+        salary_dal = SalaryDAL(get_dbase_session)
+        is_success = await salary_dal.add_many(salary_infos=[])
+        assert_that(actual_or_assertion=is_success, matcher=is_(True))
+
+    @pytest.mark.asyncio
+    async def test_iter_all(self, get_dbase_session):
+        query = select(func.count()).select_from(orm.Salary)
+        count = (await get_dbase_session.execute(query)).scalar()
+
+        salary_dal = SalaryDAL(get_dbase_session)
+        batches = [
+            rows async for rows in salary_dal.iter_all(batch_size=3)
+        ]
+
+        assert_that(
+            actual_or_assertion=all(len(rows) <= 3 for rows in batches),
+            matcher=equal_to(True)
+        )
+        user_ids = [row[0] for rows in batches for row in rows]
+        assert_that(
+            actual_or_assertion=len(user_ids),
+            matcher=equal_to(count)
+        )
+        assert_that(
+            actual_or_assertion=user_ids,
+            matcher=equal_to(sorted(user_ids))
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_raises(self, get_dbase_session):
+        date_from, date_to = date(2023, 1, 1), date(2023, 12, 31)
+        salary_dal = SalaryDAL(get_dbase_session)
+        first_page = await salary_dal.get_raises(
+            date_from=date_from, date_to=date_to, limit=2
+        )
+        last = first_page[-1]
+        second_page = await salary_dal.get_raises(
+            date_from=date_from,
+            date_to=date_to,
+            limit=2,
+            after=(last.target_date, last.user_id)
+        )
+        all_rows = await salary_dal.get_raises(
+            date_from=date_from, date_to=date_to, limit=4
+        )
+
+        assert_that(
+            actual_or_assertion=first_page + second_page,
+            matcher=equal_to(all_rows)
+        )
+        assert_that(
+            actual_or_assertion=all(
+                date_from <= item.target_date <= date_to for item in all_rows
+            ),
+            matcher=equal_to(True)
+        )
+        for item in all_rows:
+            assert_same_as_validated(model=item)
+
+    @pytest.mark.asyncio
+    async def test_get_by_user_id_with_loaded_user(self, get_dbase_session):
+        query = select(orm.Salary.user_id)
+        user_id = (await get_dbase_session.execute(query)).scalar()
+        await get_dbase_session.rollback()
+        identity_map = IdentityMap()
+        user_dal = UserDAL(get_dbase_session, identity_map=identity_map)
+        user = await user_dal.get_by_id(id_=user_id)
+
+        salary_dal = SalaryDAL(get_dbase_session, identity_map=identity_map)
+        with patch.object(
+                get_dbase_session, 'execute',
+                wraps=get_dbase_session.execute
+        ) as execute_mock:
+            salary_info = await salary_dal.get_by_user_id(id_=user_id)
+            assert_that(
+                actual_or_assertion=await salary_dal.get_by_user_id(
+                    id_=user_id
+                ),
+                matcher=equal_to(salary_info)
+            )
+
+        assert_that(
+            actual_or_assertion=execute_mock.call_count,
+            matcher=equal_to(1)
+        )
+        statement = str(execute_mock.call_args.args[0])
+        assert_that(
+            actual_or_assertion='JOIN' in statement,
+            matcher=equal_to(False)
+        )
+        assert_that(
+            actual_or_assertion=salary_info.name,
+            matcher=equal_to(user.name)
+        )
@@ -1,5 +1,7 @@
 import random
-from uuid import uuid4
+from datetime import datetime
+from unittest.mock import patch
+from uuid import UUID, uuid4
 
 import pytest
 from hamcrest import assert_that, equal_to, is_
@@ -8,7 +10,27 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_app import models
 from auth_app.dbase import orm
-from auth_app.dbase.dal.token_ import TokenDAL
+from auth_app.dbase.dal.token_ import (EXPIRES_SIZE, TokenDAL, TokenStatus,
+                                       to_uuid)
+from auth_app.dbase.identity import USER_ENTITY, IdentityMap
+from tests.dbase.dal.helpers import assert_same_as_validated
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        ('12345678-1234-5678-1234-567812345678',
+         UUID('12345678-1234-5678-1234-567812345678')),
+        (UUID(int=1), UUID(int=1)),
+        ('not-uuid', None),
+        (None, None),
+    ]
+)
+def test_to_uuid(value, expected):
+    assert_that(
+        actual_or_assertion=to_uuid(value=value),
+        matcher=equal_to(expected)
+    )
 
 
 class TestTokenDAL:
@@ -62,7 +84,7 @@ class TestTokenDAL:
             record = await get_dbase_session.execute(query)
             token_orm = record.scalar()
             expected_token = models.Token(
-                value=token_orm.value,
+                value=str(token_orm.value),
                 expires=token_orm.expires
             )
         else:
@@ -108,10 +130,176 @@ class TestTokenDAL:
         await token_dal.add(user_id=user_id)
 
         token_value = (await token_dal.get_by_user_id(id_=user_id)).value
-        await token_dal.delete(token_value=token_value)
+        is_success = await token_dal.delete(token_value=token_value)
 
         token = await token_dal.get_by_user_id(id_=user_id)
+        assert_that(actual_or_assertion=is_success, matcher=is_(True))
         assert_that(
             actual_or_assertion=token,
             matcher=is_(None)
         )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('token_value', [uuid4().hex, 'not-uuid'])
+    async def test_get_owner_not_found(self, get_dbase_session,
+                                       token_value: str):
+        token_dal = TokenDAL(session=get_dbase_session)
+        owner = await token_dal.get_owner(token_value=token_value)
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.NOT_FOUND)
+        )
+        assert_that(actual_or_assertion=owner.user, matcher=is_(None))
+
+    @pytest.mark.asyncio
+    async def test_get_owner_valid(self, get_dbase_session):
+        user_id = await self.get_random_existing_user_id(
+            session=get_dbase_session
+        )
+        token_dal = TokenDAL(session=get_dbase_session)
+        await token_dal.add(user_id=user_id)
+        token = await token_dal.get_by_user_id(id_=user_id)
+
+        query = select(orm.User.name).where(orm.User.id_ == user_id)
+        name = (await get_dbase_session.execute(query)).scalar()
+
+        owner = await token_dal.get_owner(token_value=token.value)
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.VALID)
+        )
+        assert_that(
+            actual_or_assertion=owner.user,
+            matcher=equal_to(models.ActiveUser(id_=user_id, name=name))
+        )
+        assert_that(
+            actual_or_assertion=owner.expires,
+            matcher=equal_to(token.expires)
+        )
+
+    @pytest.mark.freeze_time('2023-01-01')
+    @pytest.mark.asyncio
+    async def test_get_owner_expired(self, get_dbase_session, freezer):
+        user_id = await self.get_random_existing_user_id(
+            session=get_dbase_session
+        )
+        token_dal = TokenDAL(session=get_dbase_session)
+        query = select(orm.Token).where(orm.Token.user_id == user_id)
+        token_orm = (await get_dbase_session.execute(query)).scalar()
+        if token_orm:
+            await token_dal.delete(token_value=token_orm.value)
+        await token_dal.add(user_id=user_id)
+        token = await token_dal.get_by_user_id(id_=user_id)
+
+        freezer.move_to(datetime(2023, 1, 1) + EXPIRES_SIZE * 2)
+
+        owner = await token_dal.get_owner(token_value=token.value)
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.EXPIRED)
+        )
+        assert_that(actual_or_assertion=owner.user, matcher=is_(None))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('token_value', [str(uuid4()), 'not-uuid'])
+    async def test_delete_not_found(self, get_dbase_session,
+                                    token_value: str):
+        token_dal = TokenDAL(session=get_dbase_session)
+        is_success = await token_dal.delete(token_value=token_value)
+        assert_that(actual_or_assertion=is_success, matcher=is_(False))
+
+    @pytest.mark.asyncio
+    async def test_issue(self, get_dbase_session):
+        user_id = await self.get_random_existing_user_id(
+            session=get_dbase_session
+        )
+        token_dal = TokenDAL(session=get_dbase_session)
+        token = await token_dal.issue(user_id=user_id)
+
+        query = select(orm.Token).where(orm.Token.user_id == user_id)
+        token_orm = (await get_dbase_session.execute(query)).scalar()
+        assert_that(
+            actual_or_assertion=token_orm.value,
+            matcher=equal_to(UUID(token.value))
+        )
+        assert_that(
+            actual_or_assertion=token.expires,
+            matcher=equal_to(token_orm.expires)
+        )
+        assert_same_as_validated(model=token)
+
+    @pytest.mark.asyncio
+    async def test_issue_reuses_valid_token(self, get_dbase_session):
+        user_id = await self.get_random_existing_user_id(
+            session=get_dbase_session
+        )
+        token_dal = TokenDAL(session=get_dbase_session)
+        first_token = await token_dal.issue(user_id=user_id)
+        second_token = await token_dal.issue(user_id=user_id)
+
+        assert_that(
+            actual_or_assertion=second_token,
+            matcher=equal_to(first_token)
+        )
+
+    @pytest.mark.freeze_time('2023-01-01')
+    @pytest.mark.asyncio
+    async def test_issue_replaces_expired_token(self, get_dbase_session,
+                                                freezer):
+        user_id = await self.get_random_existing_user_id(
+            session=get_dbase_session
+        )
+        token_dal = TokenDAL(session=get_dbase_session)
+        query = select(orm.Token).where(orm.Token.user_id == user_id)
+        token_orm = (await get_dbase_session.execute(query)).scalar()
+        if token_orm:
+            await token_dal.delete(token_value=token_orm.value)
+        expired_token = await token_dal.issue(user_id=user_id)
+
+        freezer.move_to(datetime(2023, 1, 1) + EXPIRES_SIZE * 2)
+        new_token = await token_dal.issue(user_id=user_id)
+
+        assert_that(
+            actual_or_assertion=new_token.value == expired_token.value,
+            matcher=is_(False)
+        )
+        assert_that(
+            actual_or_assertion=new_token.is_valid,
+            matcher=is_(True)
+        )
+        actual_token = await token_dal.get_by_user_id(id_=user_id)
+        assert_that(
+            actual_or_assertion=actual_token,
+            matcher=equal_to(new_token)
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_owner_saves_user(self, get_dbase_session):
+        user_id = await self.get_random_existing_user_id(
+            session=get_dbase_session
+        )
+        identity_map = IdentityMap()
+        token_dal = TokenDAL(
+            session=get_dbase_session, identity_map=identity_map
+        )
+        token = await token_dal.issue(user_id=user_id)
+
+        owner = await token_dal.get_owner(token_value=token.value)
+        with patch.object(
+                get_dbase_session, 'execute',
+                wraps=get_dbase_session.execute
+        ) as execute_mock:
+            cached_owner = await token_dal.get_owner(token_value=token.value)
+
+        assert_that(
+            actual_or_assertion=execute_mock.call_count,
+            matcher=equal_to(0)
+        )
+        assert_that(
+            actual_or_assertion=cached_owner,
+            matcher=equal_to(owner)
+        )
+        assert_that(
+            actual_or_assertion=identity_map.get(USER_ENTITY, user_id),
+            matcher=equal_to(owner.user)
+        )
@@ -1,3 +1,4 @@
+from datetime import date
 from unittest.mock import Mock, patch
 
 import pytest
@@ -6,11 +7,12 @@ from sqlalchemy import select
 
 from auth_app import models
 from auth_app.dbase import orm
-from auth_app.dbase.dal.user import (UserDAL, generate_random_string,
+from auth_app.dbase.dal.user import (SignUpStatus, UserDAL,
+                                     generate_random_string,
                                      get_hashed_password, is_valid_password)
 
-from .helpers import (create_test_user, generate_invalid_passwords,
-                      generate_valid_passwords)
+from .helpers import (assert_same_as_validated, create_test_user,
+                      generate_invalid_passwords, generate_valid_passwords)
 
 
 @pytest.mark.parametrize('length', [0, 1, 10, 20])
@@ -71,6 +73,102 @@ class TestUserDAL:
             matcher=equal_to(user.login)
         )
 
+    @pytest.mark.asyncio
+    async def test_add_existing_login(self, get_dbase_session):
+        user = create_test_user()
+        dal = UserDAL(session=get_dbase_session)
+        await dal.add(user=user)
+
+        user.login = user.login.upper()
+        is_success = await dal.add(user=user)
+        assert_that(actual_or_assertion=is_success, matcher=is_(False))
+
+    @pytest.mark.asyncio
+    async def test_add_with_salary(self, get_dbase_session):
+        user = create_test_user()
+        salary = models.UserSalary(value=1000, target_date=date(2024, 1, 1))
+
+        dal = UserDAL(session=get_dbase_session)
+        result = await dal.add_with_salary(user=user, salary=salary)
+
+        assert_that(
+            actual_or_assertion=result.status,
+            matcher=equal_to(SignUpStatus.CREATED)
+        )
+        assert_that(
+            actual_or_assertion=result.user_id,
+            matcher=equal_to(await dal.get_id_by_login(login=user.login))
+        )
+        query = select(orm.Salary.value, orm.Salary.target_date).where(
+            orm.Salary.user_id == result.user_id
+        )
+        record = (await get_dbase_session.execute(query)).one()
+        assert_that(
+            actual_or_assertion=tuple(record),
+            matcher=equal_to((salary.value, salary.target_date))
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_with_salary_existing_login(self, get_dbase_session):
+        user = create_test_user()
+        salary = models.UserSalary(value=1000, target_date=date(2024, 1, 1))
+        dal = UserDAL(session=get_dbase_session)
+        await dal.add(user=user)
+
+        user.login = user.login.upper()
+        result = await dal.add_with_salary(user=user, salary=salary)
+        assert_that(
+            actual_or_assertion=result.status,
+            matcher=equal_to(SignUpStatus.LOGIN_EXISTS)
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_with_invalid_salary(self, get_dbase_session):
+        user = create_test_user()
+        salary = models.UserSalary(value=2 ** 40, target_date=date.today())
+        dal = UserDAL(session=get_dbase_session)
+
+        result = await dal.add_with_salary(user=user, salary=salary)
+
+        assert_that(
+            actual_or_assertion=result.status,
+            matcher=equal_to(SignUpStatus.FAILED)
+        )
+        assert_that(
+            actual_or_assertion=await dal.is_exist(login=user.login),
+            matcher=is_(False)
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('is_exist', [True, False])
+    async def test_get_credentials(self, get_dbase_session, is_exist: bool):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+
+        login = user.login.upper() if is_exist else create_test_user().login
+        credentials = await user_dal.get_credentials(login=login)
+
+        if not is_exist:
+            assert_that(actual_or_assertion=credentials, matcher=is_(None))
+            return
+
+        query = select(orm.User).where(orm.User.login == user.login)
+        user_orm = (await get_dbase_session.execute(query)).scalar()
+        assert_that(
+            actual_or_assertion=credentials,
+            matcher=equal_to(
+                (user_orm.id_, user.name, user_orm.hashed_password)
+            )
+        )
+        assert_that(
+            actual_or_assertion=is_valid_password(
+                password=user.password,
+                hashed_password=credentials.hashed_password
+            ),
+            matcher=is_(True)
+        )
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         'is_good_login, is_good_password',
@@ -171,6 +269,7 @@ class TestUserDAL:
                 actual_or_assertion=active_user.name,
                 matcher=equal_to(user.name)
             )
+            assert_same_as_validated(model=active_user)
         else:
             assert_that(
                 actual_or_assertion=active_user,
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from hamcrest import assert_that, equal_to, instance_of
+
+from auth_app.app import app
+from auth_app.dbase.connection import CustomConnection
+
+
+class TestCustomConnection:
+    def test_pool_settings(self, monkeypatch):
+        monkeypatch.setenv('POSTGRES_POOL_SIZE', '3')
+        monkeypatch.setenv('POSTGRES_MAX_OVERFLOW', '2')
+        monkeypatch.setenv('POSTGRES_POOL_TIMEOUT', '4')
+
+        pool = CustomConnection().engine.pool
+
+        assert_that(actual_or_assertion=pool.size(), matcher=equal_to(3))
+        assert_that(
+            actual_or_assertion=pool._max_overflow,
+            matcher=equal_to(2)
+        )
+        assert_that(actual_or_assertion=pool._timeout, matcher=equal_to(4))
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        connection = CustomConnection()
+        with patch(
+                'sqlalchemy.ext.asyncio.AsyncEngine.dispose'
+        ) as dispose_mock:
+            await connection.close()
+        dispose_mock.assert_awaited_once_with()
+
+
+def test_app_lifespan():
+    with patch.object(CustomConnection, 'close') as close_mock:
+        with TestClient(app):
+            assert_that(
+                actual_or_assertion=app.state.connection,
+                matcher=instance_of(CustomConnection)
+            )
+            close_mock.assert_not_called()
+        close_mock.assert_awaited_once_with()
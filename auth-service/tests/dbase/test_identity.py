@@ -0,0 +1,51 @@
+from hamcrest import assert_that, equal_to, is_
+
+from auth_app.dbase.identity import USER_ENTITY, IdentityMap
+
+
+class TestIdentityMap:
+    def test_put_and_get(self):
+        identity_map = IdentityMap()
+        assert_that(
+            actual_or_assertion=identity_map.contains(USER_ENTITY, 1),
+            matcher=equal_to(False)
+        )
+
+        identity_map.put(USER_ENTITY, 1, 'user')
+
+        assert_that(
+            actual_or_assertion=identity_map.contains(USER_ENTITY, 1),
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=identity_map.get(USER_ENTITY, 1),
+            matcher=equal_to('user')
+        )
+        assert_that(
+            actual_or_assertion=identity_map.stats,
+            matcher=equal_to({'size': 1, 'hits': 1, 'misses': 1})
+        )
+
+    def test_not_found_entity(self):
+        identity_map = IdentityMap()
+        identity_map.put(USER_ENTITY, 1, None)
+
+        assert_that(
+            actual_or_assertion=identity_map.contains(USER_ENTITY, 1),
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=identity_map.get(USER_ENTITY, 1),
+            matcher=is_(None)
+        )
+
+    def test_evict(self):
+        identity_map = IdentityMap()
+        identity_map.put(USER_ENTITY, 1, 'user')
+        identity_map.evict(USER_ENTITY, 1)
+        identity_map.evict(USER_ENTITY, 2)
+
+        assert_that(
+            actual_or_assertion=identity_map.contains(USER_ENTITY, 1),
+            matcher=equal_to(False)
+        )
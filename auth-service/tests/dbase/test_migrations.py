@@ -0,0 +1,49 @@
+import pytest
+from hamcrest import assert_that, equal_to, has_items
+from sqlalchemy import text
+
+from auth_app.dbase.migrations import MIGRATIONS, get_current_version, upgrade
+
+
+def test_versions_order():
+    versions = [migration.version for migration in MIGRATIONS]
+    assert_that(
+        actual_or_assertion=versions,
+        matcher=equal_to(list(range(1, len(MIGRATIONS) + 1)))
+    )
+
+
+class TestUpgrade:
+    @pytest.mark.asyncio
+    async def test_upgrade_is_idempotent(self, dbase_connection):
+        applied = await upgrade(engine=dbase_connection.engine)
+        assert_that(actual_or_assertion=applied, matcher=equal_to([]))
+        assert_that(
+            actual_or_assertion=await get_current_version(
+                engine=dbase_connection.engine
+            ),
+            matcher=equal_to(MIGRATIONS[-1].version)
+        )
+
+    @pytest.mark.asyncio
+    async def test_indexes(self, dbase_connection):
+        async with dbase_connection.engine.connect() as conn:
+            records = await conn.execute(
+                text('SELECT indexname FROM pg_indexes')
+            )
+            index_names = records.scalars().all()
+
+        assert_that(
+            actual_or_assertion=index_names,
+            matcher=has_items(
+                'tokens_user_id_key',
+                'ix_tokens_expires',
+                'ix_tokens_value_covering',
+                'salary_user_id_key',
+                'ix_users_login_lower',
+                'ix_salary_target_date_user_id',
+                'refresh_tokens_token_hash_key',
+                'ix_refresh_tokens_expires',
+                'ix_refresh_tokens_user_id'
+            )
+        )
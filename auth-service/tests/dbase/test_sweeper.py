@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from hamcrest import assert_that, equal_to, greater_than_or_equal_to, is_
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_app.dbase import orm
+from auth_app.dbase.dal.refresh_token import RefreshTokenDAL
+from auth_app.dbase.dal.user import UserDAL
+from auth_app.dbase.sweeper import SWEEPER_LOCK_KEY, TokenSweeper
+from tests.dbase.dal.helpers import create_test_user
+
+
+async def create_expired_tokens(session: AsyncSession,
+                                count: int) -> List[int]:
+    user_dal = UserDAL(session=session)
+    user_ids = []
+    for _ in range(count):
+        user = create_test_user()
+        await user_dal.add(user=user)
+        user_ids.append(await user_dal.get_id_by_login(login=user.login))
+
+    for user_id in user_ids:
+        session.add(
+            orm.Token(
+                user_id=user_id,
+                expires=datetime.now() - timedelta(minutes=1)
+            )
+        )
+    await session.commit()
+    return user_ids
+
+
+async def count_tokens(session: AsyncSession, user_ids: List[int]) -> int:
+    query = select(func.count(orm.Token.id_)).where(
+        orm.Token.user_id.in_(user_ids)
+    )
+    count = (await session.execute(query)).scalar()
+    await session.commit()
+    return count
+
+
+class TestTokenSweeper:
+    @pytest.mark.parametrize('batch_size', [0, -1])
+    def test_invalid_batch_size(self, dbase_connection, batch_size: int):
+        with pytest.raises(ValueError):
+            TokenSweeper(connection=dbase_connection, batch_size=batch_size)
+
+    @pytest.mark.parametrize('max_batches', [0, -1])
+    def test_invalid_max_batches(self, dbase_connection, max_batches: int):
+        with pytest.raises(ValueError):
+            TokenSweeper(connection=dbase_connection, max_batches=max_batches)
+
+    @pytest.mark.asyncio
+    async def test_sweep(self, dbase_connection, get_dbase_session):
+        user_ids = await create_expired_tokens(
+            session=get_dbase_session, count=5
+        )
+
+        sweeper = TokenSweeper(connection=dbase_connection, batch_size=2)
+        swept = await sweeper.sweep()
+
+        assert_that(
+            actual_or_assertion=swept,
+            matcher=greater_than_or_equal_to(5)
+        )
+        assert_that(
+            actual_or_assertion=await count_tokens(
+                session=get_dbase_session, user_ids=user_ids
+            ),
+            matcher=equal_to(0)
+        )
+        assert_that(
+            actual_or_assertion=sweeper.stats['batches'],
+            matcher=greater_than_or_equal_to(3)
+        )
+        assert_that(
+            actual_or_assertion=sweeper.stats['swept'],
+            matcher=equal_to(swept)
+        )
+
+    @pytest.mark.freeze_time('2023-01-01')
+    @pytest.mark.asyncio
+    async def test_sweep_refresh_tokens(self, dbase_connection,
+                                        get_dbase_session, freezer):
+        user_ids = await create_expired_tokens(
+            session=get_dbase_session, count=1
+        )
+        refresh_token_dal = RefreshTokenDAL(session=get_dbase_session)
+        await refresh_token_dal.issue(user_id=user_ids[0])
+
+        freezer.move_to('2024-01-01')
+        sweeper = TokenSweeper(connection=dbase_connection)
+        await sweeper.sweep()
+
+        query = select(func.count(orm.RefreshToken.id_)).where(
+            orm.RefreshToken.user_id == user_ids[0]
+        )
+        assert_that(
+            actual_or_assertion=(await get_dbase_session.execute(
+                query
+            )).scalar(),
+            matcher=equal_to(0)
+        )
+
+    @pytest.mark.asyncio
+    async def test_sweep_with_locked_table(self, dbase_connection,
+                                           get_dbase_session):
+        user_ids = await create_expired_tokens(
+            session=get_dbase_session, count=1
+        )
+
+        async with dbase_connection.async_session as lock_session:
+            await lock_session.execute(
+                select(func.pg_advisory_xact_lock(SWEEPER_LOCK_KEY))
+            )
+            sweeper = TokenSweeper(connection=dbase_connection)
+            swept = await sweeper.sweep()
+            await lock_session.rollback()
+
+        assert_that(actual_or_assertion=swept, matcher=equal_to(0))
+        assert_that(
+            actual_or_assertion=sweeper.stats['skipped'],
+            matcher=equal_to(1)
+        )
+        assert_that(
+            actual_or_assertion=await count_tokens(
+                session=get_dbase_session, user_ids=user_ids
+            ),
+            matcher=equal_to(1)
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('interval, is_running', [(0, False), (60, True)])
+    async def test_start_stop(self, dbase_connection, interval: int,
+                              is_running: bool):
+        sweeper = TokenSweeper(connection=dbase_connection, interval=interval)
+        sweeper.start()
+        assert_that(
+            actual_or_assertion=sweeper.is_running,
+            matcher=is_(is_running)
+        )
+        await sweeper.stop()
+        assert_that(
+            actual_or_assertion=sweeper.is_running,
+            matcher=is_(False)
+        )
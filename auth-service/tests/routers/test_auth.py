@@ -1,12 +1,21 @@
 import ast
+from unittest.mock import patch
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
-from hamcrest import assert_that, equal_to
+from hamcrest import (assert_that, equal_to, greater_than, has_entries,
+                      has_key, is_, is_not, starts_with)
+from sqlalchemy import select
 
+from auth_app import models
 from auth_app.app import app
+from auth_app.dbase import orm
 from auth_app.dbase.dal.token_ import TokenDAL
-from auth_app.dbase.dal.user import UserDAL
+from auth_app.dbase.dal.user import (HASH_SALT_DELIMITER, UserDAL,
+                                     get_hashed_password)
+from auth_app.signed_token import RevocationList, TokenSigner
+from auth_app.throttling import LoginThrottle, RateLimiter
 from tests.dbase.dal.helpers import create_test_user
 
 from .helpers import create_auth_data
@@ -82,3 +91,356 @@ class TestAuthRoute:
             actual_or_assertion=response.json(),
             matcher=equal_to(ast.literal_eval(token.json(by_alias=True)))
         )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'scope, model',
+        [('', models.Token), ('offline_access', models.TokenWithRefresh)]
+    )
+    async def test_response_model(self, get_dbase_session, scope: str,
+                                  model: type):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {
+            'username': user.login,
+            'password': user.password,
+            'scope': scope
+        }
+        route = next(
+            route for route in app.routes
+            if getattr(route, 'path', None) == '/auth/'
+        )
+
+        with TestClient(app) as client:
+            token = client.post(url='/auth', data=request_data).json()
+
+        value, errors = route.response_field.validate(token, {}, loc=())
+        assert_that(actual_or_assertion=errors, matcher=is_(None))
+        assert_that(
+            actual_or_assertion=type(value),
+            matcher=equal_to(model)
+        )
+        assert_that(
+            actual_or_assertion=value.dict(by_alias=True),
+            matcher=has_entries(access_token=token['access_token'])
+        )
+
+
+class TestLoginThrottling:
+    @pytest.mark.asyncio
+    async def test_too_many_attempts(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {'username': user.login, 'password': 'wrong'}
+        throttle = LoginThrottle(
+            login_limiter=RateLimiter(rate=1, burst=2),
+            client_limiter=RateLimiter(rate=60, burst=10)
+        )
+
+        with patch('auth_app.dependencies.login_throttle', throttle):
+            with TestClient(app) as client:
+                responses = [
+                    client.post(url='/auth', data=request_data)
+                    for _ in range(2)
+                ]
+                with patch.object(UserDAL, 'get_credentials') as read_mock:
+                    response = client.post(url='/auth', data=request_data)
+
+        assert_that(
+            actual_or_assertion=[x.status_code for x in responses],
+            matcher=equal_to([400, 400])
+        )
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(429)
+        )
+        assert_that(
+            actual_or_assertion=int(response.headers['Retry-After']),
+            matcher=greater_than(0)
+        )
+        read_mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_successful_logins_are_not_limited(self,
+                                                     get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {'username': user.login, 'password': user.password}
+        throttle = LoginThrottle(
+            login_limiter=RateLimiter(rate=1, burst=2),
+            client_limiter=RateLimiter(rate=1, burst=2)
+        )
+
+        with patch('auth_app.dependencies.login_throttle', throttle), \
+                patch('auth_app.routers.auth.login_throttle', throttle):
+            with TestClient(app) as client:
+                responses = [
+                    client.post(url='/auth', data=request_data)
+                    for _ in range(5)
+                ]
+
+        assert_that(
+            actual_or_assertion=[x.status_code for x in responses],
+            matcher=equal_to([200] * 5)
+        )
+
+
+class TestPasswordRehash:
+    @pytest.mark.asyncio
+    async def test_legacy_hash_is_replaced(self, get_dbase_session):
+        user = create_test_user()
+        get_dbase_session.add(
+            orm.User(
+                name=user.name,
+                login=user.login,
+                hashed_password=HASH_SALT_DELIMITER.join(
+                    (get_hashed_password(user.password, 'salt'), 'salt')
+                )
+            )
+        )
+        await get_dbase_session.commit()
+        request_data = {'username': user.login, 'password': user.password}
+
+        with TestClient(app) as client:
+            first_response = client.post(url='/auth', data=request_data)
+            second_response = client.post(url='/auth', data=request_data)
+
+        query = select(orm.User.hashed_password).where(
+            orm.User.login == user.login
+        )
+        hashed_password = (await get_dbase_session.execute(query)).scalar()
+        assert_that(
+            actual_or_assertion=(
+                first_response.status_code, second_response.status_code
+            ),
+            matcher=equal_to((200, 200))
+        )
+        assert_that(
+            actual_or_assertion=hashed_password,
+            matcher=starts_with('$pbkdf2-sha256$')
+        )
+
+
+class TestLogoutRoute:
+    @pytest.mark.asyncio
+    async def test_logout_database_token(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {'username': user.login, 'password': user.password}
+
+        with TestClient(app) as client:
+            token = client.post(url='/auth', data=request_data).json()
+            headers = {'Authorization': f'Bearer {token["access_token"]}'}
+            logout_response = client.post(url='/auth/logout', headers=headers)
+            salary_response = client.get(url='/salary', headers=headers)
+
+        assert_that(
+            actual_or_assertion=logout_response.status_code,
+            matcher=equal_to(200)
+        )
+        assert_that(
+            actual_or_assertion=salary_response.status_code,
+            matcher=equal_to(401)
+        )
+
+    def test_unknown_database_token(self):
+        headers = {'Authorization': f'Bearer {uuid4()}'}
+        with TestClient(app) as client:
+            response = client.post(url='/auth/logout', headers=headers)
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(401)
+        )
+
+    @pytest.mark.asyncio
+    async def test_signed_token(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {'username': user.login, 'password': user.password}
+        signer = TokenSigner(secret='secret')
+
+        with patch('auth_app.routers.auth.token_signer', signer), \
+                patch('auth_app.dependencies.token_signer', signer), \
+                patch.object(TokenDAL, 'get_owner') as get_owner_mock:
+            with TestClient(app) as client:
+                token = client.post(url='/auth', data=request_data).json()
+                headers = {
+                    'Authorization': f'Bearer {token["access_token"]}'
+                }
+                response = client.get(url='/salary', headers=headers)
+                client.post(url='/auth/logout', headers=headers)
+                revoked_response = client.get(url='/salary', headers=headers)
+
+        assert_that(
+            actual_or_assertion=signer.stats['issued'],
+            matcher=equal_to(1)
+        )
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(400)
+        )
+        assert_that(
+            actual_or_assertion=response.json(),
+            matcher=equal_to({'detail': 'Salary info not found'})
+        )
+        assert_that(
+            actual_or_assertion=revoked_response.status_code,
+            matcher=equal_to(401)
+        )
+        assert_that(
+            actual_or_assertion=[
+                call for call in get_owner_mock.call_args_list
+                if call.kwargs.get('token_value') == token['access_token']
+            ],
+            matcher=equal_to([])
+        )
+
+    @pytest.mark.asyncio
+    async def test_full_revocation_list(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {'username': user.login, 'password': user.password}
+        signer = TokenSigner(
+            secret='secret', revocation_list=RevocationList(max_size=1)
+        )
+
+        with patch('auth_app.routers.auth.token_signer', signer), \
+                patch('auth_app.dependencies.token_signer', signer):
+            with TestClient(app) as client:
+                responses = []
+                for _ in range(2):
+                    token = client.post(url='/auth', data=request_data).json()
+                    headers = {
+                        'Authorization': f'Bearer {token["access_token"]}'
+                    }
+                    responses.append(
+                        client.post(url='/auth/logout', headers=headers)
+                    )
+                salary_response = client.get(url='/salary', headers=headers)
+
+        assert_that(
+            actual_or_assertion=[
+                response.status_code for response in responses
+            ],
+            matcher=equal_to([200, 503])
+        )
+        assert_that(
+            actual_or_assertion=salary_response.status_code,
+            matcher=equal_to(400)
+        )
+
+
+class TestRefreshRoute:
+    @pytest.mark.asyncio
+    async def test_refresh(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {
+            'username': user.login,
+            'password': user.password,
+            'scope': 'offline_access'
+        }
+
+        with TestClient(app) as client:
+            token = client.post(url='/auth', data=request_data).json()
+            with patch(
+                'auth_app.passwords.compute_digest'
+            ) as hash_mock:
+                response = client.post(
+                    url='/auth/refresh',
+                    data={'refresh_token': token['refresh_token']}
+                )
+                reused_response = client.post(
+                    url='/auth/refresh',
+                    data={'refresh_token': token['refresh_token']}
+                )
+            headers = {
+                'Authorization': f'Bearer {response.json()["access_token"]}'
+            }
+            logout_response = client.post(
+                url='/auth/logout', headers=headers
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(200)
+        )
+        assert_that(
+            actual_or_assertion=response.json()['refresh_token'],
+            matcher=is_not(equal_to(token['refresh_token']))
+        )
+        assert_that(
+            actual_or_assertion=reused_response.json(),
+            matcher=equal_to({'detail': 'Invalid refresh token'})
+        )
+        assert_that(
+            actual_or_assertion=logout_response.status_code,
+            matcher=equal_to(200)
+        )
+        hash_mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_refresh_token_without_scope(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {'username': user.login, 'password': user.password}
+
+        with TestClient(app) as client:
+            token = client.post(url='/auth', data=request_data).json()
+
+        assert_that(
+            actual_or_assertion=token,
+            matcher=is_not(has_key('refresh_token'))
+        )
+
+    @pytest.mark.asyncio
+    async def test_refresh_after_logout(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        request_data = {
+            'username': user.login,
+            'password': user.password,
+            'scope': 'offline_access'
+        }
+
+        with TestClient(app) as client:
+            token = client.post(url='/auth', data=request_data).json()
+            logout_response = client.post(
+                url='/auth/logout',
+                headers={'Authorization': f'Bearer {token["access_token"]}'},
+                data={'refresh_token': token['refresh_token']}
+            )
+            refresh_response = client.post(
+                url='/auth/refresh',
+                data={'refresh_token': token['refresh_token']}
+            )
+
+        assert_that(
+            actual_or_assertion=logout_response.status_code,
+            matcher=equal_to(200)
+        )
+        assert_that(
+            actual_or_assertion=refresh_response.status_code,
+            matcher=equal_to(401)
+        )
+
+    def test_invalid_refresh_token(self):
+        with TestClient(app) as client:
+            response = client.post(
+                url='/auth/refresh', data={'refresh_token': 'unknown'}
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(401)
+        )
@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+from hamcrest import all_of, assert_that, equal_to, has_key
+
+from auth_app.app import app
+
+
+def test_metrics():
+    with TestClient(app) as client:
+        response = client.get('/metrics')
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(200)
+        )
+        metrics = {}
+        for item in response.json()['Data']:
+            metrics.update(item)
+        assert_that(
+            actual_or_assertion=metrics,
+            matcher=all_of(has_key('token_cache'), has_key('login_throttle'))
+        )
+        assert_that(
+            actual_or_assertion=metrics['dbase_pool'],
+            matcher=all_of(has_key('size'), has_key('checked_out'))
+        )
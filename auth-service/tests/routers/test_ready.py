@@ -0,0 +1,40 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+from hamcrest import assert_that, equal_to
+
+from auth_app.app import app
+from auth_app.models import Response
+from auth_app.warmup import WarmUp
+
+
+def test_ready():
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 10
+        response = client.get('/ready')
+        while response.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            response = client.get('/ready')
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(200)
+        )
+        assert_that(
+            actual_or_assertion=response.json(),
+            matcher=equal_to(
+                Response(message='Service is ready').dict(by_alias=True)
+            )
+        )
+
+
+def test_not_ready_during_warmup():
+    with patch.object(WarmUp, 'run', new_callable=AsyncMock):
+        with TestClient(app) as client:
+            response = client.get('/ready')
+
+    assert_that(
+        actual_or_assertion=response.status_code,
+        matcher=equal_to(503)
+    )
@@ -1,16 +1,24 @@
 import ast
-from datetime import datetime, timedelta
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 from hamcrest import assert_that, equal_to
+from sqlalchemy import func, select
 
 from auth_app import models
 from auth_app.app import app
+from auth_app.cache import token_cache
+from auth_app.dbase import orm
 from auth_app.dbase.dal.salary import SalaryDAL
 from auth_app.dbase.dal.token_ import EXPIRES_SIZE, TokenDAL
 from auth_app.dbase.dal.user import UserDAL
 from auth_app.models import DATETIME_FORMAT
+from auth_app.responses import render_response
 from tests.dbase.dal.helpers import create_test_user
 
 
@@ -30,6 +38,24 @@ class TestSalaryRoute:
             matcher=equal_to({'detail': 'Not authenticated'})
         )
 
+    @pytest.mark.asyncio
+    async def test_unknown_token(self, get_dbase_session):
+        with TestClient(app) as client:
+            response = client.get(
+                url='/salary',
+                headers={'Authorization': 'Bearer unknown-token'}
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(401)
+        )
+
+        assert_that(
+            actual_or_assertion=response.json(),
+            matcher=equal_to({'detail': 'Invalid authentication credentials'})
+        )
+
     @pytest.mark.freeze_time('2023-01-01')
     @pytest.mark.asyncio
     async def test_expired_token(self, get_dbase_session, freezer):
@@ -157,3 +183,225 @@ class TestSalaryRoute:
             actual_or_assertion=response.json(),
             matcher=ast.literal_eval(expected_salary_info.json(by_alias=True))
         )
+
+    @pytest.mark.asyncio
+    async def test_cached_token(self, get_dbase_session):
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        user_id = await user_dal.get_id_by_login(login=user.login)
+
+        token_dal = TokenDAL(session=get_dbase_session)
+        await token_dal.add(user_id=user_id)
+        token = await token_dal.get_by_user_id(id_=user_id)
+
+        with patch.object(
+                TokenDAL, 'get_owner', autospec=True,
+                side_effect=TokenDAL.get_owner
+        ) as get_owner_mock:
+            with TestClient(app) as client:
+                hits = token_cache.hits
+                for _ in range(3):
+                    client.get(
+                        url='/salary',
+                        headers={'Authorization': f'Bearer {token.value}'}
+                    )
+
+        token_calls = [
+            call for call in get_owner_mock.call_args_list
+            if call.kwargs.get('token_value') == token.value
+        ]
+        assert_that(
+            actual_or_assertion=len(token_calls),
+            matcher=equal_to(1)
+        )
+        assert_that(
+            actual_or_assertion=token_cache.hits - hits,
+            matcher=equal_to(2)
+        )
+
+        await token_dal.delete(token_value=token.value)
+        with TestClient(app) as client:
+            response = client.get(
+                url='/salary',
+                headers={'Authorization': f'Bearer {token.value}'}
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(401)
+        )
+
+    @pytest.mark.asyncio
+    async def test_connection_is_released_before_response(
+            self, get_dbase_session, monkeypatch):
+        monkeypatch.setenv('WARMUP_CONNECTIONS', '0')
+        user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=user)
+        user_id = await user_dal.get_id_by_login(login=user.login)
+        salary_dal = SalaryDAL(session=get_dbase_session)
+        await salary_dal.add(
+            salary_info=models.SalaryInfo(
+                user_id=user_id,
+                name=user.name,
+                value=100,
+                target_date=date(2024, 1, 1)
+            )
+        )
+        token_dal = TokenDAL(session=get_dbase_session)
+        await token_dal.add(user_id=user_id)
+        token = await token_dal.get_by_user_id(id_=user_id)
+        checked_out = []
+
+        def check_pool(content: models.CustomBaseModel):
+            pool = app.state.connection.engine.pool
+            checked_out.append(pool.checkedout())
+            return render_response(content=content)
+
+        with patch(
+                'auth_app.routers.salary.render_response',
+                side_effect=check_pool
+        ):
+            with TestClient(app) as client:
+                client.get(
+                    url='/salary',
+                    headers={'Authorization': f'Bearer {token.value}'}
+                )
+
+        assert_that(actual_or_assertion=checked_out, matcher=equal_to([0]))
+
+
+class TestSalaryExportRoute:
+
+    @pytest.fixture
+    def admin_key(self, monkeypatch) -> str:
+        monkeypatch.setenv('ADMIN_API_KEY', 'admin-key')
+        monkeypatch.setenv('EXPORT_BATCH_SIZE', '3')
+        return 'admin-key'
+
+    def test_without_admin_key(self, admin_key: str):
+        with TestClient(app) as client:
+            response = client.get(url='/salary/export')
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(403)
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self, admin_key: str, get_dbase_session):
+        user = await get_dbase_session.get(
+            orm.User,
+            (await get_dbase_session.execute(select(orm.Salary.user_id))
+             ).scalars().first()
+        )
+        salary_dal = SalaryDAL(session=get_dbase_session)
+        salary_info = await salary_dal.get_by_user_id(id_=user.id_)
+
+        with TestClient(app) as client:
+            response = client.get(
+                url='/salary/export',
+                headers={'X-Admin-Key': admin_key}
+            )
+
+        assert_that(
+            actual_or_assertion=response.headers['content-type'],
+            matcher=equal_to('application/x-ndjson')
+        )
+        rows = {
+            item['UserID']: item
+            for item in map(json.loads, response.text.splitlines())
+        }
+        assert_that(
+            actual_or_assertion=rows[user.id_],
+            matcher=equal_to(
+                json.loads(salary_info.json(by_alias=True))
+            )
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, admin_key: str, get_dbase_session):
+        query = select(func.count()).select_from(orm.Salary)
+        count = (await get_dbase_session.execute(query)).scalar()
+
+        with TestClient(app) as client:
+            response = client.get(
+                url='/salary/export',
+                params={'format': 'csv'},
+                headers={'X-Admin-Key': admin_key}
+            )
+
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert_that(
+            actual_or_assertion=rows[0],
+            matcher=equal_to(['UserID', 'Name', 'Salary', 'TargetDate'])
+        )
+        assert_that(
+            actual_or_assertion=len(rows) - 1,
+            matcher=equal_to(count)
+        )
+
+
+class TestSalaryRaisesRoute:
+
+    @pytest.fixture
+    def admin_key(self, monkeypatch) -> str:
+        monkeypatch.setenv('ADMIN_API_KEY', 'admin-key')
+        return 'admin-key'
+
+    @pytest.mark.asyncio
+    async def test_pages(self, admin_key: str, get_dbase_session):
+        query = select(orm.Salary.target_date, orm.Salary.user_id).where(
+            orm.Salary.target_date.between(
+                date(2023, 1, 1), date(2023, 12, 31)
+            )
+        ).order_by(orm.Salary.target_date, orm.Salary.user_id)
+        expected_ids = [
+            user_id
+            for _, user_id in await get_dbase_session.execute(query)
+        ]
+
+        user_ids = []
+        cursor = None
+        with TestClient(app) as client:
+            while True:
+                params = {'from': '2023-01-01', 'to': '2023-12-31', 'limit': 3}
+                if cursor:
+                    params['cursor'] = cursor
+                response = client.get(
+                    url='/salary/raises',
+                    params=params,
+                    headers={'X-Admin-Key': admin_key}
+                )
+                page = response.json()
+                assert_that(
+                    actual_or_assertion=len(page['Items']) <= 3,
+                    matcher=equal_to(True)
+                )
+                user_ids.extend(item['UserID'] for item in page['Items'])
+                cursor = page['NextCursor']
+                if cursor is None:
+                    break
+
+        assert_that(
+            actual_or_assertion=user_ids,
+            matcher=equal_to(expected_ids)
+        )
+
+    def test_invalid_cursor(self, admin_key: str):
+        with TestClient(app) as client:
+            response = client.get(
+                url='/salary/raises',
+                params={
+                    'from': '2023-01-01',
+                    'to': '2023-12-31',
+                    'cursor': 'invalid'
+                },
+                headers={'X-Admin-Key': admin_key}
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(400)
+        )
@@ -0,0 +1,47 @@
+import logging
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from hamcrest import assert_that, greater_than, is_
+
+from auth_app.app import app
+from auth_app.dbase.dal.user import UserDAL
+from tests.dbase.dal.helpers import create_test_user
+
+
+def get_durations(message: str) -> dict:
+    return {
+        name[:-len('_ms')]: float(value)
+        for name, value in (
+            item.split('=') for item in message.split(' ') if '_ms=' in item
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_auth_timing(get_dbase_session, caplog):
+    user = create_test_user()
+    user_dal = UserDAL(session=get_dbase_session)
+    await user_dal.add(user=user)
+    request_data = {'username': user.login, 'password': user.password}
+
+    with TestClient(app) as client:
+        caplog.set_level(logging.INFO, logger='auth_app.timing')
+        with patch('auth_app.timing.random.random', return_value=0.0):
+            response = client.post(url='/auth', data=request_data)
+
+    message = next(
+        message for message in caplog.messages
+        if message.startswith('Request timing: method=POST path=/auth/ ')
+    )
+    durations = get_durations(message=message)
+    assert_that(
+        actual_or_assertion='Server-Timing' in response.headers,
+        matcher=is_(False)
+    )
+    for phase in ('db', 'hash', 'serialize', 'total'):
+        assert_that(
+            actual_or_assertion=durations[phase],
+            matcher=greater_than(0)
+        )
@@ -1,4 +1,6 @@
 import ast
+import json
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -6,7 +8,10 @@ from hamcrest import assert_that, equal_to
 
 from auth_app import models
 from auth_app.app import app
+from auth_app.bulk import MAX_LINE_SIZE
+from auth_app.dbase.dal.salary import SalaryDAL
 from auth_app.dbase.dal.user import UserDAL
+from auth_app.hashing import HashingPoolOverloadedError, hashing_pool
 from auth_app.models import DATE_FORMAT
 from tests.dbase.dal.helpers import create_test_user
 
@@ -81,3 +86,238 @@ class TestUserRoute:
                 message='User and salary info is was added.'
             ).dict(by_alias=True))
         )
+
+    @pytest.mark.asyncio
+    async def test_add_with_overloaded_hashing_pool(self, get_dbase_session):
+        user = create_test_user()
+        request_data = {
+            'user': user.dict(by_alias=True),
+            'salary': ast.literal_eval(
+                create_user_salary().json(by_alias=True)
+            )
+        }
+
+        with patch.object(
+                hashing_pool, 'run',
+                side_effect=HashingPoolOverloadedError('overloaded')
+        ):
+            with TestClient(app) as client:
+                response = client.post(url='/user/add', json=request_data)
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(503)
+        )
+        assert_that(
+            actual_or_assertion=response.headers['Retry-After'],
+            matcher=equal_to('1')
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_with_invalid_salary(self, get_dbase_session):
+        user = create_test_user()
+        request_data = {
+            'user': user.dict(by_alias=True),
+            'salary': {'Value': 2 ** 40, 'TargetDate': '2024-01-01'}
+        }
+
+        with TestClient(app) as client:
+            response = client.post(url='/user/add', json=request_data)
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(400)
+        )
+        user_dal = UserDAL(session=get_dbase_session)
+        assert_that(
+            actual_or_assertion=await user_dal.is_exist(login=user.login),
+            matcher=equal_to(False)
+        )
+
+
+class TestBulkUserRoute:
+
+    @pytest.fixture
+    def admin_key(self, monkeypatch) -> str:
+        monkeypatch.setenv('ADMIN_API_KEY', 'admin-key')
+        return 'admin-key'
+
+    def test_disabled_without_admin_key(self, monkeypatch):
+        monkeypatch.delenv('ADMIN_API_KEY', raising=False)
+        with TestClient(app) as client:
+            response = client.post(url='/user/bulk', content=b'')
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(403)
+        )
+
+    def test_invalid_admin_key(self, admin_key: str):
+        with TestClient(app) as client:
+            response = client.post(
+                url='/user/bulk',
+                content=b'',
+                headers={'X-Admin-Key': 'wrong'}
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(403)
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_ndjson(self, admin_key: str, get_dbase_session):
+        existing_user = create_test_user()
+        user_dal = UserDAL(session=get_dbase_session)
+        await user_dal.add(user=existing_user)
+
+        users = [create_test_user() for _ in range(3)]
+        lines = [
+            json.dumps({
+                'user': user.dict(by_alias=True),
+                'salary': {'Value': 100, 'TargetDate': '2024-01-01'}
+            })
+            for user in users + [existing_user, users[0]]
+        ]
+        lines.insert(1, '{"user": {}}')
+
+        with TestClient(app) as client:
+            response = client.post(
+                url='/user/bulk',
+                content='\n'.join(lines).encode(),
+                headers={
+                    'X-Admin-Key': admin_key,
+                    'Content-Type': 'application/x-ndjson'
+                }
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(200)
+        )
+        result = response.json()
+        assert_that(
+            actual_or_assertion=result['Message'],
+            matcher=equal_to('3 of 6 users are added.')
+        )
+        assert_that(
+            actual_or_assertion=[
+                (item['Row'], item['Status']) for item in result['Data']
+            ],
+            matcher=equal_to(
+                [(2, 'invalid'), (5, 'duplicate'), (6, 'duplicate')]
+            )
+        )
+        for user in users:
+            is_valid = await user_dal.is_valid_login_password_pair(
+                user=models.UserAuth(login=user.login, password=user.password)
+            )
+            assert_that(actual_or_assertion=is_valid, matcher=equal_to(True))
+
+    @pytest.mark.asyncio
+    async def test_add_csv(self, admin_key: str, get_dbase_session):
+        user = create_test_user()
+        content = (
+            'Name,Login,Password,Value,TargetDate\n'
+            f'{user.name},{user.login},{user.password},100,2024-01-01\n'
+        )
+
+        with TestClient(app) as client:
+            response = client.post(
+                url='/user/bulk',
+                content=content.encode(),
+                headers={'X-Admin-Key': admin_key, 'Content-Type': 'text/csv'}
+            )
+
+        assert_that(
+            actual_or_assertion=response.json()['Message'],
+            matcher=equal_to('1 of 1 users are added.')
+        )
+        salary_dal = SalaryDAL(session=get_dbase_session)
+        user_dal = UserDAL(session=get_dbase_session)
+        user_id = await user_dal.get_id_by_login(login=user.login)
+        salary_info = await salary_dal.get_by_user_id(id_=user_id)
+        assert_that(
+            actual_or_assertion=salary_info.value,
+            matcher=equal_to(100)
+        )
+
+    def test_invalid_csv_header(self, admin_key: str):
+        with TestClient(app) as client:
+            response = client.post(
+                url='/user/bulk',
+                content=b'Login,Password\n',
+                headers={'X-Admin-Key': admin_key, 'Content-Type': 'text/csv'}
+            )
+
+        assert_that(
+            actual_or_assertion=response.status_code,
+            matcher=equal_to(400)
+        )
+
+    def test_invalid_bytes_and_long_line(self, admin_key: str):
+        user = create_test_user()
+        line = json.dumps({
+            'user': user.dict(by_alias=True),
+            'salary': {'Value': 100, 'TargetDate': '2024-01-01'}
+        }).encode()
+        content = b'\n'.join(
+            [b'{"user": "\xff"}', b'x' * (MAX_LINE_SIZE * 2), line]
+        )
+
+        with TestClient(app) as client:
+            response = client.post(
+                url='/user/bulk',
+                content=content,
+                headers={
+                    'X-Admin-Key': admin_key,
+                    'Content-Type': 'application/x-ndjson'
+                }
+            )
+
+        result = response.json()
+        assert_that(
+            actual_or_assertion=result['Message'],
+            matcher=equal_to('1 of 3 users are added.')
+        )
+        assert_that(
+            actual_or_assertion=[
+                (item['Row'], item['Status']) for item in result['Data']
+            ],
+            matcher=equal_to([(1, 'invalid'), (2, 'invalid')])
+        )
+
+    def test_many_failed_rows(self, admin_key: str):
+        user = create_test_user()
+        line = json.dumps({
+            'user': user.dict(by_alias=True),
+            'salary': {'Value': 100, 'TargetDate': '2024-01-01'}
+        }).encode()
+        content = b'\n'.join([line] * 500 + [b'{"user": {}}'] * 500)
+
+        with patch('auth_app.routers.user.BULK_MAX_ERRORS', 10), \
+                patch('auth_app.routers.user.BULK_CHUNK_SIZE', 100):
+            with TestClient(app) as client:
+                response = client.post(
+                    url='/user/bulk',
+                    content=content,
+                    headers={
+                        'X-Admin-Key': admin_key,
+                        'Content-Type': 'application/x-ndjson'
+                    }
+                )
+
+        result = response.json()
+        assert_that(
+            actual_or_assertion=result['Message'],
+            matcher=equal_to(
+                '1 of 1000 users are added. 999 rows are not added, '
+                'first 10 of them are listed.'
+            )
+        )
+        assert_that(
+            actual_or_assertion=[
+                (item['Row'], item['Status']) for item in result['Data']
+            ],
+            matcher=equal_to([(row, 'duplicate') for row in range(2, 12)])
+        )
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from auth_app.bulk import (CSV_COLUMNS, BulkErrorList, BulkRowError,
+                           decode_line, iter_lines, parse_csv_line,
+                           parse_ndjson_line)
+
+
+async def generate_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_lines():
+    stream = generate_chunks(b'first\nsec', b'ond\n\n', b'third')
+    lines = [line async for line in iter_lines(stream)]
+
+    assert_that(
+        actual_or_assertion=lines,
+        matcher=equal_to([b'first', b'second', b'third'])
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_cuts_long_line():
+    stream = generate_chunks(b'first\nlong', b'-long-', b'long\nlast')
+    lines = [line async for line in iter_lines(stream, max_line_size=6)]
+
+    assert_that(
+        actual_or_assertion=lines,
+        matcher=equal_to([b'first', b'long-lo', b'last'])
+    )
+
+
+@pytest.mark.parametrize(
+    'line, error',
+    [
+        (b'\xff\xfe', "'utf-8' codec can't decode"),
+        (b'x' * 7, 'Line is longer than 6 bytes'),
+    ]
+)
+def test_decode_line_error(line: bytes, error: str):
+    with pytest.raises(ValueError, match=error):
+        decode_line(line=line, max_line_size=6)
+
+
+def test_parse_ndjson_line():
+    line = json.dumps({
+        'user': {'Name': 'Name', 'Login': 'login', 'Password': 'pass'},
+        'salary': {'Value': 100, 'TargetDate': '2024-01-01'}
+    })
+    record = parse_ndjson_line(row=3, line=line)
+
+    assert_that(actual_or_assertion=record.row, matcher=equal_to(3))
+    assert_that(
+        actual_or_assertion=record.user.login,
+        matcher=equal_to('login')
+    )
+    assert_that(actual_or_assertion=record.salary.value, matcher=equal_to(100))
+
+
+@pytest.mark.parametrize(
+    'line',
+    [
+        'not json',
+        '[1, 2]',
+        '{"user": {"Name": "Name"}}',
+        json.dumps({
+            'user': {'Name': 'Name', 'Login': 'login', 'Password': 'pass'},
+            'salary': {'Value': 2 ** 40, 'TargetDate': '2024-01-01'}
+        }),
+    ]
+)
+def test_parse_invalid_ndjson_line(line: str):
+    with pytest.raises(ValueError):
+        parse_ndjson_line(row=1, line=line)
+
+
+def test_parse_csv_line():
+    record = parse_csv_line(
+        row=1,
+        line='"Name, Jr",login,pass,100,2024-01-01',
+        header=list(CSV_COLUMNS)
+    )
+
+    assert_that(
+        actual_or_assertion=record.user.name,
+        matcher=equal_to('Name, Jr')
+    )
+    assert_that(actual_or_assertion=record.salary.value, matcher=equal_to(100))
+
+
+def test_parse_invalid_csv_line():
+    with pytest.raises(ValueError):
+        parse_csv_line(row=1, line='Name,login', header=list(CSV_COLUMNS))
+
+
+def test_row_error_to_dict():
+    error = BulkRowError(
+        row=1, login='login', status='duplicate', detail='Login is exist'
+    )
+
+    assert_that(
+        actual_or_assertion=error.to_dict(),
+        matcher=equal_to({
+            'Row': 1,
+            'Login': 'login',
+            'Status': 'duplicate',
+            'Detail': 'Login is exist',
+        })
+    )
+
+
+def test_error_list_keeps_lowest_rows():
+    errors = BulkErrorList(max_size=2)
+    for row in (4, 1, 5, 3):
+        errors.append(
+            BulkRowError(row=row, login=None, status='invalid', detail='')
+        )
+
+    assert_that(
+        actual_or_assertion=[error.row for error in errors.to_list()],
+        matcher=equal_to([1, 3])
+    )
+    assert_that(actual_or_assertion=errors.count, matcher=equal_to(4))
+    assert_that(
+        actual_or_assertion=errors.is_truncated,
+        matcher=equal_to(True)
+    )
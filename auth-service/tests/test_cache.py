@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from hamcrest import assert_that, equal_to, is_, is_not
+
+from auth_app import models
+from auth_app.cache import TokenCache
+
+
+def create_active_user() -> models.ActiveUser:
+    return models.ActiveUser(id_=1, name='test-user')
+
+
+class TestTokenCache:
+    def test_get_missing(self):
+        cache = TokenCache()
+        assert_that(
+            actual_or_assertion=cache.get(token_value=uuid4().hex),
+            matcher=is_(None)
+        )
+        assert_that(actual_or_assertion=cache.misses, matcher=equal_to(1))
+        assert_that(actual_or_assertion=cache.hits, matcher=equal_to(0))
+
+    def test_get_cached(self):
+        cache = TokenCache()
+        token_value = str(uuid4())
+        user = create_active_user()
+        cache.put(
+            token_value=token_value,
+            user=user,
+            expires=datetime.now() + timedelta(minutes=1)
+        )
+
+        assert_that(
+            actual_or_assertion=cache.get(token_value=token_value.upper()),
+            matcher=equal_to(user)
+        )
+        assert_that(actual_or_assertion=cache.hits, matcher=equal_to(1))
+
+    @pytest.mark.freeze_time('2023-01-01')
+    def test_get_expired(self, freezer):
+        cache = TokenCache()
+        token_value = str(uuid4())
+        cache.put(
+            token_value=token_value,
+            user=create_active_user(),
+            expires=datetime.now() + timedelta(minutes=1)
+        )
+        freezer.move_to('2023-01-01 00:01:00')
+
+        assert_that(
+            actual_or_assertion=cache.get(token_value=token_value),
+            matcher=is_(None)
+        )
+        assert_that(actual_or_assertion=cache.size, matcher=equal_to(0))
+
+    @pytest.mark.freeze_time('2023-01-01')
+    def test_ttl_is_shorter_than_token_life(self, freezer):
+        cache = TokenCache(ttl=10)
+        token_value = str(uuid4())
+        cache.put(
+            token_value=token_value,
+            user=create_active_user(),
+            expires=datetime.now() + timedelta(minutes=5)
+        )
+        freezer.move_to('2023-01-01 00:00:09')
+        user = cache.get(token_value=token_value)
+        freezer.move_to('2023-01-01 00:00:10')
+
+        assert_that(actual_or_assertion=user, matcher=is_not(None))
+        assert_that(
+            actual_or_assertion=cache.get(token_value=token_value),
+            matcher=is_(None)
+        )
+
+    def test_lru_eviction(self):
+        cache = TokenCache(max_size=2)
+        expires = datetime.now() + timedelta(minutes=1)
+        token_values = [str(uuid4()) for _ in range(3)]
+        cache.put(token_values[0], create_active_user(), expires)
+        cache.put(token_values[1], create_active_user(), expires)
+        cache.get(token_values[0])
+        cache.put(token_values[2], create_active_user(), expires)
+
+        assert_that(actual_or_assertion=cache.size, matcher=equal_to(2))
+        assert_that(
+            actual_or_assertion=cache.get(token_values[1]),
+            matcher=is_(None)
+        )
+
+    def test_disabled(self):
+        cache = TokenCache(max_size=0)
+        cache.put(
+            str(uuid4()),
+            create_active_user(),
+            datetime.now() + timedelta(minutes=1)
+        )
+        assert_that(actual_or_assertion=cache.size, matcher=equal_to(0))
+
+    def test_invalidate(self):
+        cache = TokenCache()
+        token_value = str(uuid4())
+        cache.put(
+            token_value,
+            create_active_user(),
+            datetime.now() + timedelta(minutes=1)
+        )
+        cache.invalidate(token_value=token_value)
+        assert_that(
+            actual_or_assertion=cache.get(token_value=token_value),
+            matcher=is_(None)
+        )
+
+    def test_not_uuid_value(self):
+        cache = TokenCache()
+        cache.put(
+            'not-uuid',
+            create_active_user(),
+            datetime.now() + timedelta(minutes=1)
+        )
+        assert_that(actual_or_assertion=cache.size, matcher=equal_to(0))
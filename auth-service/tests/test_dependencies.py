@@ -0,0 +1,38 @@
+import pytest
+from hamcrest import assert_that, equal_to
+
+from auth_app.cache import token_cache
+from auth_app.dbase.dal.token_ import TokenDAL
+from auth_app.dbase.dal.user import UserDAL
+from auth_app.dbase.identity import IdentityMap
+from auth_app.dependencies import get_active_user
+from tests.dbase.dal.helpers import create_test_user
+
+
+@pytest.mark.asyncio
+async def test_active_user_releases_connection(dbase_connection,
+                                               get_dbase_session):
+    user = create_test_user()
+    user_dal = UserDAL(session=get_dbase_session)
+    await user_dal.add(user=user)
+    user_id = await user_dal.get_id_by_login(login=user.login)
+    token_dal = TokenDAL(session=get_dbase_session)
+    await token_dal.add(user_id=user_id)
+    token = await token_dal.get_by_user_id(id_=user_id)
+    token_cache.invalidate(token_value=token.value)
+
+    async with dbase_connection.async_session as session:
+        active_user = await get_active_user(
+            token_value=token.value,
+            session=session,
+            identity_map=IdentityMap()
+        )
+
+        assert_that(
+            actual_or_assertion=active_user.id_,
+            matcher=equal_to(user_id)
+        )
+        assert_that(
+            actual_or_assertion=session.in_transaction(),
+            matcher=equal_to(False)
+        )
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from auth_app.dbase.dal.user import get_hashed_password
+from auth_app.hashing import HashingPool, HashingPoolOverloadedError
+
+
+class TestHashingPool:
+    def test_invalid_kind(self):
+        with pytest.raises(ValueError):
+            HashingPool(kind='fiber')
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('kind', ['thread', 'process'])
+    async def test_run(self, kind: str):
+        pool = HashingPool(kind=kind, workers=2)
+        try:
+            result = await pool.run(get_hashed_password, 'pass', 'salt')
+        finally:
+            pool.shutdown()
+
+        assert_that(
+            actual_or_assertion=result,
+            matcher=equal_to(get_hashed_password('pass', 'salt'))
+        )
+        assert_that(
+            actual_or_assertion=pool.stats['completed'],
+            matcher=equal_to(1)
+        )
+        assert_that(actual_or_assertion=pool.in_flight, matcher=equal_to(0))
+
+    @pytest.mark.asyncio
+    async def test_failed_task(self):
+        pool = HashingPool(workers=1)
+        try:
+            with pytest.raises(ValueError):
+                await pool.run(int, 'not-number')
+        finally:
+            pool.shutdown()
+
+        assert_that(
+            actual_or_assertion=(
+                pool.stats['completed'], pool.stats['failed']
+            ),
+            matcher=equal_to((0, 1))
+        )
+        assert_that(actual_or_assertion=pool.in_flight, matcher=equal_to(0))
+
+    @pytest.mark.asyncio
+    async def test_overloaded(self):
+        pool = HashingPool(workers=1, queue_size=1)
+        release_event = threading.Event()
+        try:
+            tasks = [
+                asyncio.ensure_future(pool.run(release_event.wait))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+            assert_that(
+                actual_or_assertion=pool.queue_depth,
+                matcher=equal_to(1)
+            )
+
+            with pytest.raises(HashingPoolOverloadedError):
+                await pool.run(release_event.wait)
+
+            release_event.set()
+            await asyncio.gather(*tasks)
+        finally:
+            release_event.set()
+            pool.shutdown()
+
+        assert_that(
+            actual_or_assertion=pool.stats['rejected'],
+            matcher=equal_to(1)
+        )
+        assert_that(
+            actual_or_assertion=pool.stats['peak_in_flight'],
+            matcher=equal_to(2)
+        )
+
+    @pytest.mark.asyncio
+    async def test_shutdown(self):
+        pool = HashingPool(workers=1)
+        first_executor = pool.get_executor()
+        pool.shutdown()
+        assert_that(
+            actual_or_assertion=pool.get_executor() is first_executor,
+            matcher=equal_to(False)
+        )
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_many_waits_for_free_place(self):
+        pool = HashingPool(workers=1, queue_size=0)
+        try:
+            results = await pool.run_many(
+                get_hashed_password, [('pass', str(x)) for x in range(3)]
+            )
+        finally:
+            pool.shutdown()
+
+        assert_that(
+            actual_or_assertion=results,
+            matcher=equal_to(
+                [get_hashed_password('pass', str(x)) for x in range(3)]
+            )
+        )
+        assert_that(
+            actual_or_assertion=pool.stats['rejected'],
+            matcher=equal_to(0)
+        )
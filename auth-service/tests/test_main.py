@@ -0,0 +1,105 @@
+import pytest
+from hamcrest import assert_that, equal_to, has_entries, has_key, is_not
+from main import get_log_config, get_uvicorn_options, parse_args
+from uvicorn.config import LOGGING_CONFIG
+
+
+def test_dev_options(monkeypatch):
+    monkeypatch.delenv('APP_FORWARDED_ALLOW_IPS', raising=False)
+    options = get_uvicorn_options(mode='dev', host='127.0.0.1', port=8000)
+
+    assert_that(
+        actual_or_assertion=options,
+        matcher=equal_to({
+            'host': '127.0.0.1',
+            'port': 8000,
+            'reload': True,
+            'log_config': get_log_config(),
+            'proxy_headers': True,
+            'forwarded_allow_ips': '127.0.0.1'
+        })
+    )
+
+
+def test_forwarded_allow_ips(monkeypatch):
+    monkeypatch.setenv('APP_FORWARDED_ALLOW_IPS', '172.18.0.2')
+    options = get_uvicorn_options(mode='prod', host='0.0.0.0', port=8133)
+
+    assert_that(
+        actual_or_assertion=options['forwarded_allow_ips'],
+        matcher=equal_to('172.18.0.2')
+    )
+
+
+@pytest.mark.parametrize(
+    'env_level, expected', [(None, 'INFO'), ('debug', 'DEBUG')]
+)
+def test_log_config(monkeypatch, env_level, expected):
+    if env_level:
+        monkeypatch.setenv('APP_LOG_LEVEL', env_level)
+    else:
+        monkeypatch.delenv('APP_LOG_LEVEL', raising=False)
+    log_config = get_log_config()
+
+    assert_that(
+        actual_or_assertion=log_config['loggers']['auth_app'],
+        matcher=has_entries(handlers=['default'], level=expected)
+    )
+    assert_that(
+        actual_or_assertion=LOGGING_CONFIG['loggers'],
+        matcher=is_not(has_key('auth_app'))
+    )
+
+
+def test_prod_options(monkeypatch):
+    monkeypatch.setenv('APP_WORKERS', '3')
+    monkeypatch.setenv('APP_LIMIT_CONCURRENCY', '0')
+    options = get_uvicorn_options(mode='prod', host='0.0.0.0', port=8133)
+
+    assert_that(
+        actual_or_assertion=options,
+        matcher=has_entries(
+            reload=False,
+            workers=3,
+            backlog=2048,
+            timeout_keep_alive=5,
+            limit_concurrency=None,
+            access_log=False
+        )
+    )
+
+
+def test_prod_workers_argument(monkeypatch):
+    monkeypatch.setenv('APP_WORKERS', '3')
+    options = get_uvicorn_options(
+        mode='prod', host='0.0.0.0', port=8133, workers=2
+    )
+
+    assert_that(actual_or_assertion=options['workers'], matcher=equal_to(2))
+
+
+@pytest.mark.parametrize(
+    'env_mode, args, expected',
+    [
+        (None, [], 'dev'),
+        ('prod', [], 'prod'),
+        ('prod', ['--mode', 'dev'], 'dev'),
+    ]
+)
+def test_parse_mode(monkeypatch, env_mode, args, expected):
+    if env_mode:
+        monkeypatch.setenv('APP_RUN_MODE', env_mode)
+    else:
+        monkeypatch.delenv('APP_RUN_MODE', raising=False)
+
+    assert_that(
+        actual_or_assertion=parse_args(args=args).mode,
+        matcher=equal_to(expected)
+    )
+
+
+def test_parse_port():
+    assert_that(
+        actual_or_assertion=parse_args(args=['-p', '8133']).port,
+        matcher=equal_to(8133)
+    )
@@ -0,0 +1,21 @@
+from datetime import date
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from auth_app.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(target_date=date(2023, 5, 17), user_id=42)
+
+    assert_that(
+        actual_or_assertion=decode_cursor(cursor=cursor),
+        matcher=equal_to((date(2023, 5, 17), 42))
+    )
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-cursor', '@@@', 'MjAyMw'])
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor=cursor)
@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+import pytest
+from hamcrest import (assert_that, equal_to, greater_than_or_equal_to, is_,
+                      starts_with)
+
+from auth_app.dbase.dal.user import HASH_SALT_DELIMITER, get_hashed_password
+from auth_app.passwords import (PBKDF2_SHA256, SCRYPT, PasswordHasher,
+                                calibrate, create_password_hasher, parse_hash)
+
+SCRYPT_PARAMS = {'n': 2 ** 10, 'r': 8, 'p': 1}
+
+
+class TestPasswordHasher:
+    @pytest.mark.parametrize(
+        'algorithm, params, prefix',
+        [
+            (PBKDF2_SHA256, {'i': 1000}, '$pbkdf2-sha256$i=1000$'),
+            (SCRYPT, SCRYPT_PARAMS, '$scrypt$n=1024,r=8,p=1$'),
+        ]
+    )
+    def test_hash_and_verify(self, algorithm: str, params: dict,
+                             prefix: str):
+        hasher = PasswordHasher(algorithm=algorithm, params=params)
+        hashed_password = hasher.hash(password='password')
+
+        assert_that(
+            actual_or_assertion=hashed_password,
+            matcher=starts_with(prefix)
+        )
+        assert_that(
+            actual_or_assertion=len(hashed_password) <= 255,
+            matcher=is_(True)
+        )
+        check = hasher.verify(
+            password='password', hashed_password=hashed_password
+        )
+        assert_that(actual_or_assertion=check.is_valid, matcher=is_(True))
+        assert_that(actual_or_assertion=check.new_hash, matcher=is_(None))
+        assert_that(
+            actual_or_assertion=hasher.verify(
+                password='wrong', hashed_password=hashed_password
+            ).is_valid,
+            matcher=is_(False)
+        )
+
+    def test_legacy_hash_is_rehashed(self):
+        hasher = PasswordHasher(algorithm=PBKDF2_SHA256, params={'i': 1000})
+        legacy_hash = HASH_SALT_DELIMITER.join(
+            (get_hashed_password(password='password', salt='salt'), 'salt')
+        )
+
+        check = hasher.verify(
+            password='password', hashed_password=legacy_hash
+        )
+
+        assert_that(actual_or_assertion=check.is_valid, matcher=is_(True))
+        assert_that(
+            actual_or_assertion=parse_hash(value=check.new_hash).params,
+            matcher=equal_to({'i': 1000})
+        )
+        assert_that(
+            actual_or_assertion=hasher.verify(
+                password='wrong', hashed_password=legacy_hash
+            ),
+            matcher=equal_to((False, None))
+        )
+
+    def test_changed_params_are_rehashed(self):
+        old_hasher = PasswordHasher(algorithm=PBKDF2_SHA256)
+        hasher = PasswordHasher(algorithm=SCRYPT, params=SCRYPT_PARAMS)
+
+        check = hasher.verify(
+            password='password',
+            hashed_password=old_hasher.hash(password='password')
+        )
+
+        assert_that(actual_or_assertion=check.is_valid, matcher=is_(True))
+        assert_that(
+            actual_or_assertion=check.new_hash,
+            matcher=starts_with('$scrypt$')
+        )
+
+    @pytest.mark.parametrize(
+        'hashed_password',
+        [
+            '',
+            'not-hex^salt',
+            '$md5$i=1$c2FsdA$ZGlnZXN0',
+            '$pbkdf2-sha256$n=1$c2FsdA$ZGlnZXN0',
+            '$pbkdf2-sha256$i=1000$c2FsdA',
+        ]
+    )
+    def test_invalid_hash(self, hashed_password: str):
+        hasher = PasswordHasher()
+        assert_that(
+            actual_or_assertion=hasher.verify(
+                password='password', hashed_password=hashed_password
+            ).is_valid,
+            matcher=is_(False)
+        )
+
+
+def test_create_password_hasher(monkeypatch):
+    monkeypatch.setenv('PASSWORD_HASH_ALGORITHM', SCRYPT)
+    monkeypatch.setenv('PASSWORD_SCRYPT_N', '2048')
+    hasher = create_password_hasher()
+
+    assert_that(actual_or_assertion=hasher.algorithm, matcher=equal_to(SCRYPT))
+    assert_that(
+        actual_or_assertion=hasher.params,
+        matcher=equal_to({'n': 2048, 'r': 8, 'p': 1})
+    )
+
+
+def test_calibrate_pbkdf2():
+    with patch('auth_app.passwords.measure', return_value=0.01):
+        params = calibrate(algorithm=PBKDF2_SHA256, target_time=0.1)
+    assert_that(actual_or_assertion=params, matcher=equal_to({'i': 100000}))
+
+
+def test_calibrate_scrypt():
+    def measure(algorithm: str, params: dict) -> float:
+        return params['n'] / 2 ** 14 * 0.05
+
+    with patch('auth_app.passwords.measure', side_effect=measure):
+        params = calibrate(algorithm=SCRYPT, target_time=0.1)
+    assert_that(
+        actual_or_assertion=params,
+        matcher=equal_to({'n': 2 ** 15, 'r': 8, 'p': 1})
+    )
+    assert_that(
+        actual_or_assertion=params['n'],
+        matcher=greater_than_or_equal_to(2 ** 10)
+    )
@@ -0,0 +1,67 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from hamcrest import assert_that, equal_to
+
+from auth_app import models
+from auth_app.responses import FastJSONResponse, dump_json
+
+MODELS = [
+    models.Token(
+        value='0b5bb1a5-3f4d-4bd5-a1ec-2f8e2fd2a7c1',
+        expires=datetime(2023, 1, 2, 3, 4, 5, 678)
+    ),
+    models.SalaryInfo(
+        user_id=1,
+        name='Михаил "Mikko"',
+        value=180000,
+        target_date=date(2023, 9, 1)
+    ),
+    models.SalaryRaisePage(
+        items=[
+            models.SalaryInfo(
+                user_id=1, name='A', value=1, target_date=date(2023, 9, 1)
+            )
+        ],
+        next_cursor='MjAyMy0wOS0wMXwx'
+    ),
+    models.SalaryRaisePage(),
+    models.Response(
+        message='All good.',
+        data=[{'cache': {'hits': 1, 'latency_ms': 0.25, 'kind': None}}]
+    ),
+    models.ActiveUser(id_=1, name='Name'),
+]
+
+
+@pytest.mark.parametrize('model', MODELS)
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_same_bytes_as_default_response(model, use_orjson: bool):
+    expected = JSONResponse(
+        content=jsonable_encoder(model, by_alias=True)
+    ).body
+
+    assert_that(
+        actual_or_assertion=dump_json(content=model, use_orjson=use_orjson),
+        matcher=equal_to(expected)
+    )
+
+
+def test_fast_json_response():
+    response = FastJSONResponse(content=MODELS[0])
+
+    assert_that(
+        actual_or_assertion=response.headers['content-type'],
+        matcher=equal_to('application/json')
+    )
+    assert_that(
+        actual_or_assertion=response.body,
+        matcher=equal_to(dump_json(content=MODELS[0]))
+    )
+
+
+def test_unknown_type():
+    with pytest.raises(TypeError):
+        dump_json(content={'value': object()}, use_orjson=False)
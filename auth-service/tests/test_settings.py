@@ -0,0 +1,33 @@
+import pytest
+from hamcrest import assert_that, equal_to, is_
+
+from auth_app.settings import get_bool_env, get_int_env
+
+
+@pytest.mark.parametrize(
+    'value, expected', [(None, 7), ('', 7), ('12', 12)]
+)
+def test_get_int_env(monkeypatch, value, expected: int):
+    if value is None:
+        monkeypatch.delenv('TEST_INT_VALUE', raising=False)
+    else:
+        monkeypatch.setenv('TEST_INT_VALUE', value)
+    assert_that(
+        actual_or_assertion=get_int_env('TEST_INT_VALUE', 7),
+        matcher=equal_to(expected)
+    )
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [(None, True), ('1', True), ('true', True), ('no', False), ('0', False)]
+)
+def test_get_bool_env(monkeypatch, value, expected: bool):
+    if value is None:
+        monkeypatch.delenv('TEST_BOOL_VALUE', raising=False)
+    else:
+        monkeypatch.setenv('TEST_BOOL_VALUE', value)
+    assert_that(
+        actual_or_assertion=get_bool_env('TEST_BOOL_VALUE', True),
+        matcher=is_(expected)
+    )
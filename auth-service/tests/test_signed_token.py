@@ -0,0 +1,174 @@
+from datetime import datetime
+
+import pytest
+from hamcrest import assert_that, contains_string, equal_to, is_
+
+from auth_app import models
+from auth_app.dbase.dal.token_ import EXPIRES_SIZE, TokenStatus
+from auth_app.signed_token import (RevocationList, RevocationListFullError,
+                                   TokenSigner, create_token_signer,
+                                   is_signed_token)
+
+USER = models.ActiveUser(id_=7, name='Михаил')
+
+
+class TestTokenSigner:
+    def test_verify_issued_token(self):
+        signer = TokenSigner(secret='secret')
+        token = signer.issue(user=USER)
+        owner = signer.verify(token_value=token.value)
+
+        assert_that(
+            actual_or_assertion=is_signed_token(token_value=token.value),
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.VALID)
+        )
+        assert_that(actual_or_assertion=owner.user, matcher=equal_to(USER))
+        assert_that(
+            actual_or_assertion=owner.expires,
+            matcher=equal_to(token.expires)
+        )
+
+    @pytest.mark.parametrize(
+        'token_value',
+        ['', 'no-signature', 'a.b', 'not base64!.c2ln']
+    )
+    def test_invalid_token(self, token_value: str):
+        owner = TokenSigner(secret='secret').verify(token_value=token_value)
+
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.NOT_FOUND)
+        )
+
+    def test_other_secret(self):
+        token = TokenSigner(secret='secret').issue(user=USER)
+        owner = TokenSigner(secret='other').verify(token_value=token.value)
+
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.NOT_FOUND)
+        )
+
+    def test_changed_payload(self):
+        signer = TokenSigner(secret='secret')
+        token = signer.issue(user=USER)
+        other_token = signer.issue(
+            user=models.ActiveUser(id_=8, name='Other')
+        )
+        payload = other_token.value.split('.')[0]
+        signature = token.value.split('.')[1]
+        owner = signer.verify(token_value=f'{payload}.{signature}')
+
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.NOT_FOUND)
+        )
+
+    @pytest.mark.freeze_time('2023-01-01')
+    def test_expired_token(self, freezer):
+        signer = TokenSigner(secret='secret')
+        token = signer.issue(user=USER)
+        freezer.move_to(datetime(2023, 1, 1) + EXPIRES_SIZE)
+        owner = signer.verify(token_value=token.value)
+
+        assert_that(
+            actual_or_assertion=owner.status,
+            matcher=equal_to(TokenStatus.EXPIRED)
+        )
+
+    def test_revoke(self):
+        signer = TokenSigner(secret='secret')
+        token = signer.issue(user=USER)
+
+        assert_that(
+            actual_or_assertion=signer.revoke(token_value=token.value),
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=signer.verify(token_value=token.value).status,
+            matcher=equal_to(TokenStatus.NOT_FOUND)
+        )
+        assert_that(
+            actual_or_assertion=signer.revoke(token_value='a.b'),
+            matcher=equal_to(False)
+        )
+
+    def test_disabled(self):
+        signer = TokenSigner(secret=None)
+
+        assert_that(actual_or_assertion=signer.is_enabled, matcher=is_(False))
+        assert_that(
+            actual_or_assertion=signer.verify(token_value='a.b').status,
+            matcher=equal_to(TokenStatus.NOT_FOUND)
+        )
+
+
+class TestRevocationList:
+    def test_full_list_keeps_live_tokens(self, caplog):
+        revocation_list = RevocationList(max_size=2)
+        exp = datetime.now().timestamp() + 60
+        revocation_list.add(token_id='a', exp=exp)
+        revocation_list.add(token_id='b', exp=exp)
+
+        with pytest.raises(RevocationListFullError):
+            revocation_list.add(token_id='c', exp=exp)
+
+        assert_that(
+            actual_or_assertion=revocation_list.size,
+            matcher=equal_to(2)
+        )
+        assert_that(
+            actual_or_assertion=revocation_list.contains('a'),
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=revocation_list.contains('c'),
+            matcher=equal_to(False)
+        )
+        assert_that(
+            actual_or_assertion=caplog.text,
+            matcher=contains_string('Revocation list is full')
+        )
+
+    def test_expired_tokens_are_purged(self):
+        revocation_list = RevocationList(max_size=2)
+        now = datetime.now().timestamp()
+        revocation_list.add(token_id='a', exp=now - 1)
+        revocation_list.add(token_id='b', exp=now + 60)
+        revocation_list.add(token_id='c', exp=now + 60)
+
+        assert_that(
+            actual_or_assertion=revocation_list.contains('b'),
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=revocation_list.contains('c'),
+            matcher=equal_to(True)
+        )
+
+
+@pytest.mark.parametrize(
+    'mode, secret, is_enabled',
+    [('database', None, False), ('signed', 'secret', True)]
+)
+def test_create_token_signer(monkeypatch, mode, secret, is_enabled):
+    monkeypatch.setenv('TOKEN_MODE', mode)
+    if secret:
+        monkeypatch.setenv('TOKEN_SECRET', secret)
+
+    assert_that(
+        actual_or_assertion=create_token_signer().is_enabled,
+        matcher=equal_to(is_enabled)
+    )
+
+
+@pytest.mark.parametrize('mode', ['jwt', 'signed'])
+def test_create_token_signer_errors(monkeypatch, mode: str):
+    monkeypatch.setenv('TOKEN_MODE', mode)
+    monkeypatch.delenv('TOKEN_SECRET', raising=False)
+    with pytest.raises(ValueError):
+        create_token_signer()
@@ -0,0 +1,124 @@
+from typing import List
+
+from hamcrest import assert_that, close_to, equal_to
+
+from auth_app.throttling import LoginThrottle, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def acquire_many(limiter: RateLimiter, key: str, count: int) -> List[float]:
+    return [limiter.acquire(key=key) for _ in range(count)]
+
+
+class TestRateLimiter:
+    def test_burst_and_refill(self):
+        clock = Clock()
+        limiter = RateLimiter(rate=6, burst=2, clock=clock)
+
+        assert_that(
+            actual_or_assertion=acquire_many(limiter, 'login', 3),
+            matcher=equal_to([0, 0, 10.0])
+        )
+        clock.now = 4.0
+        assert_that(
+            actual_or_assertion=limiter.acquire(key='login'),
+            matcher=close_to(6.0, 0.001)
+        )
+        clock.now = 10.0
+        assert_that(
+            actual_or_assertion=limiter.acquire(key='login'),
+            matcher=equal_to(0)
+        )
+        assert_that(
+            actual_or_assertion=limiter.acquire(key='other'),
+            matcher=equal_to(0)
+        )
+
+    def test_disabled(self):
+        limiter = RateLimiter(rate=0, burst=1)
+        assert_that(
+            actual_or_assertion=acquire_many(limiter, 'login', 3),
+            matcher=equal_to([0, 0, 0])
+        )
+        assert_that(actual_or_assertion=limiter.size, matcher=equal_to(0))
+
+    def test_max_keys(self):
+        limiter = RateLimiter(rate=6, burst=1, max_keys=2)
+        for key in ('a', 'b', 'c'):
+            limiter.acquire(key=key)
+        assert_that(actual_or_assertion=limiter.size, matcher=equal_to(2))
+        assert_that(
+            actual_or_assertion=limiter.acquire(key='a'),
+            matcher=equal_to(0)
+        )
+
+    def test_refund(self):
+        clock = Clock()
+        limiter = RateLimiter(rate=6, burst=2, clock=clock)
+        limiter.acquire(key='login')
+        limiter.refund(key='login')
+        limiter.refund(key='other')
+
+        assert_that(
+            actual_or_assertion=acquire_many(limiter, 'login', 3),
+            matcher=equal_to([0, 0, 10.0])
+        )
+        assert_that(actual_or_assertion=limiter.size, matcher=equal_to(1))
+
+
+class TestLoginThrottle:
+    def test_check(self):
+        clock = Clock()
+        throttle = LoginThrottle(
+            login_limiter=RateLimiter(rate=60, burst=1, clock=clock),
+            client_limiter=RateLimiter(rate=6, burst=2, clock=clock)
+        )
+
+        results = [
+            throttle.check(login='user', client='10.0.0.1'),
+            throttle.check(login='USER', client='10.0.0.2'),
+            throttle.check(login='other', client='10.0.0.1'),
+            throttle.check(login='another', client='10.0.0.1'),
+        ]
+
+        assert_that(
+            actual_or_assertion=results,
+            matcher=equal_to([0, 1, 0, 10])
+        )
+        assert_that(
+            actual_or_assertion=throttle.stats,
+            matcher=equal_to({
+                'allowed': 2,
+                'rejected_by_login': 1,
+                'rejected_by_client': 1,
+                'refunded': 0,
+                'logins': 2,
+                'clients': 2,
+            })
+        )
+
+    def test_refund(self):
+        throttle = LoginThrottle(
+            login_limiter=RateLimiter(rate=60, burst=1),
+            client_limiter=RateLimiter(rate=60, burst=1)
+        )
+        results = []
+        for _ in range(3):
+            results.append(throttle.check(login='user', client='10.0.0.1'))
+            throttle.refund(login='USER', client='10.0.0.1')
+
+        assert_that(
+            actual_or_assertion=results,
+            matcher=equal_to([0, 0, 0])
+        )
+        assert_that(
+            actual_or_assertion=throttle.stats['refunded'],
+            matcher=equal_to(3)
+        )
@@ -0,0 +1,134 @@
+import logging
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from hamcrest import (assert_that, contains_string, equal_to, greater_than,
+                      has_item, is_, starts_with)
+
+from auth_app.timing import (DB_PHASE, HASH_PHASE, RequestTiming,
+                             ServerTimingMiddleware, add_time, current_timing,
+                             measure)
+
+
+def create_app(sample_rate: float, send_header: bool = True) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        ServerTimingMiddleware,
+        sample_rate=sample_rate,
+        send_header=send_header
+    )
+
+    @app.get('/')
+    async def index():
+        add_time(phase=DB_PHASE, seconds=0.002)
+        return {}
+
+    return app
+
+
+class TestRequestTiming:
+    def test_to_header(self):
+        timing = RequestTiming()
+        timing.add(phase=DB_PHASE, seconds=0.0015)
+        timing.add(phase=DB_PHASE, seconds=0.0005)
+        timing.stop()
+
+        assert_that(
+            actual_or_assertion=timing.to_header(),
+            matcher=starts_with('db;dur=2.000, hash;dur=0.000, serialize;')
+        )
+        assert_that(
+            actual_or_assertion=timing.counts[DB_PHASE],
+            matcher=equal_to(2)
+        )
+
+    def test_measure_without_timing(self):
+        with measure(phase=HASH_PHASE):
+            pass
+        assert_that(
+            actual_or_assertion=current_timing.get(),
+            matcher=is_(None)
+        )
+
+
+class TestServerTimingMiddleware:
+    def test_sampled_request(self):
+        with TestClient(create_app(sample_rate=1.0)) as client:
+            response = client.get('/')
+
+        header = response.headers['Server-Timing']
+        durations = dict(
+            item.split(';dur=') for item in header.split(', ')
+        )
+        assert_that(
+            actual_or_assertion=float(durations['db']),
+            matcher=equal_to(2.0)
+        )
+        assert_that(
+            actual_or_assertion=float(durations['total']),
+            matcher=greater_than(0)
+        )
+
+    def test_sampled_request_log(self, caplog):
+        caplog.set_level(logging.INFO, logger='auth_app.timing')
+        with TestClient(create_app(sample_rate=1.0)) as client:
+            client.get('/')
+
+        assert_that(
+            actual_or_assertion=caplog.messages,
+            matcher=has_item(
+                contains_string(
+                    'Request timing: method=GET path=/ status=200 total_ms='
+                )
+            )
+        )
+        assert_that(
+            actual_or_assertion=caplog.messages[-1],
+            matcher=contains_string('db_ms=2.000 db_queries=1')
+        )
+
+    def test_header_is_disabled(self, caplog):
+        caplog.set_level(logging.INFO, logger='auth_app.timing')
+        with TestClient(
+                create_app(sample_rate=1.0, send_header=False)
+        ) as client:
+            response = client.get('/')
+
+        assert_that(
+            actual_or_assertion='Server-Timing' in response.headers,
+            matcher=is_(False)
+        )
+        assert_that(
+            actual_or_assertion=caplog.messages[-1],
+            matcher=contains_string('db_ms=2.000 db_queries=1')
+        )
+
+    @pytest.mark.parametrize(
+        'random_value, is_sampled', [(0.05, True), (0.5, False)]
+    )
+    def test_default_sample_rate(self, random_value: float,
+                                 is_sampled: bool):
+        app = FastAPI()
+        app.add_middleware(ServerTimingMiddleware, send_header=True)
+
+        with patch('auth_app.timing.random.random',
+                   return_value=random_value):
+            with TestClient(app) as client:
+                response = client.get('/docs')
+
+        assert_that(
+            actual_or_assertion='Server-Timing' in response.headers,
+            matcher=is_(is_sampled)
+        )
+
+    @pytest.mark.parametrize('sample_rate', [0.0])
+    def test_not_sampled_request(self, sample_rate: float):
+        with TestClient(create_app(sample_rate=sample_rate)) as client:
+            response = client.get('/')
+
+        assert_that(
+            actual_or_assertion='Server-Timing' in response.headers,
+            matcher=is_(False)
+        )
@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from hamcrest import assert_that, equal_to, greater_than_or_equal_to
+from sqlalchemy import event
+
+from auth_app.dbase.dal.salary import SalaryDAL
+from auth_app.warmup import WarmUp
+
+
+class TestWarmUp:
+    @pytest.mark.asyncio
+    async def test_run(self, dbase_connection):
+        warmup = WarmUp(connection=dbase_connection, connections=3)
+        assert_that(
+            actual_or_assertion=warmup.is_ready,
+            matcher=equal_to(False)
+        )
+
+        await warmup.run()
+
+        assert_that(
+            actual_or_assertion=warmup.is_ready,
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=warmup.stats['connections'],
+            matcher=equal_to(3)
+        )
+        assert_that(
+            actual_or_assertion=warmup.stats['errors'],
+            matcher=equal_to(0)
+        )
+        assert_that(
+            actual_or_assertion=dbase_connection.engine.pool.checkedin(),
+            matcher=greater_than_or_equal_to(3)
+        )
+
+    @pytest.mark.asyncio
+    async def test_distinct_connections(self, dbase_connection):
+        checkouts = []
+
+        def on_checkout(dbapi_connection, connection_record,
+                        connection_proxy):
+            checkouts.append(id(dbapi_connection))
+
+        engine = dbase_connection.engine.sync_engine
+        event.listen(engine, 'checkout', on_checkout)
+        try:
+            await WarmUp(connection=dbase_connection, connections=3).run()
+        finally:
+            event.remove(engine, 'checkout', on_checkout)
+
+        assert_that(actual_or_assertion=len(checkouts), matcher=equal_to(3))
+        assert_that(
+            actual_or_assertion=len(set(checkouts)),
+            matcher=equal_to(3)
+        )
+
+    @pytest.mark.asyncio
+    async def test_salary_only_query(self, dbase_connection):
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context,
+                       executemany):
+            statements.append(statement)
+
+        engine = dbase_connection.engine.sync_engine
+        event.listen(engine, 'before_cursor_execute', on_execute)
+        try:
+            await WarmUp(connection=dbase_connection, connections=1).run()
+        finally:
+            event.remove(engine, 'before_cursor_execute', on_execute)
+
+        salary_statements = [
+            statement for statement in statements
+            if 'FROM salary' in statement
+        ]
+        assert_that(
+            actual_or_assertion=any(
+                'JOIN' not in statement for statement in salary_statements
+            ),
+            matcher=equal_to(True)
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_run_is_ready(self, dbase_connection):
+        warmup = WarmUp(connection=dbase_connection, connections=2)
+        with patch.object(
+                SalaryDAL, 'get_by_user_id', side_effect=RuntimeError('error')
+        ):
+            await warmup.run()
+
+        assert_that(
+            actual_or_assertion=warmup.is_ready,
+            matcher=equal_to(True)
+        )
+        assert_that(
+            actual_or_assertion=warmup.stats['errors'],
+            matcher=equal_to(1)
+        )
@@ -1,3 +1,4 @@
+-- Base schema. Later changes are applied by auth_app.dbase.migrations.
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
 CREATE TABLE IF NOT EXISTS users(
@@ -11,14 +12,16 @@ CREATE TABLE IF NOT EXISTS tokens(
     id SERIAL PRIMARY KEY,
     value UUID NOT NULL UNIQUE DEFAULT uuid_generate_v4(),
     expires TIMESTAMP NOT NULL,
-    user_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL UNIQUE,
     FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+CREATE INDEX IF NOT EXISTS ix_tokens_expires ON tokens(expires);
+
 CREATE TABLE IF NOT EXISTS salary(
     id SERIAL PRIMARY KEY,
     value INTEGER NOT NULL DEFAULT 0,
     target_date DATE NOT NULL,
-    user_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL UNIQUE,
     FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
 );